@@ -0,0 +1,217 @@
+# ──────────────────────────────────────────────────────────────────────
+# ASCRL API – LOCAL READ-ONLY HTTP ACCESS TO ascrl.db
+# ──────────────────────────────────────────────────────────────────────
+#   GET /standings/{series}[?season=Season 1]
+#   GET /results/{series}/{race}        race: id, Track or Track@YYYY-MM-DD
+#   GET /schedule[?series=Cup][&season=Season 1]
+#   GET /drivers/{name}                 every series the driver is rostered in
+# Reads go through ascrl_db's reader pool with read-only connections.
+# Each response body is cached together with its ETag. The cache is
+# cleared when PRAGMA data_version shows another process (the bot) has
+# committed, so a repeat or conditional request costs only a dict lookup.
+# Keys come from the URL, so the cache is LRU-bounded and a 404 is never
+# cached – made-up names can't grow it.
+#   python api.py            serves on ASCRL_API_HOST:ASCRL_API_PORT (127.0.0.1:8080);
+#                            ASCRL_API_CACHE_ENTRIES (512) bounds the response cache
+import asyncio
+import hashlib
+import json
+import logging
+import os
+
+from aiohttp import web
+
+import ascrl_db as db
+from league import SUPPORTED_SERIES, CURRENT_SEASON, validate_series, find_race
+from read_cache import ReadCache
+
+API_HOST = os.getenv('ASCRL_API_HOST', '127.0.0.1')
+API_PORT = int(os.getenv('ASCRL_API_PORT', '8080'))
+VERSION_POLL = 1.0          # seconds between data_version checks
+CACHE_ENTRIES = int(os.getenv('ASCRL_API_CACHE_ENTRIES', '512'))
+
+cache = ReadCache(max_entries=CACHE_ENTRIES)
+
+# ──────────────────────────────────────────────────────────────────────
+# Views – fn(cursor, ...) -> JSON-able payload, or None for 404
+# ──────────────────────────────────────────────────────────────────────
+def standings_view(c, series, season):
+    c.execute("""SELECT d.driver_id, d.driver_name, s.points, s.wins, s.top_5s, s.top_10s, s.poles, s.avg_finish
+                 FROM standings s JOIN drivers d ON d.driver_id = s.driver_id
+                 WHERE s.series = ? AND s.season = ?
+                 ORDER BY s.points DESC, s.avg_finish ASC NULLS LAST, d.driver_name""", (series, season))
+    rows = [{'pos': pos, 'driver_id': driver_id, 'driver': name, 'points': points, 'wins': wins,
+             'top_5s': top_5s, 'top_10s': top_10s, 'poles': poles, 'avg_finish': avg_finish}
+            for pos, (driver_id, name, points, wins, top_5s, top_10s, poles, avg_finish) in enumerate(c.fetchall(), 1)]
+    return {'series': series, 'season': season, 'standings': rows}
+
+def results_view(c, series, race):
+    found = find_race(c, series, race)
+    if not found:
+        return None
+    race_id, track, date, season = found
+    c.execute("""SELECT r.finish_position, d.driver_id, d.driver_name, r.pole IS 'Yes', r.fastest_lap IS 'FL'
+                 FROM results r JOIN drivers d ON d.driver_id = r.driver_id
+                 WHERE r.race_id = ?
+                 ORDER BY r.finish_position IS NULL, r.finish_position""", (race_id,))
+    rows = [{'finish': finish, 'driver_id': driver_id, 'driver': name, 'pole': bool(pole), 'fastest_lap': bool(fl)}
+            for finish, driver_id, name, pole, fl in c.fetchall()]
+    return {'series': series, 'season': season, 'race_id': race_id, 'track': track, 'date': date, 'results': rows}
+
+def schedule_view(c, series, season):
+    query = """SELECT ra.race_id, ra.series, ra.track, ra.date, d.driver_name
+               FROM races ra
+               LEFT JOIN winners w ON w.race_id = ra.race_id
+               LEFT JOIN drivers d ON d.driver_id = w.driver_id
+               WHERE ra.season = ?"""
+    params = [season]
+    if series:
+        query += " AND ra.series = ?"
+        params.append(series)
+    c.execute(query + " ORDER BY ra.date, ra.race_id", params)
+    rows = [{'race_id': race_id, 'series': ser, 'track': track, 'date': date, 'winner': winner}
+            for race_id, ser, track, date, winner in c.fetchall()]
+    return {'series': series, 'season': season, 'races': rows}
+
+def driver_view(c, name):
+    c.execute("SELECT driver_id, driver_name, series FROM drivers WHERE driver_name = ? COLLATE NOCASE ORDER BY series", (name,))
+    entries = c.fetchall()
+    if not entries:
+        return None
+    profiles = []
+    for driver_id, driver_name, series in entries:
+        c.execute("""SELECT season, points, wins, top_5s, top_10s, poles, avg_finish
+                     FROM standings WHERE driver_id = ? ORDER BY season""", (driver_id,))
+        seasons = [dict(zip(('season', 'points', 'wins', 'top_5s', 'top_10s', 'poles', 'avg_finish'), row))
+                   for row in c.fetchall()]
+        c.execute("""SELECT ra.race_id, ra.season, ra.track, ra.date, r.finish_position, r.pole IS 'Yes', r.fastest_lap IS 'FL'
+                     FROM results r JOIN races ra ON ra.race_id = r.race_id
+                     WHERE r.driver_id = ?
+                     ORDER BY ra.date, ra.race_id""", (driver_id,))
+        results = [{'race_id': race_id, 'season': season, 'track': track, 'date': date,
+                    'finish': finish, 'pole': bool(pole), 'fastest_lap': bool(fl)}
+                   for race_id, season, track, date, finish, pole, fl in c.fetchall()]
+        profiles.append({'driver_id': driver_id, 'series': series, 'seasons': seasons, 'results': results})
+    return {'driver': entries[0][1], 'profiles': profiles}
+
+# ──────────────────────────────────────────────────────────────────────
+# Responses – cached body + ETag, 304 on If-None-Match
+# ──────────────────────────────────────────────────────────────────────
+def error(status, message):
+    return web.json_response({'error': message}, status=status)
+
+class NotFound(Exception):
+    # Raised out of a cache build, so the miss is answered but never stored
+    pass
+
+def etag_matches(header, tag):
+    if not header:
+        return False
+    candidates = [t.strip().removeprefix('W/') for t in header.split(',')]
+    return '*' in candidates or tag in candidates
+
+async def respond(request, key, view, *args):
+    async def build():
+        payload = await db.read(view, *args)
+        if payload is None:
+            raise NotFound()
+        body = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        return body, '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+    try:
+        body, tag = await cache.get_or_build(key, build)
+    except NotFound:
+        return error(404, 'Not found')
+    headers = {'ETag': tag, 'Cache-Control': 'no-cache'}
+    if etag_matches(request.headers.get('If-None-Match'), tag):
+        return web.Response(status=304, headers=headers)
+    return web.Response(body=body, content_type='application/json', charset='utf-8', headers=headers)
+
+def series_arg(value):
+    try:
+        return validate_series(value), None
+    except ValueError as e:
+        return None, error(400, str(e))
+
+# ──────────────────────────────────────────────────────────────────────
+# Routes
+# ──────────────────────────────────────────────────────────────────────
+routes = web.RouteTableDef()
+
+@routes.get('/')
+async def index(request):
+    return web.json_response({'series': SUPPORTED_SERIES, 'season': CURRENT_SEASON,
+                              'routes': ['/standings/{series}', '/results/{series}/{race}', '/schedule', '/drivers/{name}']})
+
+@routes.get('/standings/{series}')
+async def standings(request):
+    series, failed = series_arg(request.match_info['series'])
+    if failed:
+        return failed
+    season = request.query.get('season', CURRENT_SEASON)
+    return await respond(request, ('standings', series, season, ()), standings_view, series, season)
+
+@routes.get('/results/{series}/{race}')
+async def results(request):
+    series, failed = series_arg(request.match_info['series'])
+    if failed:
+        return failed
+    race = request.match_info['race']
+    try:
+        return await respond(request, ('results', series, None, (race.lower(),)), results_view, series, race)
+    except ValueError:
+        return error(400, 'Race is an id, Track or Track@YYYY-MM-DD')
+
+@routes.get('/schedule')
+async def schedule(request):
+    series = None
+    if 'series' in request.query:
+        series, failed = series_arg(request.query['series'])
+        if failed:
+            return failed
+    season = request.query.get('season', CURRENT_SEASON)
+    return await respond(request, ('schedule', series, season, ()), schedule_view, series, season)
+
+@routes.get('/drivers/{name}')
+async def drivers(request):
+    name = request.match_info['name']
+    return await respond(request, ('drivers', None, None, (name.lower(),)), driver_view, name)
+
+# ──────────────────────────────────────────────────────────────────────
+# App
+# ──────────────────────────────────────────────────────────────────────
+async def watch_data_version():
+    # data_version is per connection, so one dedicated connection watches it
+    conn = db.connect(check_same_thread=False, read_only=True)
+    last = None
+    try:
+        while True:
+            version = await asyncio.to_thread(lambda: conn.execute("PRAGMA data_version").fetchone()[0])
+            if last is not None and version != last:
+                dropped = cache.clear()
+                logging.info(f"ascrl.db changed – {dropped} cached responses dropped")
+            last = version
+            await asyncio.sleep(VERSION_POLL)
+    finally:
+        conn.close()
+
+async def data_version_ctx(app):
+    task = asyncio.get_running_loop().create_task(watch_data_version(), name='api-data-version')
+    yield
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    db.close()
+
+def make_app():
+    db.READ_ONLY = True
+    app = web.Application()
+    app.add_routes(routes)
+    app.cleanup_ctx.append(data_version_ctx)
+    return app
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s:%(levelname)s:%(message)s')
+    web.run_app(make_app(), host=API_HOST, port=API_PORT)
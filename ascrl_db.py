@@ -0,0 +1,144 @@
+# ──────────────────────────────────────────────────────────────────────
+# ASCRL DB – ASYNC DATA ACCESS, SQLITE NEVER RUNS ON THE EVENT LOOP
+# ──────────────────────────────────────────────────────────────────────
+# Reads go to a small pool of reader threads, each owning ONE connection.
+# Writes go to a single writer thread, so SQLite never sees two writers and
+# a whole command commits (or rolls back) as one transaction. WAL mode lets
+# readers keep answering !standings while an admin write is in progress.
+# Connections keep a large statement cache, so repeated SQL strings reuse
+# their prepared statements instead of being re-parsed each call.
+# Processes that must never write (the HTTP API) set READ_ONLY before the
+# first call, and every pooled connection then opens with mode=ro.
+# Each call is timed on its DB thread (metrics.py); pooled connections
+# trace their statements so a slow call is logged with its SQL.
+import asyncio
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+
+DB_PATH = 'ascrl.db'
+READ_POOL_SIZE = 4
+BUSY_TIMEOUT = 5.0          # seconds a statement waits on a locked DB
+STATEMENT_CACHE = 256
+READ_ONLY = False
+
+_local = threading.local()
+_connections = []
+_connections_lock = threading.Lock()
+_reader = None
+_writer = None
+
+# ──────────────────────────────────────────────────────────────────────
+# Connections
+# ──────────────────────────────────────────────────────────────────────
+def connect(path: str = None, check_same_thread: bool = True, read_only: bool = False) -> sqlite3.Connection:
+    # Also used directly by scripts that want plain sync access
+    if read_only:
+        # mode=ro: SQLite itself refuses writes; journal mode is the writer's business
+        conn = sqlite3.connect(f"file:{path or DB_PATH}?mode=ro", uri=True, timeout=BUSY_TIMEOUT,
+                               cached_statements=STATEMENT_CACHE, check_same_thread=check_same_thread)
+        conn.execute("PRAGMA query_only=ON")
+        return conn
+    conn = sqlite3.connect(path or DB_PATH, timeout=BUSY_TIMEOUT, cached_statements=STATEMENT_CACHE,
+                           check_same_thread=check_same_thread)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+def _thread_conn() -> sqlite3.Connection:
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        # close() shuts these down from the main thread, hence check_same_thread=False
+        conn = _local.conn = connect(check_same_thread=False, read_only=READ_ONLY)
+        _local.statements = []
+        conn.set_trace_callback(_local.statements.append)
+        with _connections_lock:
+            _connections.append(conn)
+    return conn
+
+def _executors():
+    global _reader, _writer
+    if _writer is None:
+        _writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ascrl-db-write')
+        _reader = ThreadPoolExecutor(max_workers=READ_POOL_SIZE, thread_name_prefix='ascrl-db-read')
+    return _reader, _writer
+
+# ──────────────────────────────────────────────────────────────────────
+# Worker-side runners
+# ──────────────────────────────────────────────────────────────────────
+def _label(fn):
+    return getattr(fn, '__qualname__', None) or repr(fn)
+
+def _timed(label, started):
+    metrics.record_db(label, time.perf_counter() - started, _local.statements)
+    _local.statements.clear()
+
+def _run_read(fn, args, label):
+    c = _thread_conn().cursor()
+    started = time.perf_counter()
+    try:
+        return fn(c, *args)
+    finally:
+        c.close()
+        _timed(label, started)
+
+def _run_write(fn, args, label):
+    conn = _thread_conn()
+    c = conn.cursor()
+    started = time.perf_counter()
+    try:
+        result = fn(c, *args)
+        conn.commit()
+        return result
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        c.close()
+        _timed(label, started)
+
+# ──────────────────────────────────────────────────────────────────────
+# Async API – fn(cursor, *args) runs on a DB thread, result is awaited
+# ──────────────────────────────────────────────────────────────────────
+async def _submit(pool, runner, fn, args, label):
+    started = time.perf_counter()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, runner, fn, args, label or _label(fn))
+    finally:
+        # Queue wait included – this is what the awaiting command actually lost
+        metrics.add_command_db_time(time.perf_counter() - started)
+
+async def read(fn, *args, label=None):
+    reader, _ = _executors()
+    return await _submit(reader, _run_read, fn, args, label)
+
+async def transaction(fn, *args, label=None):
+    _, writer = _executors()
+    return await _submit(writer, _run_write, fn, args, label)
+
+async def fetchall(sql: str, params=()):
+    return await read(lambda c: c.execute(sql, params).fetchall(), label=metrics.sql_label(sql))
+
+async def fetchone(sql: str, params=()):
+    return await read(lambda c: c.execute(sql, params).fetchone(), label=metrics.sql_label(sql))
+
+async def execute(sql: str, params=()) -> int:
+    return await transaction(lambda c: c.execute(sql, params).rowcount, label=metrics.sql_label(sql))
+
+async def executemany(sql: str, seq_of_params) -> int:
+    rows = list(seq_of_params)
+    return await transaction(lambda c: c.executemany(sql, rows).rowcount, label=metrics.sql_label(sql))
+
+def close():
+    global _reader, _writer
+    for pool in (_reader, _writer):
+        if pool is not None:
+            pool.shutdown(wait=True)
+    _reader = _writer = None
+    with _connections_lock:
+        for conn in _connections:
+            conn.close()
+        _connections.clear()
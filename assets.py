@@ -0,0 +1,119 @@
+# ──────────────────────────────────────────────────────────────────────
+# ASSETS – CONCURRENT IMAGE FETCHES WITH A CONTENT-ADDRESSED DISK CACHE
+# ──────────────────────────────────────────────────────────────────────
+# Image bytes are stored once under asset_cache/<sha256>. index.json maps
+# each URL to its blob plus the ETag / Last-Modified the server sent. A
+# re-run sends a conditional GET, and a 304 costs no download. If the
+# server is down, the cached copy is used rather than skipping the asset.
+# At most FETCH_LIMIT downloads run at once.
+import asyncio
+import hashlib
+import json
+import logging
+import os
+
+import aiohttp
+
+CACHE_DIR = 'asset_cache'
+FETCH_LIMIT = 4
+FETCH_TIMEOUT = aiohttp.ClientTimeout(total=20)
+MAX_BYTES = 10 * 1024 * 1024       # well above Discord's icon/banner/emoji limits
+
+log = logging.getLogger('ascrl.assets')
+
+class AssetCache:
+    def __init__(self, directory=CACHE_DIR):
+        self.directory = directory
+        self._index_path = os.path.join(directory, 'index.json')
+        self._index = None
+
+    # ──────────────────────────────────────────────────────────────────
+    # Disk
+    # ──────────────────────────────────────────────────────────────────
+    def _load_index(self):
+        if self._index is None:
+            try:
+                with open(self._index_path, encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = self._index_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f, indent=1, sort_keys=True)
+        os.replace(tmp, self._index_path)
+
+    def _blob_path(self, digest):
+        return os.path.join(self.directory, digest)
+
+    def _read_blob(self, digest):
+        try:
+            with open(self._blob_path(digest), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        # A truncated or edited blob no longer matches its name – treat as missing
+        return data if hashlib.sha256(data).hexdigest() == digest else None
+
+    def _write_blob(self, data):
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path + '.tmp', 'wb') as f:
+                f.write(data)
+            os.replace(path + '.tmp', path)
+        return digest
+
+    def cached(self, url):
+        entry = self._load_index().get(url)
+        return self._read_blob(entry['sha256']) if entry else None
+
+    # ──────────────────────────────────────────────────────────────────
+    # Fetch
+    # ──────────────────────────────────────────────────────────────────
+    async def fetch(self, session, url, limit):
+        # -> (bytes or None, 'cached' | 'downloaded' | 'stale' | 'failed')
+        entry = self._load_index().get(url)
+        held = self._read_blob(entry['sha256']) if entry else None
+        headers = {}
+        if held is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        try:
+            async with limit, session.get(url, headers=headers, timeout=FETCH_TIMEOUT) as resp:
+                if resp.status == 304 and held is not None:
+                    return held, 'cached'
+                if resp.status != 200:
+                    raise aiohttp.ClientResponseError(resp.request_info, resp.history, status=resp.status, message=resp.reason)
+                data = await resp.content.read(MAX_BYTES + 1)
+                if len(data) > MAX_BYTES:
+                    raise ValueError(f"larger than {MAX_BYTES // (1024 * 1024)} MiB")
+                etag, last_modified = resp.headers.get('ETag'), resp.headers.get('Last-Modified')
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            log.warning(f"asset {url} not fetched: {e}" + (" – using cached copy" if held is not None else ""))
+            return held, 'stale' if held is not None else 'failed'
+        digest = await asyncio.to_thread(self._write_blob, data)
+        self._index[url] = {'sha256': digest, 'etag': etag, 'last_modified': last_modified}
+        return data, 'downloaded'
+
+    async def fetch_all(self, urls, limit=FETCH_LIMIT):
+        # {url: bytes or None}, plus {outcome: count} for the caller's report
+        urls = list(dict.fromkeys(urls))
+        semaphore = asyncio.Semaphore(limit)
+        async with aiohttp.ClientSession() as session:
+            fetched = await asyncio.gather(*(self.fetch(session, url, semaphore) for url in urls))
+        if any(outcome == 'downloaded' for _, outcome in fetched):
+            await asyncio.to_thread(self._save_index)
+        outcomes = {}
+        for _, outcome in fetched:
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        return {url: data for url, (data, _) in zip(urls, fetched)}, outcomes
+
+# Process-wide instance
+assets = AssetCache()
@@ -0,0 +1,174 @@
+# backups.py – ONLINE HOT BACKUPS + POINT-IN-TIME SNAPSHOTS OF ascrl.db
+# ──────────────────────────────────────────────────────────────────────
+# Snapshots use SQLite's online backup API a few hundred pages per step,
+# pausing between steps so the bot's writer is never held up for long.
+# A copy taken mid-write is still consistent: if another connection
+# commits during the copy, SQLite restarts it. Each snapshot is
+# gzip-compressed into backups/ and then rotated:
+#   - the newest KEEP_RECENT snapshots are kept
+#   - so is the newest snapshot of each of the last KEEP_DAILY days
+#   python backups.py                        take a snapshot (label: manual)
+#   python backups.py snapshot LABEL
+#   python backups.py list
+#   python backups.py prune
+#   python backups.py restore FILE|latest --yes     stop the bot first
+# The bot snapshots automatically before every destructive admin command.
+import asyncio
+import gzip
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+import ascrl_db
+
+BACKUP_DIR = 'backups'
+PAGES_PER_STEP = 256        # ~1 MiB at SQLite's default 4 KiB page size
+STEP_PAUSE = 0.01           # seconds between steps – writers get the lock in between
+KEEP_RECENT = 20
+KEEP_DAILY = 14
+
+NAME_RE = re.compile(r'^ascrl_BACKUP_(\d{4}-\d{2}-\d{2}_\d{6})_(.+)\.db\.gz$')
+
+# ──────────────────────────────────────────────────────────────────────
+# Copy – page-stepped online backup between two connections
+# ──────────────────────────────────────────────────────────────────────
+def copy_online(source, dest, pages=PAGES_PER_STEP, pause=STEP_PAUSE):
+    def step(status, remaining, total):
+        if remaining:
+            time.sleep(pause)
+    source.backup(dest, pages=pages, progress=step)
+
+def _integrity_ok(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("PRAGMA integrity_check").fetchone()[0] == 'ok'
+    finally:
+        conn.close()
+
+# ──────────────────────────────────────────────────────────────────────
+# Snapshots
+# ──────────────────────────────────────────────────────────────────────
+def snapshot_path(label, directory=BACKUP_DIR, when=None):
+    label = re.sub(r'[^A-Za-z0-9_-]+', '-', label).strip('-') or 'manual'
+    base = f"ascrl_BACKUP_{(when or datetime.now()):%Y-%m-%d_%H%M%S}_{label}"
+    path, n = os.path.join(directory, f"{base}.db.gz"), 1
+    while os.path.exists(path):
+        n += 1
+        path = os.path.join(directory, f"{base}-{n}.db.gz")
+    return path
+
+def snapshot(label='manual', db_path=None, directory=BACKUP_DIR, conn=None):
+    # conn: copy from an already-open connection (the maintenance CLI's) instead of opening one
+    os.makedirs(directory, exist_ok=True)
+    path = snapshot_path(label, directory)
+    raw = path[:-len('.gz')] + '.tmp'
+    source = conn or ascrl_db.connect(db_path)
+    dest = sqlite3.connect(raw)
+    try:
+        copy_online(source, dest)
+    finally:
+        dest.close()
+        if conn is None:
+            source.close()
+    try:
+        with open(raw, 'rb') as src, gzip.open(path + '.tmp', 'wb', compresslevel=6) as out:
+            shutil.copyfileobj(src, out)
+        os.replace(path + '.tmp', path)
+    finally:
+        for leftover in (raw, path + '.tmp'):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+    prune(directory)
+    return path
+
+async def snapshot_async(label='manual', db_path=None, directory=BACKUP_DIR):
+    # Copy + compress on a worker thread; the event loop keeps serving commands
+    return await asyncio.to_thread(snapshot, label, db_path, directory)
+
+def list_snapshots(directory=BACKUP_DIR):
+    # [(path, taken, label, bytes)], newest first
+    found = []
+    if not os.path.isdir(directory):
+        return found
+    for name in os.listdir(directory):
+        match = NAME_RE.match(name)
+        if match:
+            path = os.path.join(directory, name)
+            taken = datetime.strptime(match.group(1), '%Y-%m-%d_%H%M%S')
+            found.append((path, taken, match.group(2), os.path.getsize(path)))
+    return sorted(found, key=lambda s: (s[1], s[0]), reverse=True)
+
+def prune(directory=BACKUP_DIR, keep_recent=KEEP_RECENT, keep_daily=KEEP_DAILY):
+    snapshots = list_snapshots(directory)
+    keep = {s[0] for s in snapshots[:keep_recent]}
+    days = {}
+    for path, taken, _, _ in snapshots:
+        days.setdefault(taken.date(), path)      # newest first, so the first seen is that day's latest
+    keep.update(path for _, path in sorted(days.items(), reverse=True)[:keep_daily])
+    removed = [s[0] for s in snapshots if s[0] not in keep]
+    for path in removed:
+        os.remove(path)
+    return removed
+
+# ──────────────────────────────────────────────────────────────────────
+# Restore
+# ──────────────────────────────────────────────────────────────────────
+def restore(path, db_path=None, directory=BACKUP_DIR):
+    # Snapshot -> live DB, through the backup API so open readers never see a torn file.
+    # The current DB is snapshotted first; returns that safety snapshot's path.
+    raw = os.path.join(directory, os.path.basename(path) + '.restore')
+    try:
+        with gzip.open(path, 'rb') as src, open(raw, 'wb') as out:
+            shutil.copyfileobj(src, out)
+        if not _integrity_ok(raw):
+            raise ValueError(f"{path} failed PRAGMA integrity_check – not restored")
+        safety = snapshot('before_restore', db_path, directory)
+        source = sqlite3.connect(raw)
+        dest = ascrl_db.connect(db_path)
+        try:
+            copy_online(source, dest)
+        finally:
+            source.close()
+            dest.close()
+    finally:
+        if os.path.exists(raw):
+            os.remove(raw)
+    return safety
+
+# ──────────────────────────────────────────────────────────────────────
+# CLI
+# ──────────────────────────────────────────────────────────────────────
+def main(argv):
+    command = argv[0] if argv else 'snapshot'
+    if command == 'snapshot':
+        print(f"Snapshot: {snapshot(argv[1] if len(argv) > 1 else 'manual')}")
+    elif command == 'list':
+        for path, taken, label, size in list_snapshots():
+            print(f"{taken:%Y-%m-%d %H:%M:%S}  {size // 1024:>6} KiB  {label:<28} {path}")
+    elif command == 'prune':
+        removed = prune()
+        print(f"Pruned {len(removed)} snapshots")
+    elif command == 'restore':
+        targets = [arg for arg in argv[1:] if not arg.startswith('--')]
+        if not targets:
+            print("Use: python backups.py restore FILE|latest --yes")
+            return
+        snapshots = list_snapshots()
+        path = snapshots[0][0] if targets[0] == 'latest' and snapshots else targets[0]
+        if not os.path.exists(path):
+            print(f"No snapshot: {path}")
+            return
+        if '--yes' not in argv:
+            print(f"Would restore {path} over {ascrl_db.DB_PATH} – stop the bot, then re-run with --yes")
+            return
+        safety = restore(path)
+        print(f"Restored {path}\nPrevious DB saved as {safety}")
+    else:
+        print("Use: python backups.py [snapshot [LABEL] | list | prune | restore FILE|latest --yes]")
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,193 @@
+# ──────────────────────────────────────────────────────────────────────
+# CHARTS – PNG RENDERING OFF THE EVENT LOOP, CACHED BY STANDINGS VERSION
+# ──────────────────────────────────────────────────────────────────────
+# Renderers use matplotlib's object-oriented Figure API (no pyplot global
+# state) and return PNG bytes from an in-memory buffer, so they are safe to
+# run side by side in a process pool. The pool forks its workers in start(),
+# which the bot calls before any thread exists: forking a process that has
+# threads (DB pool, log listener) can hand a child a lock held mid-fork.
+# If the pool dies later it is not re-forked; renders move to threads. The service keeps the bytes keyed by
+# (kind, series, season, standings version): every standings write bumps
+# the version, so a cached chart is only reused while its data is current.
+# matplotlib is imported by the workers on their first render – the bot
+# process itself never pays for it.
+import asyncio
+import io
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+RENDER_WORKERS = 2
+MAX_CACHED = 64            # PNGs kept; superseded versions age out first
+DPI = 100
+
+# ──────────────────────────────────────────────────────────────────────
+# Renderers – run in the worker process, data in, PNG bytes out
+# ──────────────────────────────────────────────────────────────────────
+def _figure(**kwargs):
+    # Lazy: first call in each worker pays the import, later calls are free
+    import matplotlib
+    matplotlib.use('Agg')      # headless – never pick an interactive backend
+    from matplotlib.figure import Figure
+    return Figure(**kwargs)
+
+def _png(fig) -> bytes:
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=DPI)
+    return buf.getvalue()
+
+def _pivot(rows):
+    # (race_id, label, driver, value) rows -> race labels in order, {driver: {race_id: value}}
+    races, values = OrderedDict(), {}
+    for race_id, label, driver, value in rows:
+        races.setdefault(race_id, label)
+        values.setdefault(driver, {})[race_id] = value
+    return races, values
+
+def render_standings(title, rows):
+    # rows: (driver, points), best first
+    drivers, points = zip(*rows)
+    fig = _figure(figsize=(10, 6))
+    ax = fig.subplots()
+    ax.bar(drivers, points, color=[f'C{i % 10}' for i in range(len(drivers))])
+    ax.set_xlabel('Drivers')
+    ax.set_ylabel('Points')
+    ax.set_title(title)
+    ax.tick_params(axis='x', labelrotation=45)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment('right')
+    fig.tight_layout()
+    return _png(fig)
+
+def render_progression(title, rows, drivers):
+    # Cumulative points after each race for `drivers` (standings order)
+    races, values = _pivot(rows)
+    fig = _figure(figsize=(11, 6))
+    ax = fig.subplots()
+    x = range(1, len(races) + 1)
+    for driver in drivers:
+        per_race = values.get(driver, {})
+        total, line = 0, []
+        for race_id in races:
+            total += per_race.get(race_id) or 0
+            line.append(total)
+        ax.plot(x, line, marker='o', markersize=3, label=driver)
+    ax.set_xticks(list(x))
+    ax.set_xticklabels(list(races.values()), rotation=45, ha='right')
+    ax.set_ylabel('Points')
+    ax.set_title(title)
+    ax.grid(True, alpha=0.3)
+    ax.legend(loc='upper left', fontsize='small', ncol=2)
+    fig.tight_layout()
+    return _png(fig)
+
+def render_heatmap(title, rows, drivers):
+    # Finishing position per driver (rows) and race (columns); blank = did not start
+    races, values = _pivot(rows)
+    grid = [[values.get(driver, {}).get(race_id) for race_id in races] for driver in drivers]
+    fig = _figure(figsize=(max(8, 0.6 * len(races) + 4), max(5, 0.35 * len(drivers) + 2)))
+    ax = fig.subplots()
+    masked = [[float('nan') if v is None else v for v in row] for row in grid]
+    image = ax.imshow(masked, aspect='auto', cmap='RdYlGn_r', vmin=1, vmax=max([v for row in grid for v in row if v] or [1]))
+    for y, row in enumerate(grid):
+        for x, finish in enumerate(row):
+            if finish is not None:
+                ax.text(x, y, str(finish), ha='center', va='center', fontsize=7)
+    ax.set_xticks(range(len(races)))
+    ax.set_xticklabels(list(races.values()), rotation=45, ha='right')
+    ax.set_yticks(range(len(drivers)))
+    ax.set_yticklabels(drivers)
+    ax.set_title(title)
+    fig.colorbar(image, ax=ax, label='Finish')
+    fig.tight_layout()
+    return _png(fig)
+
+RENDERERS = {
+    'standings': render_standings,
+    'progression': render_progression,
+    'heatmap': render_heatmap,
+}
+
+# ──────────────────────────────────────────────────────────────────────
+# Service – process pool + PNG cache
+# ──────────────────────────────────────────────────────────────────────
+class ChartService:
+    def __init__(self, workers=RENDER_WORKERS, max_cached=MAX_CACHED):
+        self._workers = workers
+        self._max_cached = max_cached
+        self._pool = None
+        self._cache = OrderedDict()
+        self._pending = {}
+        self.hits = 0
+        self.misses = 0
+
+    def start(self):
+        # Call while the process is still single-threaded
+        if self._pool is None:
+            # fork: the bot script has no __main__ guard, so spawn/forkserver would re-run it
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+            self._pool = ProcessPoolExecutor(max_workers=self._workers, mp_context=context)
+            # A fork pool launches every worker on its first task – make that now
+            self._pool.submit(int).result()
+
+    def _executor(self):
+        # None = the loop's default thread pool, once it is too late to fork safely
+        if self._pool is None and threading.active_count() == 1:
+            self.start()
+        return self._pool
+
+    async def get(self, kind, series, season, version, load):
+        # load() -> awaitable renderer args, only awaited on a miss
+        key = (kind, series, season, version)
+        if key in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        if key in self._pending:
+            self.hits += 1
+            return await asyncio.shield(self._pending[key])
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            args = await load()
+            png = None if args is None else await self._render(kind, args)
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        finally:
+            self._pending.pop(key, None)
+        if png is not None:
+            self._cache[key] = png
+            while len(self._cache) > self._max_cached:
+                self._cache.popitem(last=False)
+        future.set_result(png)
+        return png
+
+    async def _render(self, kind, args):
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor(), RENDERERS[kind], *args)
+        except BrokenProcessPool:
+            # A worker died (OOM, killed) – start a fresh pool on the next render
+            self._pool = None
+            raise
+
+    def stats(self):
+        return {'entries': len(self._cache), 'hits': self.hits, 'misses': self.misses,
+                'workers': 'processes' if self._pool is not None else 'threads'}
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+# Process-wide instance shared by every command
+charts = ChartService()
@@ -0,0 +1,163 @@
+# ──────────────────────────────────────────────────────────────────────
+# FEEDS – VERSIONED JSON/CSV DATA FILES PUBLISHED WITH THE SITE
+# ──────────────────────────────────────────────────────────────────────
+# Overlays, WordPress and spreadsheets poll these instead of scraping
+# HTML. Layout (under docs/):
+#   feeds/v1/index.json                              every feed: etag, bytes, updated
+#   feeds/v1/<series>/<season>/standings.json|.csv
+#   feeds/v1/<series>/<season>/schedule.json|.csv
+#   feeds/v1/<series>/<season>/results.json|.csv
+#   feeds/v1/<series>/drivers.json|.csv              career profiles
+# JSON is {"version", "series", "season"?, "columns", "rows"}: compact,
+# with no timestamps inside, so identical data gives identical bytes.
+# A feed whose content hash (its ETag) is unchanged is not rewritten.
+# Each file also gets a .gz copy, plus .br when brotli is installed
+# (optional: pip install brotli). Without it any old .br is removed.
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+from datetime import datetime, timezone
+
+from league import SUPPORTED_SERIES
+from site_render import slug, write_bytes_atomic, write_text_atomic
+
+try:
+    import brotli
+except ImportError:       # optional – .br variants are skipped without it
+    brotli = None
+
+FEED_VERSION = 1
+FEED_ROOT = f'feeds/v{FEED_VERSION}'
+INDEX = 'index.json'
+
+STANDINGS_COLUMNS = ['driver_id', 'driver', 'points', 'wins', 'top_5s', 'top_10s', 'poles', 'avg_finish']
+SCHEDULE_COLUMNS = ['race_id', 'track', 'date', 'winner_id', 'winner']
+RESULTS_COLUMNS = ['race_id', 'track', 'date', 'finish', 'driver_id', 'driver', 'pole', 'fastest_lap']
+DRIVER_COLUMNS = ['driver_id', 'driver', 'seasons', 'starts', 'points', 'wins', 'top_5s', 'top_10s', 'poles', 'avg_finish']
+
+# ──────────────────────────────────────────────────────────────────────
+# Data – one set-based query per feed kind per series
+# ──────────────────────────────────────────────────────────────────────
+def _by_season(c):
+    grouped = {}
+    for season, *row in c.fetchall():
+        grouped.setdefault(season, []).append(row)
+    return grouped
+
+def series_feeds(c, series):
+    # Yields (path, meta, columns, rows)
+    c.execute("""SELECT s.season, d.driver_id, d.driver_name, s.points, s.wins, s.top_5s, s.top_10s, s.poles,
+                        ROUND(s.avg_finish, 3)
+                 FROM standings s JOIN drivers d ON d.driver_id = s.driver_id
+                 WHERE s.series = ?
+                 ORDER BY s.season, s.points DESC, s.avg_finish ASC NULLS LAST, d.driver_name""", (series,))
+    standings = _by_season(c)
+    c.execute("""SELECT ra.season, ra.race_id, ra.track, ra.date, w.driver_id, d.driver_name
+                 FROM races ra
+                 LEFT JOIN winners w ON w.race_id = ra.race_id
+                 LEFT JOIN drivers d ON d.driver_id = w.driver_id
+                 WHERE ra.series = ?
+                 ORDER BY ra.season, ra.date, ra.race_id""", (series,))
+    schedule = _by_season(c)
+    c.execute("""SELECT ra.season, ra.race_id, ra.track, ra.date, r.finish_position, d.driver_id, d.driver_name,
+                        r.pole IS 'Yes', r.fastest_lap IS 'FL'
+                 FROM races ra
+                 JOIN results r ON r.race_id = ra.race_id
+                 JOIN drivers d ON d.driver_id = r.driver_id
+                 WHERE ra.series = ?
+                 ORDER BY ra.season, ra.date, ra.race_id, r.finish_position IS NULL, r.finish_position""", (series,))
+    results = _by_season(c)
+    for season in sorted(set(standings) | set(schedule)):
+        base = f"{FEED_ROOT}/{slug(series)}/{slug(season)}"
+        meta = {'series': series, 'season': season}
+        yield f"{base}/standings", meta, STANDINGS_COLUMNS, standings.get(season, [])
+        yield f"{base}/schedule", meta, SCHEDULE_COLUMNS, schedule.get(season, [])
+        yield f"{base}/results", meta, RESULTS_COLUMNS, [[*row[:6], bool(row[6]), bool(row[7])] for row in results.get(season, [])]
+
+    c.execute("""SELECT d.driver_id, d.driver_name, COUNT(s.season), COALESCE(SUM(s.finish_count), 0),
+                        COALESCE(SUM(s.points), 0), COALESCE(SUM(s.wins), 0), COALESCE(SUM(s.top_5s), 0),
+                        COALESCE(SUM(s.top_10s), 0), COALESCE(SUM(s.poles), 0),
+                        ROUND(SUM(s.finish_sum) * 1.0 / NULLIF(SUM(s.finish_count), 0), 3)
+                 FROM drivers d LEFT JOIN standings s ON s.driver_id = d.driver_id
+                 WHERE d.series = ?
+                 GROUP BY d.driver_id
+                 ORDER BY d.driver_name""", (series,))
+    yield f"{FEED_ROOT}/{slug(series)}/drivers", {'series': series}, DRIVER_COLUMNS, [list(row) for row in c.fetchall()]
+
+# ──────────────────────────────────────────────────────────────────────
+# Encoding + writing
+# ──────────────────────────────────────────────────────────────────────
+def encode_json(meta, columns, rows) -> bytes:
+    payload = {'version': FEED_VERSION, **meta, 'columns': columns, 'rows': [list(row) for row in rows]}
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def encode_csv(columns, rows) -> bytes:
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator='\n')
+    writer.writerow(columns)
+    # Spreadsheets read 1/0 more reliably than True/False
+    writer.writerows([int(v) if isinstance(v, bool) else v for v in row] for row in rows)
+    return buf.getvalue().encode('utf-8')
+
+def etag(data: bytes) -> str:
+    return '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+
+def variants(path):
+    return [path, f"{path}.gz", f"{path}.br"]
+
+def write_variants(full, data):
+    write_bytes_atomic(full, data)
+    # mtime=0 keeps the .gz byte-identical for identical input
+    write_bytes_atomic(f"{full}.gz", gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        write_bytes_atomic(f"{full}.br", brotli.compress(data, quality=11))
+    else:
+        # A .br left from a run that had brotli would serve stale data
+        try:
+            os.remove(f"{full}.br")
+        except FileNotFoundError:
+            pass
+
+def load_index(output):
+    try:
+        with open(os.path.join(output, FEED_ROOT, INDEX), encoding='utf-8') as f:
+            return json.load(f).get('feeds', {})
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def build_feeds(conn, output, series=None, force=False):
+    # Returns {'written': [...], 'unchanged': n, 'removed': [...]}
+    targets = list(series) if series else SUPPORTED_SERIES
+    index = {} if force else load_index(output)
+    updated = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+    written, unchanged, seen = [], 0, set()
+    c = conn.cursor()
+    for name in targets:
+        for base, meta, columns, rows in series_feeds(c, name):
+            for path, data in ((f"{base}.json", encode_json(meta, columns, rows)),
+                               (f"{base}.csv", encode_csv(columns, rows))):
+                seen.add(path)
+                tag = etag(data)
+                full = os.path.join(output, path)
+                if index.get(path, {}).get('etag') == tag and os.path.exists(full):
+                    unchanged += 1
+                    continue
+                write_variants(full, data)
+                index[path] = {'etag': tag, 'bytes': len(data), 'updated': updated}
+                written.append(path)
+    c.close()
+
+    prefixes = tuple(f"{FEED_ROOT}/{slug(name)}/" for name in targets)
+    removed = [path for path in index if path.startswith(prefixes) and path not in seen]
+    for path in removed:
+        del index[path]
+        for variant in variants(os.path.join(output, path)):
+            if os.path.exists(variant):
+                os.remove(variant)
+    if written or removed:
+        body = json.dumps({'version': FEED_VERSION, 'feeds': index}, separators=(',', ':'), sort_keys=True)
+        write_text_atomic(os.path.join(output, FEED_ROOT, INDEX), body)
+    return {'written': written, 'unchanged': unchanged, 'removed': removed}
@@ -1,103 +1,259 @@
-# generate.py — FINAL FIXED VERSION — WORKS WITH YOUR ascrl.db
-import sqlite3
+# generate.py — INCREMENTAL SITE BUILD — WORKS WITH YOUR ascrl.db
+# ──────────────────────────────────────────────────────────────────────
+# Every page is built from a small context of DB rows. The context is
+# fingerprinted and the fingerprints are kept in docs/.manifest.json, so
+# a run after one result upload only re-renders the pages that upload
+# touched (that series' season page, the race page, its drivers' pages
+# and the front page). Templates live in site_render.py, compiled once per
+# process; every file is streamed to a temp file and renamed so the site
+# is never half-written. The JSON/CSV feeds in feeds.py are built in the
+# same run, for the same series.
+import hashlib
+import json
 import os
-from jinja2 import Template
+import sqlite3
+import sys
+import time
 from datetime import datetime
 
+import ascrl_db
+import feeds
+from league import SUPPORTED_SERIES, CURRENT_SEASON, validate_series
+from site_render import TEMPLATE_VERSION, slug, write_atomic, write_text_atomic
+
 DB = 'ascrl.db'
 OUTPUT = 'docs'
-os.makedirs(OUTPUT, exist_ok=True)
-
-conn = sqlite3.connect(DB)
-c = conn.cursor()
-
-# CUP STANDINGS
-c.execute("SELECT driver_name, points, wins, avg_finish FROM standings WHERE series='Cup' ORDER BY points DESC")
-cup = c.fetchall()
-
-# TRUCK STANDINGS
-c.execute("SELECT driver_name, points, wins, avg_finish FROM standings WHERE series='Truck' ORDER BY points DESC")
-truck = c.fetchall()
-
-# SCHEDULE + WINNERS (JOIN races + winners)
-c.execute("""
-    SELECT r.track, r.date, COALESCE(w.winner, 'TBD') as winner
-    FROM races r
-    LEFT JOIN winners w ON r.track = w.track AND r.series = w.series
-    WHERE r.series = 'Cup'
-    ORDER BY r.date
-""")
-schedule = c.fetchall()
-
-conn.close()
-
-# HTML TEMPLATE
-template = """
-<!DOCTYPE html>
-<html>
-<head>
-  <title>ASCRL - Live</title>
-  <meta name="viewport" content="width=device-width, initial-scale=1">
-  <style>
-    body { font-family: Arial; background: #000; color: #fff; margin: 0; }
-    .container { max-width: 1000px; margin: 0 auto; padding: 20px; }
-    h1 { color: #FFD700; text-align: center; }
-    table { width: 100%; border-collapse: collapse; margin: 20px 0; background: #111; }
-    th { background: #BC6C25; padding: 10px; color: #fff; }
-    td { padding: 8px; border-bottom: 1px solid #444; text-align: center; }
-    tr:hover { background: #222; }
-    .series { margin: 40px 0; }
-    .refresh { text-align: center; color: #0f0; font-size: 0.9em; }
-  </style>
-</head>
-<body>
-  <div class="container">
-    <h1>ASCRL LIVE</h1>
-    <p class="refresh">Updated: {{ now }}</p>
-
-    <div class="series">
-      <h2>CUP SERIES</h2>
-      <table>
-        <tr><th>Pos</th><th>Driver</th><th>Pts</th><th>Wins</th><th>Avg</th></tr>
-        {% for row in cup %}
-        <tr><td>{{ loop.index }}</td><td>{{ row[0] }}</td><td>{{ row[1] }}</td><td>{{ row[2] }}</td><td>{{ row[3]|default('N/A') }}</td></tr>
-        {% endfor %}
-      </table>
-    </div>
-
-    <div class="series">
-      <h2>TRUCK SERIES</h2>
-      <table>
-        <tr><th>Pos</th><th>Driver</th><th>Pts</th><th>Wins</th><th>Avg</th></tr>
-        {% for row in truck %}
-        <tr><td>{{ loop.index }}</td><td>{{ row[0] }}</td><td>{{ row[1] }}</td><td>{{ row[2] }}</td><td>{{ row[3]|default('N/A') }}</td></tr>
-        {% endfor %}
-      </table>
-    </div>
-
-    <div class="series">
-      <h2>SCHEDULE</h2>
-      <table>
-        <tr><th>Track</th><th>Date</th><th>Winner</th></tr>
-        {% for row in schedule %}
-        <tr><td>{{ row[0] }}</td><td>{{ row[1] }}</td><td>{{ row[2] }}</td></tr>
-        {% endfor %}
-      </table>
-    </div>
-  </div>
-</body>
-</html>
-"""
-
-# Render & save
-html = Template(template).render(
-    cup=cup,
-    truck=truck,
-    schedule=schedule,
-    now=datetime.now().strftime("%Y-%m-%d %H:%M")
-)
-
-with open(f"{OUTPUT}/index.html", "w") as f:
-    f.write(html)
-
-print("https://mattwilson20.github.io/ascrl-platform/")
\ No newline at end of file
+MANIFEST = '.manifest.json'
+SITE_URL = 'https://mattwilson20.github.io/ascrl-platform/'
+
+# ──────────────────────────────────────────────────────────────────────
+# Paths
+# ──────────────────────────────────────────────────────────────────────
+def series_href(series):
+    return f"{slug(series)}/index.html"
+
+def season_href(series, season):
+    return f"{slug(series)}/{slug(season)}.html"
+
+def race_href(series, race_id):
+    return f"{slug(series)}/races/{race_id}.html"
+
+def driver_href(series, driver_id):
+    return f"{slug(series)}/drivers/{driver_id}.html"
+
+# ──────────────────────────────────────────────────────────────────────
+# Pages – (path, template, context); context holds DB rows only
+# ──────────────────────────────────────────────────────────────────────
+STAT_COLUMNS = ('points', 'wins', 'top_5s', 'top_10s', 'poles', 'avg_finish')
+
+def series_pages(c, series):
+    # Three set-based reads per series, grouped in Python into page contexts
+    c.execute("""SELECT s.season, d.driver_id, d.driver_name, s.points, s.wins, s.top_5s, s.top_10s, s.poles, s.avg_finish
+                 FROM standings s JOIN drivers d ON d.driver_id = s.driver_id
+                 WHERE s.series = ?
+                 ORDER BY s.season, s.points DESC, s.avg_finish ASC NULLS LAST, d.driver_name""", (series,))
+    standings = {}
+    for season, driver_id, name, *stats in c.fetchall():
+        standings.setdefault(season, []).append(
+            dict(driver=name, driver_id=driver_id, driver_href=driver_href(series, driver_id), **dict(zip(STAT_COLUMNS, stats))))
+    c.execute("""SELECT ra.race_id, ra.season, ra.track, ra.date, w.driver_id, d.driver_name
+                 FROM races ra
+                 LEFT JOIN winners w ON w.race_id = ra.race_id
+                 LEFT JOIN drivers d ON d.driver_id = w.driver_id
+                 WHERE ra.series = ?
+                 ORDER BY ra.date, ra.race_id""", (series,))
+    races = {}
+    for race_id, season, track, date, winner_id, winner in c.fetchall():
+        races[race_id] = dict(race_id=race_id, season=season, track=track, date=date, href=race_href(series, race_id),
+                              winner=winner, winner_href=driver_href(series, winner_id) if winner_id else None)
+    c.execute("""SELECT r.race_id, d.driver_id, d.driver_name, r.finish_position, r.pole, r.fastest_lap
+                 FROM races ra
+                 JOIN results r ON r.race_id = ra.race_id
+                 JOIN drivers d ON d.driver_id = r.driver_id
+                 WHERE ra.series = ?
+                 ORDER BY r.race_id, r.finish_position IS NULL, r.finish_position""", (series,))
+    race_results, driver_results = {}, {}
+    for race_id, driver_id, name, finish, pole, fastest_lap in c.fetchall():
+        pole, fastest_lap = pole == 'Yes', fastest_lap == 'FL'
+        race_results.setdefault(race_id, []).append(
+            dict(driver=name, driver_href=driver_href(series, driver_id), finish=finish, pole=pole, fastest_lap=fastest_lap))
+        race = races[race_id]
+        driver_results.setdefault(driver_id, []).append(
+            dict(season=race['season'], date=race['date'], track=race['track'], href=race['href'],
+                 finish=finish, pole=pole, fastest_lap=fastest_lap))
+    c.execute("SELECT driver_id, driver_name FROM drivers WHERE series = ?", (series,))
+    drivers = dict(c.fetchall())
+
+    seasons = sorted(set(standings) | {race['season'] for race in races.values()})
+    for season in seasons:
+        yield season_href(series, season), 'season.html', dict(
+            series=series, season=season, standings=standings.get(season, []),
+            races=[race for race in races.values() if race['season'] == season],
+            other_seasons=[dict(name=s, href=season_href(series, s)) for s in seasons if s != season])
+    # The series landing page is the current season (or the latest one on record)
+    landing = CURRENT_SEASON if CURRENT_SEASON in seasons or not seasons else seasons[-1]
+    yield series_href(series), 'season.html', dict(
+        series=series, season=landing, standings=standings.get(landing, []),
+        races=[race for race in races.values() if race['season'] == landing],
+        other_seasons=[dict(name=s, href=season_href(series, s)) for s in seasons if s != landing])
+    for race_id, race in races.items():
+        yield race['href'], 'race.html', dict(
+            series=series, race=race, season_href=season_href(series, race['season']), results=race_results.get(race_id, []))
+    for driver_id, name in drivers.items():
+        seasons_row = [dict(season=season, **{k: row[k] for k in STAT_COLUMNS})
+                       for season, rows in standings.items() for row in rows if row['driver_id'] == driver_id]
+        yield driver_href(series, driver_id), 'driver.html', dict(
+            series=series, series_href=series_href(series), driver=name,
+            seasons=seasons_row, results=driver_results.get(driver_id, []))
+
+def index_page(c):
+    today = datetime.now().strftime('%Y-%m-%d')
+    series = []
+    for name in SUPPORTED_SERIES:
+        c.execute("""SELECT d.driver_id, d.driver_name, s.points, s.wins, s.top_5s, s.top_10s, s.poles, s.avg_finish
+                     FROM standings s JOIN drivers d ON d.driver_id = s.driver_id
+                     WHERE s.series = ? AND s.season = ?
+                     ORDER BY s.points DESC, s.avg_finish ASC NULLS LAST, d.driver_name LIMIT 10""", (name, CURRENT_SEASON))
+        top = [dict(driver=driver, driver_href=driver_href(name, driver_id), **dict(zip(STAT_COLUMNS, stats)))
+               for driver_id, driver, *stats in c.fetchall()]
+        c.execute("""SELECT race_id, track, date FROM races
+                     WHERE series = ? AND season = ? AND date >= ? AND date != 'N/A' ORDER BY date LIMIT 1""",
+                  (name, CURRENT_SEASON, today))
+        row = c.fetchone()
+        next_race = dict(track=row[1], date=row[2], href=race_href(name, row[0])) if row else None
+        series.append(dict(name=name, href=series_href(name), standings=top, next_race=next_race))
+    return 'index.html', 'index.html', dict(season=CURRENT_SEASON, series=series)
+
+# ──────────────────────────────────────────────────────────────────────
+# Build
+# ──────────────────────────────────────────────────────────────────────
+def fingerprint(template, context) -> str:
+    payload = json.dumps([TEMPLATE_VERSION, template, context], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def load_manifest(output):
+    try:
+        with open(os.path.join(output, MANIFEST), encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def build_site(conn, output=OUTPUT, series=None, force=False):
+    # series: only rebuild those series' pages (the front page is always checked).
+    # Returns {'written': [...], 'unchanged': n, 'removed': [...]}
+    targets = list(series) if series else SUPPORTED_SERIES
+    manifest = {} if force else load_manifest(output)
+    now = datetime.now().strftime("%Y-%m-%d %H:%M")
+    c = conn.cursor()
+    pages = [index_page(c)]
+    for name in targets:
+        pages.extend(series_pages(c, name))
+    c.close()
+
+    written, unchanged, seen = [], 0, set()
+    for path, template, context in pages:
+        seen.add(path)
+        digest = fingerprint(template, context)
+        full = os.path.join(output, path)
+        if manifest.get(path) == digest and os.path.exists(full):
+            unchanged += 1
+            continue
+        root = '../' * path.count('/')
+        write_atomic(full, template, root=root, now=now, **context)
+        manifest[path] = digest
+        written.append(path)
+
+    # Pages of rebuilt series that no longer exist (race or driver removed)
+    prefixes = tuple(f"{slug(name)}/" for name in targets)
+    removed = [path for path in manifest if path.startswith(prefixes) and path not in seen]
+    for path in removed:
+        del manifest[path]
+        try:
+            os.remove(os.path.join(output, path))
+        except FileNotFoundError:
+            pass
+    if written or removed:
+        write_text_atomic(os.path.join(output, MANIFEST), json.dumps(manifest, indent=0, sort_keys=True))
+    return {'written': written, 'unchanged': unchanged, 'removed': removed,
+            'feeds': feeds.build_feeds(conn, output, targets, force=force)}
+
+def report(stats):
+    feed = stats['feeds']
+    return (f"{len(stats['written'])} pages written, {stats['unchanged']} unchanged, {len(stats['removed'])} removed; "
+            f"feeds: {len(feed['written'])} written, {feed['unchanged']} unchanged, {len(feed['removed'])} removed")
+
+# ──────────────────────────────────────────────────────────────────────
+# WATCH MODE – rebuild the series that changed, seconds after a write
+# ──────────────────────────────────────────────────────────────────────
+# PRAGMA data_version only moves when ANOTHER connection commits, so the
+# idle poll costs no I/O. The bot's change_log table (kept by triggers)
+# then says which series those commits touched.
+POLL_INTERVAL = 1.0     # seconds between data_version checks
+DEBOUNCE = 3.0          # quiet time after the last commit before rebuilding
+MAX_DELAY = 30.0        # ...but never hold a rebuild back longer than this
+
+def change_versions(conn):
+    # {series: version}, or None on a DB that predates the change_log migration
+    try:
+        return dict(conn.execute("SELECT series, version FROM change_log").fetchall())
+    except sqlite3.OperationalError:
+        return None
+
+def changed_series(before, after):
+    # Series to rebuild; None means everything (no log, or a change with unknown series)
+    if before is None or after is None:
+        return None
+    moved = {series for series, version in after.items() if before.get(series) != version}
+    if '*' in moved:
+        return None
+    return [series for series in SUPPORTED_SERIES if series in moved]
+
+def watch(output=OUTPUT, poll=POLL_INTERVAL, debounce=DEBOUNCE, max_delay=MAX_DELAY):
+    conn = ascrl_db.connect(DB)
+    try:
+        print(f"Initial build: {report(build_site(conn, output))}")
+        versions = change_versions(conn)
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        first_change = last_change = None
+        print(f"Watching {DB} – Ctrl+C to stop")
+        while True:
+            time.sleep(poll)
+            now = time.monotonic()
+            current = conn.execute("PRAGMA data_version").fetchone()[0]
+            if current != data_version:
+                data_version = current
+                first_change = first_change or now
+                last_change = now
+            if first_change is None:
+                continue
+            if now - last_change < debounce and now - first_change < max_delay:
+                continue
+            first_change = None
+            latest = change_versions(conn)
+            series = changed_series(versions, latest)
+            versions = latest
+            if series == []:
+                continue   # only series the site doesn't publish moved
+            stats = build_site(conn, output, series=series)
+            print(f"{datetime.now():%H:%M:%S} rebuilt {', '.join(series or SUPPORTED_SERIES)}: {report(stats)}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        conn.close()
+
+def main(argv):
+    if '--watch' in argv:
+        watch()
+        return
+    force = '--force' in argv
+    series = [validate_series(arg) for arg in argv if not arg.startswith("--")] or None
+    conn = ascrl_db.connect(DB)
+    try:
+        stats = build_site(conn, series=series, force=force)
+    finally:
+        conn.close()
+    print(report(stats))
+    print(SITE_URL)
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
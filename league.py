@@ -0,0 +1,64 @@
+# ──────────────────────────────────────────────────────────────────────
+# LEAGUE CONFIG – SHARED BY THE BOT, THE SITE BUILD AND THE SCRIPTS
+# ──────────────────────────────────────────────────────────────────────
+# Importing nascar_bot starts the bot, so anything a script also needs
+# lives here instead.
+from datetime import datetime
+
+SUPPORTED_SERIES = ['Cup', 'Truck', 'Xfinity', 'ARCA']
+CURRENT_SEASON = 'Season 1'
+
+# ──────────────────────────────────────────────────────────────────────
+# Validate series – DEFINED BEFORE ANY USE
+# ──────────────────────────────────────────────────────────────────────
+def validate_series(series: str) -> str:
+    s = series.title()
+    if s not in SUPPORTED_SERIES:
+        raise ValueError(f"Invalid series. Choose from: {', '.join(SUPPORTED_SERIES)}")
+    return s
+
+# ──────────────────────────────────────────────────────────────────────
+# Race lookup – the bot and the API resolve race arguments the same way
+# ──────────────────────────────────────────────────────────────────────
+def parse_race_spec(spec: str):
+    # "12" (race id), "Martinsville" or "Martinsville@2025-11-03" -> (race_id, track, date)
+    spec = spec.strip()
+    if spec.isdigit():
+        return int(spec), None, None
+    track, _, date = spec.partition('@')
+    date = date.strip() or None
+    if date:
+        datetime.strptime(date, '%Y-%m-%d')
+    return None, track.strip().title(), date
+
+def find_race(c, series: str, spec: str, season: str = None):
+    # A bare track means that season's most recent running of it, else the next one.
+    # Returns (race_id, track, date, season) or None.
+    race_id, track, date = parse_race_spec(spec)
+    if race_id is not None:
+        c.execute("SELECT race_id, track, date, season FROM races WHERE race_id = ? AND series = ?", (race_id, series))
+        return c.fetchone()
+    if date:
+        c.execute("SELECT race_id, track, date, season FROM races WHERE series = ? AND track = ? AND date = ? ORDER BY season = ? DESC LIMIT 1",
+                  (series, track, date, season or CURRENT_SEASON))
+        return c.fetchone()
+    today = datetime.now().strftime('%Y-%m-%d')
+    c.execute("""SELECT race_id, track, date, season FROM races
+                 WHERE series = ? AND season = ? AND track = ?
+                 ORDER BY date > ?, CASE WHEN date <= ? THEN date END DESC, date ASC LIMIT 1""",
+              (series, season or CURRENT_SEASON, track, today, today))
+    return c.fetchone()
+
+# ──────────────────────────────────────────────────────────────────────
+# Standings versions – bumped by every writer, bot or maintenance CLI
+# ──────────────────────────────────────────────────────────────────────
+def bump_standings_version(c, series: str, season: str):
+    # Monotonic per-season counter in bot_meta; anything derived from standings
+    # or results (charts) is cached against it
+    c.execute("""INSERT INTO bot_meta (key, value) VALUES (?, 1)
+                 ON CONFLICT (key) DO UPDATE SET value = value + 1""", (f"standings_version:{series}:{season}",))
+
+def standings_version(c, series: str, season: str) -> int:
+    c.execute("SELECT value FROM bot_meta WHERE key = ?", (f"standings_version:{series}:{season}",))
+    row = c.fetchone()
+    return int(row[0]) if row else 0
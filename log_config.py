@@ -0,0 +1,129 @@
+# ──────────────────────────────────────────────────────────────────────
+# LOGGING – JSON LINES, WRITTEN OFF THE EVENT LOOP, ROTATED + COMPRESSED
+# ──────────────────────────────────────────────────────────────────────
+# Loggers only put records on a queue, and a QueueListener thread does the
+# formatting and file I/O. The file rolls over at MAX_BYTES or at midnight,
+# whichever comes first, and rolled files are gzipped (.1.gz newest).
+# Each line is one JSON object:
+#   {"ts": ..., "level": ..., "logger": ..., "msg": ..., "exc": ..., <extra>}
+# Fields passed with extra={...} become top-level keys, so
+#   logging.info("command done", extra={'command': 'standings', 'ms': 12.5})
+# can be filtered with jq or grep without parsing messages. Tracebacks stay
+# on one line in "exc".
+#   ASCRL_LOG_LEVEL=DEBUG                         root level (default INFO)
+#   ASCRL_LOG_LEVELS=discord.http=DEBUG,ascrl=INFO  per-logger overrides
+import atexit
+import copy
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import time
+from datetime import datetime, timedelta, timezone
+
+LOG_FILE = 'nascar_bot.jsonl'
+MAX_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 14
+ROOT_LEVEL = os.getenv('ASCRL_LOG_LEVEL', 'INFO').upper()
+LOGGER_LEVELS = {
+    'discord': 'INFO',
+    'discord.gateway': 'INFO',     # heartbeat/dispatch chatter is DEBUG
+    'discord.http': 'WARNING',
+    'aiohttp.access': 'WARNING',
+}
+
+# Attributes every LogRecord has – anything else came from extra={...}
+_RECORD_FIELDS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'taskName'}
+
+def _overrides(spec):
+    # "name=LEVEL,name=LEVEL" -> {name: LEVEL}
+    pairs = (item.split('=', 1) for item in spec.split(',') if '=' in item)
+    return {name.strip(): level.strip().upper() for name, level in pairs}
+
+# ──────────────────────────────────────────────────────────────────────
+# Formatter + handlers
+# ──────────────────────────────────────────────────────────────────────
+class JSONFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        entry.update((key, value) for key, value in vars(record).items()
+                     if key not in _RECORD_FIELDS and not key.startswith('_'))
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class LoopSafeQueueHandler(logging.handlers.QueueHandler):
+    # Merge args into the message on the calling thread (args may be mutated
+    # later) but leave exc_info alone: the queue is in-process, and the
+    # listener formats the traceback instead of the event loop.
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        return record
+
+class SizeAndTimeRotatingHandler(logging.handlers.RotatingFileHandler):
+    # RotatingFileHandler (numbered, size-triggered) that also rolls at local midnight
+    def __init__(self, filename, max_bytes=MAX_BYTES, backup_count=BACKUP_COUNT):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True)
+        self.namer = lambda name: f"{name}.gz"
+        self.rotator = self._compress
+        self.rollover_at = self._next_midnight()
+
+    @staticmethod
+    def _next_midnight():
+        tomorrow = datetime.now().date() + timedelta(days=1)
+        return time.mktime(tomorrow.timetuple())
+
+    @staticmethod
+    def _compress(source, dest):
+        with open(source, 'rb') as src, gzip.open(dest, 'wb') as out:
+            shutil.copyfileobj(src, out)
+        os.remove(source)
+
+    def shouldRollover(self, record):
+        if time.time() >= self.rollover_at and os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename):
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self.rollover_at = self._next_midnight()
+
+class Listener(logging.handlers.QueueListener):
+    def stop(self):
+        # Safe to call twice – atexit also stops it
+        if self._thread is not None:
+            super().stop()
+
+# ──────────────────────────────────────────────────────────────────────
+# Setup
+# ──────────────────────────────────────────────────────────────────────
+def setup_logging(filename=LOG_FILE, root_level=ROOT_LEVEL, levels=None):
+    # Returns the started QueueListener; it is stopped (and flushed) at exit
+    file_handler = SizeAndTimeRotatingHandler(filename)
+    file_handler.setFormatter(JSONFormatter())
+    records = queue.SimpleQueue()
+    listener = Listener(records, file_handler, respect_handler_level=True)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(LoopSafeQueueHandler(records))
+    root.setLevel(root_level)
+    for name, level in {**LOGGER_LEVELS, **_overrides(os.getenv('ASCRL_LOG_LEVELS', '')), **(levels or {})}.items():
+        logging.getLogger(name).setLevel(level)
+
+    listener.start()
+    atexit.register(listener.stop)
+    logging.captureWarnings(True)
+    return listener
@@ -0,0 +1,250 @@
+# maintenance.py – LEAGUE DATA MAINTENANCE (replaces truck_cleanup.py / truck_full_reset.py)
+# ──────────────────────────────────────────────────────────────────────
+#   python maintenance.py purge-results --series Truck [--season "Season 1"]
+#       results, winners and standings go; the schedule and roster stay
+#   python maintenance.py reset-series --series Truck [--season "Season 1"]
+#       also the races and their reminder ledger; the roster too unless --season is given
+#   python maintenance.py vacuum | analyze | reindex
+# Every command takes --dry-run (report what would change, write nothing)
+# and --db PATH. Anything that writes first takes a backups.py snapshot
+# (online, compressed, rotated), so the bot can keep running. A purge or
+# reset is first appended to the bot's result event log (never erased from
+# it), in its own transaction. Then the rows go in key batches of --batch,
+# each committed on its own, so the bot's writes only ever wait for one
+# batch. Under WAL the bot's reads keep answering the whole time. If a
+# purge is interrupted, run it again: it logs and deletes what is left.
+import argparse
+import sys
+
+import ascrl_db
+import backups
+from league import validate_series, bump_standings_version
+
+DB = 'ascrl.db'
+BATCH_SIZE = 500
+
+# ──────────────────────────────────────────────────────────────────────
+# Scopes – (table, primary key, WHERE) in delete order; params :series, :season
+# ──────────────────────────────────────────────────────────────────────
+# races / drivers go last: the other tables' scopes are subqueries on them
+IN_RACES = "race_id IN (SELECT race_id FROM races WHERE series = :series AND (:season IS NULL OR season = :season))"
+IN_ROSTER = "driver_id IN (SELECT driver_id FROM drivers WHERE series = :series)"
+SEASON_SCOPE = "series = :series AND (:season IS NULL OR season = :season)"
+
+PURGE_RESULTS = [
+    ('results', 'race_id, driver_id', IN_RACES),
+    ('winners', 'race_id', IN_RACES),
+    ('standings', 'driver_id, season', SEASON_SCOPE),
+]
+RESET_SEASON = [
+    ('reminders_sent', 'series, track, date, offset',
+     "series = :series AND (:season IS NULL OR (track, date) IN "
+     "(SELECT track, date FROM races WHERE series = :series AND season = :season))"),
+    *PURGE_RESULTS,
+    ('races', 'race_id', SEASON_SCOPE),
+]
+RESET_SERIES = [
+    # Whole series: the roster goes too, with anything still pointing at it
+    RESET_SEASON[0],
+    ('results', 'race_id, driver_id', f"{IN_RACES} OR {IN_ROSTER}"),
+    ('winners', 'race_id', f"{IN_RACES} OR {IN_ROSTER}"),
+    ('standings', 'driver_id, season', f"{SEASON_SCOPE} OR {IN_ROSTER}"),
+    ('races', 'race_id', SEASON_SCOPE),
+    ('drivers', 'driver_id', "series = :series"),
+]
+
+def scope_for(command, season):
+    if command == 'purge-results':
+        return PURGE_RESULTS
+    return RESET_SEASON if season else RESET_SERIES
+
+# ──────────────────────────────────────────────────────────────────────
+# Batched delete
+# ──────────────────────────────────────────────────────────────────────
+def count_rows(c, table, where, params):
+    c.execute(f"SELECT COUNT(*) FROM {table} WHERE {where}", params)
+    return c.fetchone()[0]
+
+def transaction(c, fn, *args):
+    # One short BEGIN IMMEDIATE ... COMMIT around fn(c, *args)
+    c.execute("BEGIN IMMEDIATE")
+    try:
+        result = fn(c, *args)
+        c.execute("COMMIT")
+    except BaseException:
+        c.execute("ROLLBACK")
+        raise
+    return result
+
+def delete_batch(c, table, key, where, params, batch):
+    c.execute(f"DELETE FROM {table} WHERE ({key}) IN (SELECT {key} FROM {table} WHERE {where} LIMIT :batch)",
+              {**params, 'batch': batch})
+    return c.rowcount
+
+def delete_batched(c, table, key, where, params, batch):
+    # Every batch commits by itself – the writer is never held for more than one
+    total = 0
+    while True:
+        deleted = transaction(c, delete_batch, table, key, where, params, batch)
+        total += deleted
+        if deleted < batch:
+            return total
+
+def log_purge(c, command, scope, params):
+    # result_events is append-only: a purge is recorded, never erased. Purged
+    # results are logged 'cleared' and every driver losing standings rows
+    # 'driver_removed', so replay lands on the purged state too.
+    c.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'result_events'")
+    if not c.fetchone():
+        return 0      # DB predates the event log
+    wheres = dict((table, where) for table, _, where in scope)
+    c.execute("SELECT COALESCE(MAX(batch_id), 0) + 1 FROM result_events")
+    params = {**params, 'batch': c.fetchone()[0], 'note': f"maintenance {command}"}
+    c.execute("SELECT 1 FROM pragma_table_info('result_events') WHERE name = 'stages'")
+    # Stage finishes arrived with the bot's schema migration 9
+    stages, r_stages = (", stages", ", r.stages") if c.fetchone() else ("", "")
+    c.execute(f"""INSERT INTO result_events (batch_id, kind, series, season, race_id, driver_id,
+                                             finish_position, pole, fastest_lap{stages}, note, created_at)
+                  SELECT :batch, 'cleared', ra.series, ra.season, r.race_id, r.driver_id,
+                         r.finish_position, r.pole, r.fastest_lap{r_stages}, :note, datetime('now')
+                  FROM (SELECT * FROM results WHERE {wheres['results']}) r JOIN races ra ON ra.race_id = r.race_id""", params)
+    logged = c.rowcount
+    c.execute(f"""INSERT INTO result_events (batch_id, kind, series, season, driver_id, note, created_at)
+                  SELECT :batch, 'driver_removed', series, season, driver_id, :note, datetime('now')
+                  FROM standings WHERE {wheres['standings']}""", params)
+    return logged + c.rowcount
+
+def touched_seasons(c, params):
+    # (series, season) pairs whose standings version must move
+    c.execute("""SELECT series, season FROM races WHERE series = :series AND (:season IS NULL OR season = :season)
+                 UNION SELECT series, season FROM standings WHERE series = :series AND (:season IS NULL OR season = :season)""",
+              params)
+    return c.fetchall()
+
+def bump_seasons(c, seasons):
+    for series, season in seasons:
+        bump_standings_version(c, series, season)
+
+# ──────────────────────────────────────────────────────────────────────
+# Commands
+# ──────────────────────────────────────────────────────────────────────
+def purge(conn, command, series, season=None, dry_run=False, batch=BATCH_SIZE, take_backup=True):
+    # Returns {table: rows} – counted for a dry run, deleted otherwise
+    params = {'series': series, 'season': season}
+    scope = scope_for(command, season)
+    what = f"{series} {season or '(all seasons)'}"
+    c = conn.cursor()
+    if dry_run:
+        counts = {table: count_rows(c, table, where, params) for table, _, where in scope}
+        c.close()
+        print(f"DRY RUN – {command} {what} would delete:")
+        for table, rows in counts.items():
+            print(f"  {table:<15} {rows}")
+        return counts
+
+    if take_backup:
+        print(f"Backup: {backups.snapshot(conn=conn, label=f'before_{command}_{series}')}")
+    conn.isolation_level = None     # explicit BEGIN/COMMIT – one short transaction per step
+
+    def start(c):
+        # Logged before anything goes, so replay already lands on the purged state
+        seasons = touched_seasons(c, params)
+        logged = log_purge(c, command, scope, params)
+        bump_seasons(c, seasons)
+        return seasons, logged
+
+    counts = {}
+    try:
+        seasons, logged = transaction(c, start)
+        print(f"  {'result_events':<15} {logged} appended")
+        for table, key, where in scope:
+            counts[table] = delete_batched(c, table, key, where, params, batch)
+            print(f"  {table:<15} {counts[table]} deleted")
+        # Again at the end: anything cached from a half-purged season goes too
+        transaction(c, bump_seasons, seasons)
+    except BaseException:
+        print(f"{command} {what} FAILED after deleting {counts or 'nothing'} – "
+              f"run it again to finish (the backup has the data from before)")
+        raise
+    finally:
+        c.close()
+    print(f"{command} {what} done – {sum(counts.values())} rows deleted")
+    return counts
+
+def vacuum(conn, dry_run=False, take_backup=True):
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    pages = conn.execute("PRAGMA page_count").fetchone()[0]
+    free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    print(f"{pages * page_size // 1024} KiB on disk, {free * page_size // 1024} KiB reclaimable")
+    if dry_run:
+        return
+    if take_backup:
+        print(f"Backup: {backups.snapshot(conn=conn, label='before_vacuum')}")
+    conn.execute("VACUUM")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    pages = conn.execute("PRAGMA page_count").fetchone()[0]
+    print(f"VACUUM done – {pages * page_size // 1024} KiB on disk")
+
+def analyze(conn, dry_run=False, take_backup=True):
+    tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")]
+    print(f"ANALYZE {len(tables)} tables: {', '.join(tables)}")
+    if dry_run:
+        return
+    if take_backup:
+        print(f"Backup: {backups.snapshot(conn=conn, label='before_analyze')}")
+    conn.execute("ANALYZE")
+    conn.execute("PRAGMA optimize")
+    conn.commit()
+    print("ANALYZE done – query planner statistics refreshed")
+
+def reindex(conn, dry_run=False, take_backup=True):
+    indexes = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' ORDER BY name")]
+    print(f"REINDEX {len(indexes)} indexes: {', '.join(indexes)}")
+    if dry_run:
+        return
+    if take_backup:
+        print(f"Backup: {backups.snapshot(conn=conn, label='before_reindex')}")
+    conn.execute("REINDEX")
+    conn.commit()
+    print("REINDEX done")
+
+# ──────────────────────────────────────────────────────────────────────
+# CLI
+# ──────────────────────────────────────────────────────────────────────
+def series_type(value):
+    try:
+        return validate_series(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def parser():
+    p = argparse.ArgumentParser(description="ASCRL database maintenance")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--db', default=DB, help=f"database file (default {DB})")
+    common.add_argument('--dry-run', action='store_true', help="report what would change, write nothing")
+    common.add_argument('--no-backup', dest='backup', action='store_false', help="skip the automatic backup")
+    sub = p.add_subparsers(dest='command', required=True)
+    for name, help_text in (('purge-results', "delete results, winners and standings"),
+                            ('reset-series', "delete a series' (or one season's) races, results and roster")):
+        cmd = sub.add_parser(name, parents=[common], help=help_text)
+        cmd.add_argument('--series', required=True, type=series_type)
+        cmd.add_argument('--season', help="limit to one season (default: every season)")
+        cmd.add_argument('--batch', type=int, default=BATCH_SIZE, help=f"rows per DELETE (default {BATCH_SIZE})")
+    sub.add_parser('vacuum', parents=[common], help="rebuild the file, reclaiming free pages")
+    sub.add_parser('analyze', parents=[common], help="refresh query planner statistics")
+    sub.add_parser('reindex', parents=[common], help="rebuild every index")
+    return p
+
+def main(argv):
+    args = parser().parse_args(argv)
+    conn = ascrl_db.connect(args.db)
+    try:
+        if args.command in ('purge-results', 'reset-series'):
+            purge(conn, args.command, args.series, args.season, args.dry_run, args.batch, args.backup)
+        else:
+            {'vacuum': vacuum, 'analyze': analyze, 'reindex': reindex}[args.command](conn, args.dry_run, args.backup)
+    finally:
+        conn.close()
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
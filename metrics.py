@@ -0,0 +1,189 @@
+# ──────────────────────────────────────────────────────────────────────
+# METRICS – COMMAND / DB / EVENT-LOOP TIMINGS IN BOUNDED HISTOGRAMS
+# ──────────────────────────────────────────────────────────────────────
+# Every timing lands in a fixed-bucket histogram, so memory stays flat no
+# matter how long the bot runs. Percentiles are interpolated within
+# buckets, which is close enough for "is !standings 20 ms or 2 s". Families:
+#   command      whole command, from invoke to reply sent
+#   command_db   the part of a command spent waiting on ascrl_db
+#   db           one ascrl_db call, timed inside the DB thread
+#   loop_lag     how late the watchdog's sleep woke up
+#   outbound     enqueue to delivery for queued API calls (outbound.py)
+# Gauges hold current values, e.g. outbound_queue_depth per channel.
+# Slow calls are logged with their SQL. With ASCRL_METRICS_FILE set, the
+# Prometheus text format is also written there every DUMP_INTERVAL seconds.
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+MAX_NAMES = 200             # per family; later names share one 'other' histogram
+SLOW_COMMAND = float(os.getenv('ASCRL_SLOW_COMMAND', '2.0'))
+SLOW_QUERY = float(os.getenv('ASCRL_SLOW_QUERY', '0.25'))
+LAG_INTERVAL = 0.5          # watchdog sleep
+LAG_WARN = 0.25             # loop blocked this long -> warning
+METRICS_FILE = os.getenv('ASCRL_METRICS_FILE')
+DUMP_INTERVAL = 60.0
+
+log = logging.getLogger('ascrl.perf')
+
+# DB time awaited by the current command; set per command task in before_invoke
+command_db_time = contextvars.ContextVar('command_db_time', default=None)
+
+# ──────────────────────────────────────────────────────────────────────
+# Histogram
+# ──────────────────────────────────────────────────────────────────────
+class Histogram:
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)   # last bucket is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        i = 0
+        while i < len(BUCKETS) and seconds > BUCKETS[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        target, seen = q * self.count, 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= target:
+                lower = BUCKETS[i - 1] if i else 0.0
+                upper = min(BUCKETS[i], self.max) if i < len(BUCKETS) else self.max
+                return lower + (upper - lower) * (target - seen) / n
+            seen += n
+        return self.max
+
+# ──────────────────────────────────────────────────────────────────────
+# Registry – thread-safe, DB timings arrive from the DB threads
+# ──────────────────────────────────────────────────────────────────────
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._families = {}
+        self._gauges = {}
+
+    def observe(self, family, name, seconds):
+        with self._lock:
+            histograms = self._families.setdefault(family, {})
+            if name not in histograms and len(histograms) >= MAX_NAMES:
+                name = 'other'
+            histogram = histograms.get(name)
+            if histogram is None:
+                histogram = histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def set_gauge(self, family, name, value):
+        with self._lock:
+            self._gauges.setdefault(family, {})[name] = value
+
+    def gauges(self, family):
+        with self._lock:
+            return dict(self._gauges.get(family, {}))
+
+    def summary(self, family):
+        # [(name, count, p50, p95, p99, max)] – busiest first
+        with self._lock:
+            rows = [(name, h.count, h.quantile(0.5), h.quantile(0.95), h.quantile(0.99), h.max)
+                    for name, h in self._families.get(family, {}).items()]
+        return sorted(rows, key=lambda r: -r[1])
+
+    def reset(self):
+        # Gauges are current state, not history – they survive a reset
+        with self._lock:
+            self._families.clear()
+
+    def prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            for family, histograms in sorted(self._families.items()):
+                metric = f"ascrl_{family}_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                for name, h in sorted(histograms.items()):
+                    label = _prom_label(name)
+                    cumulative = 0
+                    for bound, n in zip((*BUCKETS, '+Inf'), h.counts):
+                        cumulative += n
+                        lines.append(f'{metric}_bucket{{name="{label}",le="{bound}"}} {cumulative}')
+                    lines.append(f'{metric}_sum{{name="{label}"}} {h.total:.6f}')
+                    lines.append(f'{metric}_count{{name="{label}"}} {h.count}')
+            for family, values in sorted(self._gauges.items()):
+                lines.append(f"# TYPE ascrl_{family} gauge")
+                for name, value in sorted(values.items()):
+                    label = _prom_label(name)
+                    lines.append(f'ascrl_{family}{{name="{label}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+def _prom_label(name):
+    return name.replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ')
+
+# Process-wide instance
+registry = Metrics()
+
+# ──────────────────────────────────────────────────────────────────────
+# Hooks
+# ──────────────────────────────────────────────────────────────────────
+def sql_label(sql: str, limit=80) -> str:
+    return ' '.join(sql.split())[:limit]
+
+def record_db(name, seconds, statements=()):
+    # Called on the DB thread after each ascrl_db call
+    registry.observe('db', name, seconds)
+    if seconds >= SLOW_QUERY:
+        log.warning(f"slow db call {name}: {seconds * 1000:.0f} ms",
+                    extra={'kind': 'db', 'call': name, 'ms': round(seconds * 1000, 1),
+                           'sql': [sql_label(s, 500) for s in statements[-10:]]})
+
+def add_command_db_time(seconds):
+    # Called on the event loop after awaiting an ascrl_db call
+    acc = command_db_time.get()
+    if acc is not None:
+        acc[0] += seconds
+
+def record_command(name, seconds, db_seconds, failed=False):
+    registry.observe('command', name, seconds)
+    registry.observe('command_db', name, db_seconds)
+    if seconds >= SLOW_COMMAND:
+        log.warning(f"slow command !{name}: {seconds * 1000:.0f} ms ({db_seconds * 1000:.0f} ms in DB)",
+                    extra={'kind': 'command', 'command': name, 'ms': round(seconds * 1000, 1),
+                           'db_ms': round(db_seconds * 1000, 1), 'failed': failed})
+
+# ──────────────────────────────────────────────────────────────────────
+# Background tasks
+# ──────────────────────────────────────────────────────────────────────
+async def watch_loop_lag(interval=LAG_INTERVAL):
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - expected)
+        registry.observe('loop_lag', 'event_loop', lag)
+        if lag >= LAG_WARN:
+            log.warning(f"event loop blocked for {lag * 1000:.0f} ms", extra={'kind': 'loop_lag', 'ms': round(lag * 1000, 1)})
+
+def write_prometheus(path=None):
+    path = path or METRICS_FILE
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(registry.prometheus())
+    os.replace(tmp, path)
+
+async def dump_prometheus(interval=DUMP_INTERVAL):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(write_prometheus)
+        except OSError as e:
+            log.error(f"metrics dump failed: {e}")
@@ -0,0 +1,166 @@
+# ──────────────────────────────────────────────────────────────────────
+# NAME INDEX – IN-MEMORY PREFIX + TRIGRAM LOOKUP FOR AUTOCOMPLETE
+# ──────────────────────────────────────────────────────────────────────
+# Drivers, tracks, races and seasons are loaded once at startup. After that
+# the write commands keep the index current, so an autocomplete keystroke
+# never touches SQLite. Names are folded for matching: case, '#', spaces
+# and punctuation are ignored, so "matt" finds "#44 MattWilson" and
+# "44 matt" does too. Matches are ranked:
+#   1. the whole folded name starts with the query
+#   2. a word of the name starts with the query
+#   3. trigram overlap with the name or one of its words, which catches
+#      typos like "martinsvile" or "misson"
+# Every kind is scoped, normally by series; scope None searches them all.
+import bisect
+import collections
+import itertools
+import re
+
+MIN_SIMILARITY = 0.5        # share of the query's trigrams a fuzzy match must contain
+_WORD_RE = re.compile(r'[^\W_]+')
+
+def fold(text: str) -> str:
+    return ''.join(_WORD_RE.findall(text.casefold()))
+
+def trigrams(folded: str):
+    padded = f"  {folded} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def name_trigrams(display: str, folded: str):
+    # Whole name plus each word, so a typo in one word still lines up
+    grams = trigrams(folded)
+    for word in _WORD_RE.findall(display.casefold()):
+        grams |= trigrams(word)
+    return grams
+
+class _Bucket:
+    # One (kind, scope): display names plus the three lookup structures
+    __slots__ = ('names', 'by_fold', 'folded', 'words', 'grams')
+
+    def __init__(self):
+        self.names = {}         # display -> folded
+        self.by_fold = {}       # folded -> {display}
+        self.folded = []        # sorted [(folded, display)]
+        self.words = []         # sorted [(word, display)]
+        self.grams = {}         # trigram -> {display}
+
+    def add(self, display):
+        if display in self.names:
+            return
+        folded = fold(display)
+        self.names[display] = folded
+        self.by_fold.setdefault(folded, set()).add(display)
+        bisect.insort(self.folded, (folded, display))
+        for word in set(_WORD_RE.findall(display.casefold())):
+            bisect.insort(self.words, (word, display))
+        for gram in name_trigrams(display, folded):
+            self.grams.setdefault(gram, set()).add(display)
+
+    def remove(self, display):
+        folded = self.names.pop(display, None)
+        if folded is None:
+            return
+        self.by_fold[folded].discard(display)
+        if not self.by_fold[folded]:
+            del self.by_fold[folded]
+        self.folded.remove((folded, display))
+        for word in set(_WORD_RE.findall(display.casefold())):
+            self.words.remove((word, display))
+        for gram in name_trigrams(display, folded):
+            holders = self.grams.get(gram)
+            if holders:
+                holders.discard(display)
+                if not holders:
+                    del self.grams[gram]
+
+    @staticmethod
+    def _prefixed(items, prefix):
+        start = bisect.bisect_left(items, (prefix,))
+        for key, display in items[start:]:
+            if not key.startswith(prefix):
+                break
+            yield display
+
+    def search(self, query, words, limit):
+        # -> {display: rank}, lower rank better. Each tier only runs if the
+        # ones above it found fewer than limit names.
+        found = {}
+        for display in itertools.islice(self._prefixed(self.folded, query), limit):
+            found[display] = (0, self.names[display])
+        if words and len(found) < limit:
+            # Every query word has to start some word of the name
+            hits = set.intersection(*(set(self._prefixed(self.words, word)) for word in words))
+            for display in hits:
+                found.setdefault(display, (1, self.names[display]))
+        if len(query) >= 3 and len(found) < limit:
+            grams = trigrams(query)
+            shared = collections.Counter()
+            for gram in grams:
+                shared.update(self.grams.get(gram, ()))
+            for display, n in shared.most_common():
+                if n < MIN_SIMILARITY * len(grams) or len(found) >= limit:
+                    break
+                found.setdefault(display, (2, -n / len(grams)))
+        return found
+
+class NameIndex:
+    def __init__(self):
+        self._buckets = {}      # (kind, scope) -> _Bucket
+        self.loaded = False
+
+    def load(self, c, extra_tracks=()):
+        # Runs on a DB thread at startup. Built aside, then swapped in whole
+        fresh = NameIndex()
+        c.execute("SELECT driver_name, series FROM drivers")
+        for name, series in c.fetchall():
+            fresh.add('driver', name, series)
+        c.execute("SELECT track, date, series, season FROM races")
+        for track, date, series, season in c.fetchall():
+            fresh.add_race(series, track, date, season)
+        for track in extra_tracks:
+            fresh.add('track', track)
+        self._buckets = fresh._buckets
+        self.loaded = True
+
+    def add(self, kind, name, scope=None):
+        self._buckets.setdefault((kind, scope), _Bucket()).add(name)
+
+    def remove(self, kind, name, scope=None):
+        bucket = self._buckets.get((kind, scope))
+        if bucket:
+            bucket.remove(name)
+
+    def add_race(self, series, track, date, season):
+        self.add('race', f"{track}@{date}", series)
+        self.add('track', track, series)
+        self.add('season', season, series)
+
+    def remove_race(self, series, track, date):
+        # The track stays indexed – other races (and TRACK_INFO) may still use it
+        self.remove('race', f"{track}@{date}", series)
+
+    def _scoped(self, kind, scope):
+        # Unscoped names (TRACK_INFO tracks) belong to every scope
+        return [b for (k, s), b in self._buckets.items() if k == kind and (scope is None or s in (scope, None))]
+
+    def search(self, kind, text, scope=None, limit=25):
+        # Best matches first; an empty query lists names alphabetically
+        buckets = self._scoped(kind, scope)
+        query = fold(text)
+        if not query:
+            return sorted({name for b in buckets for name in b.names}, key=str.casefold)[:limit]
+        words = _WORD_RE.findall(text.casefold())
+        found = {}
+        for bucket in buckets:
+            for display, rank in bucket.search(query, words, limit).items():
+                found[display] = min(rank, found.get(display, rank))
+        return sorted(found, key=lambda d: (found[d], d))[:limit]
+
+    def resolve(self, kind, text, scope=None):
+        # The indexed spelling of a freehand name when it is unambiguous, else None
+        query = fold(text)
+        matches = {name for b in self._scoped(kind, scope) for name in b.by_fold.get(query, ())}
+        return matches.pop() if len(matches) == 1 else None
+
+# Process-wide instance
+names = NameIndex()
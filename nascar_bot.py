@@ -4,42 +4,72 @@
 # ──────────────────────────────────────────────────────────────────────
 
 # ──────────────────────────────────────────────────────────────────────
-# SERIES CONFIG – GLOBAL, FIRST IN FILE
+# SERIES CONFIG – GLOBAL, FIRST IN FILE (shared with the site scripts)
 # ──────────────────────────────────────────────────────────────────────
-SUPPORTED_SERIES = ['Cup', 'Truck', 'Xfinity', 'ARCA']
+from league import (SUPPORTED_SERIES, CURRENT_SEASON, validate_series, parse_race_spec, find_race,
+                    bump_standings_version, standings_version)
 
 # ──────────────────────────────────────────────────────────────────────
-# Validate series – DEFINED BEFORE ANY USE
-# ──────────────────────────────────────────────────────────────────────
-def validate_series(series: str) -> str:
-    s = series.title()
-    if s not in SUPPORTED_SERIES:
-        raise ValueError(f"Invalid series. Choose from: {', '.join(SUPPORTED_SERIES)}")
-    return s
+# IMPORTS – timed, so a slow cold start shows up in the launch report.
+# matplotlib is NOT imported here: charts.py loads it inside the render
+# workers on first use. Keep heavy libraries out of this list.
+# ──────────────────────────────────────────────────────────────────────
+import importlib
+import sys
+import time
+IMPORT_TIMINGS = {}
+for _module in ('discord', 'discord.ext.commands', 'aiohttp', 'dotenv',
+                'league', 'log_config', 'metrics', 'outbound', 'assets', 'name_index', 'points', 'ascrl_db', 'backups', 'read_cache', 'reminders', 'charts'):
+    _started = time.perf_counter()
+    importlib.import_module(_module)
+    IMPORT_TIMINGS[_module] = time.perf_counter() - _started
+LAZY_MODULES = ('matplotlib', 'pandas', 'numpy')
+
+def startup_report():
+    total = sum(IMPORT_TIMINGS.values())
+    lines = [f"Imports: {total * 1000:.0f} ms"]
+    lines += [f"  {name:<22} {secs * 1000:7.1f} ms" for name, secs in sorted(IMPORT_TIMINGS.items(), key=lambda kv: -kv[1])]
+    eager = [name for name in LAZY_MODULES if name in sys.modules]
+    if eager:
+        lines.append(f"  WARNING – loaded at startup, should be lazy: {', '.join(eager)}")
+    return lines
 
-# ──────────────────────────────────────────────────────────────────────
-# IMPORTS
-# ──────────────────────────────────────────────────────────────────────
 import os
 import discord
+from discord import app_commands
 from discord.ext import commands
-import pandas as pd
-import sqlite3
-import matplotlib.pyplot as plt
+import ascrl_db as db
+import metrics
+from outbound import outbound
+from assets import assets
+from name_index import names
+import points
+from schema import init_database
+import backups
+import json
+from read_cache import cache
+from reminders import ReminderScheduler
+from charts import charts
 import aiohttp
 import asyncio
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import traceback
 from dotenv import load_dotenv
 import logging
+from log_config import setup_logging
 import re
 import io
+import csv
+import hashlib
 
 # ──────────────────────────────────────────────────────────────────────
 # Logging & .env
 # ──────────────────────────────────────────────────────────────────────
-logging.basicConfig(filename='nascar_bot.log', level=logging.DEBUG,
-                    format='%(asctime)s:%(levelname)s:%(message)s')
+# Chart workers fork first, while this is still the only thread – see charts.py
+charts.start()
+# JSON lines to nascar_bot.jsonl, written by a listener thread – see log_config.py
+setup_logging()
 load_dotenv()
 BOT_TOKEN = os.getenv('BOT_TOKEN')
 if not BOT_TOKEN:
@@ -65,6 +95,15 @@ EMOJI_URLS = {
     'race_car': 'https://stunodracing.net/index.php?attachments/preview-png.136725/',
     'cup_trophy': 'https://upload.wikimedia.org/wikipedia/commons/2/2e/NASCAR_Cup_Series_Championship_Trophy_2023.png'
 }
+# RACE TIMES – league clock is US Eastern; each series can start at its own time
+try:
+    LEAGUE_TZ = ZoneInfo('America/New_York')
+except ZoneInfoNotFoundError:
+    LEAGUE_TZ = timezone(timedelta(hours=-5), 'EST')
+LEAGUE_TZ_LABEL = 'EST'
+SERIES_START_TIMES = {'Cup': '21:00', 'Truck': '21:00', 'Xfinity': '21:00', 'ARCA': '21:00'}
+REMINDER_OFFSETS = [timedelta(hours=24), timedelta(hours=1), timedelta(minutes=10)]
+
 SERVER_ICON_URL = 'https://images.emojiterra.com/twitter/v13.1/512px/1f3c1.png'
 SERVER_BANNER_URL = 'https://www.nascar.com/wp-content/uploads/sites/7/2022/10/17/Discord-Talladega.jpg'
 
@@ -84,6 +123,121 @@ def has_admin_role():
         return True
     return commands.check(predicate)
 
+# ──────────────────────────────────────────────────────────────────────
+# Command timing – total and DB share for every command (metrics.py)
+# ──────────────────────────────────────────────────────────────────────
+@bot.before_invoke
+async def start_command_timer(ctx):
+    ctx.perf_started = time.perf_counter()
+    ctx.perf_db = [0.0]
+    metrics.command_db_time.set(ctx.perf_db)
+
+@bot.after_invoke
+async def stop_command_timer(ctx):
+    # after_invoke runs whether or not the command raised
+    elapsed = time.perf_counter() - ctx.perf_started
+    metrics.record_command(ctx.command.qualified_name, elapsed, ctx.perf_db[0], failed=ctx.command_failed)
+
+# ──────────────────────────────────────────────────────────────────────
+# Cached replies – read views are built once, dropped by write commands
+# ──────────────────────────────────────────────────────────────────────
+STANDINGS_VIEWS = ('standings', 'leaderboard', 'driver')
+SCHEDULE_VIEWS = ('schedule', 'reminder')
+
+async def send_cached(ctx, key, build):
+    # build() -> (content, embed); the embed is cached as a dict so every hit sends a fresh copy
+    async def payload():
+        content, embed = await build()
+        return content, embed.to_dict() if embed else None
+    content, embed = await cache.get_or_build(key, payload)
+    await ctx.send(content, embed=discord.Embed.from_dict(embed) if embed else None)
+
+# ──────────────────────────────────────────────────────────────────────
+# Snapshots – taken before every destructive admin command
+# ──────────────────────────────────────────────────────────────────────
+async def snapshot_before(command: str):
+    # Raises if the copy fails, so the command never runs without its backup
+    path = await backups.snapshot_async(f"before_{command}")
+    logging.info(f"Snapshot before !{command}: {path}")
+    return path
+
+# ──────────────────────────────────────────────────────────────────────
+# Names & autocomplete – answered from the in-memory index (name_index.py)
+# ──────────────────────────────────────────────────────────────────────
+# The read commands are hybrid: `!driver ...` still works, and `/driver`
+# offers driver, race and series choices as you type. The index is loaded
+# in setup_hook and kept current by the write commands, so a keystroke
+# never waits on SQLite. Freehand names typed with the wrong case or
+# punctuation are resolved to their stored spelling the same way.
+def typed_series(interaction):
+    # Series already filled in on this slash command, if it is a valid one
+    try:
+        return validate_series(interaction.namespace.series or '')
+    except (AttributeError, ValueError):
+        return None
+
+def timed_choices(kind, search):
+    started = time.perf_counter()
+    found = search()
+    metrics.registry.observe('autocomplete', kind, time.perf_counter() - started)
+    return [app_commands.Choice(name=value[:100], value=value[:100]) for value in found[:25]]
+
+async def series_autocomplete(interaction, current: str):
+    return timed_choices('series', lambda: [s for s in SUPPORTED_SERIES if s.lower().startswith(current.strip().lower())])
+
+async def driver_autocomplete(interaction, current: str):
+    return timed_choices('driver', lambda: names.search('driver', current, typed_series(interaction)))
+
+async def race_autocomplete(interaction, current: str):
+    # Dated races first (Track@YYYY-MM-DD picks one running), then bare tracks
+    def search():
+        series = typed_series(interaction)
+        races = names.search('race', current, series, 15)
+        return races + [t for t in names.search('track', current, series, 25 - len(races)) if t not in races]
+    return timed_choices('race', search)
+
+def did_you_mean(kind, text, series=None):
+    suggestions = [s for s in names.search(kind, text, series, 3) if s != text]
+    return f" Did you mean: {', '.join(suggestions)}?" if suggestions else ""
+
+def canonical_race_spec(spec, series):
+    # "lime rock@2025-10-27" -> "Lime Rock@2025-10-27" when the track is known
+    if spec is None or spec.strip().isdigit():
+        return spec
+    track, sep, date = spec.partition('@')
+    return (names.resolve('track', track, series) or track.strip()) + sep + date
+
+async def sync_slash_commands():
+    # Copied to the league guild, where a sync takes effect at once. The
+    # payload's hash is kept in bot_meta, so an unchanged set is not re-sent.
+    guild = discord.Object(id=int(SERVER_ID))
+    bot.tree.copy_global_to(guild=guild)
+    payload = json.dumps([command.to_dict(bot.tree) for command in bot.tree.get_commands(guild=guild)], sort_keys=True)
+    fingerprint = hashlib.sha256(payload.encode()).hexdigest()
+    synced = await db.fetchone("SELECT value FROM bot_meta WHERE key = 'slash_commands'")
+    if synced and synced[0] == fingerprint:
+        return
+    try:
+        await bot.tree.sync(guild=guild)
+    except discord.HTTPException as e:
+        logging.error(f"Slash command sync failed: {e}")
+        return
+    await db.execute("INSERT OR REPLACE INTO bot_meta (key, value) VALUES ('slash_commands', ?)", (fingerprint,))
+    logging.info(f"Synced {len(bot.tree.get_commands(guild=guild))} slash commands to {SERVER_ID}")
+
+# ──────────────────────────────────────────────────────────────────────
+# Race start helpers
+# ──────────────────────────────────────────────────────────────────────
+def race_start(series, date):
+    # Raises ValueError for dates like 'N/A'
+    hour, minute = map(int, SERIES_START_TIMES.get(series, '21:00').split(':'))
+    day = datetime.strptime(date, '%Y-%m-%d')
+    return day.replace(hour=hour, minute=minute, tzinfo=LEAGUE_TZ)
+
+def start_time_label(series):
+    hour, minute = map(int, SERIES_START_TIMES.get(series, '21:00').split(':'))
+    return f"{hour % 12 or 12}:{minute:02d} {'PM' if hour >= 12 else 'AM'} {LEAGUE_TZ_LABEL}"
+
 # ──────────────────────────────────────────────────────────────────────
 # Trophy helper
 # ──────────────────────────────────────────────────────────────────────
@@ -133,222 +287,536 @@ TRACK_INFO = {
     'Charlotte_Roval': {'length': '2.28 miles', 'type': 'Road Course', 'banking': 'Varies (up to 24° in oval turns)'}
 }
 
-# ──────────────────────────────────────────────────────────────────────
-# DB init
-# ──────────────────────────────────────────────────────────────────────
-def init_database():
-    conn = sqlite3.connect('ascrl.db')
-    c = conn.cursor()
-    c.execute('''CREATE TABLE IF NOT EXISTS drivers
-                 (driver_name TEXT PRIMARY KEY, series TEXT)''')
-    c.execute('''CREATE TABLE IF NOT EXISTS races
-                 (track TEXT, date TEXT, series TEXT, season TEXT, PRIMARY KEY (track, date, series))''')
-    c.execute('''CREATE TABLE IF NOT EXISTS results
-                 (driver_name TEXT, track TEXT, finish_position INTEGER, pole TEXT, fastest_lap TEXT, series TEXT,
-                  FOREIGN KEY (driver_name) REFERENCES drivers(driver_name),
-                  FOREIGN KEY (track, series) REFERENCES races(track, series))''')
-    c.execute('''CREATE TABLE IF NOT EXISTS standings
-                 (driver_name TEXT, series TEXT, points INTEGER, wins INTEGER, top_5s INTEGER,
-                  top_10s INTEGER, poles INTEGER, avg_finish REAL,
-                  FOREIGN KEY (driver_name) REFERENCES drivers(driver_name))''')
-    c.execute('''CREATE TABLE IF NOT EXISTS winners
-                 (date TEXT, track TEXT, winner TEXT, series TEXT,
-                  FOREIGN KEY (track, series) REFERENCES races(track, series))''')
-    c.execute("PRAGMA table_info(results)")
-    cols = [col[1] for col in c.fetchall()]
-    if 'fastest_lap' not in cols:
-        c.execute("ALTER TABLE results ADD COLUMN fastest_lap TEXT")
-    conn.commit()
-    conn.close()
-
-# ──────────────────────────────────────────────────────────────────────
-# Points calculation
-# ──────────────────────────────────────────────────────────────────────
-def calculate_points(finish):
-    if finish == 1: return 40
-    if finish == 2: return 35
-    if finish == 3: return 34
-    return max(1, 37 - finish) if finish else 0
 # ──────────────────────────────────────────────────────────────────────
 # PART 2: STANDINGS, DATA IMPORT, STARTUP, REMINDERS
 # ──────────────────────────────────────────────────────────────────────
 
 # ──────────────────────────────────────────────────────────────────────
-# Update standings – SAFE, ONLY RUNS IF RESULTS EXIST
+# Standings engine – INCREMENTAL: ONLY THE RACE THAT CHANGED IS APPLIED
 # ──────────────────────────────────────────────────────────────────────
-def update_standings(series: str):
+# Every standings row is a running total of these counters. avg_finish is
+# derived from finish_sum / finish_count so it can be moved by a delta too.
+STANDINGS_STATS = ('points', 'wins', 'top_5s', 'top_10s', 'poles', 'finish_sum', 'finish_count')
+STANDINGS_VERIFY = os.getenv('STANDINGS_VERIFY', '').lower() in ('1', 'true', 'yes')
+
+def result_stats(finish, pole, fastest_lap, stages, system):
+    # What ONE results row adds to a driver's standings (STANDINGS_STATS order).
+    # Points only add up like this for an additive system – see points.py
+    scored = finish is not None
+    return (
+        system.race_points(finish, pole, fastest_lap, stages),
+        1 if finish == 1 else 0,
+        1 if finish and 1 <= finish <= 5 else 0,
+        1 if finish and 1 <= finish <= 10 else 0,
+        1 if pole == 'Yes' else 0,
+        finish if scored else 0,
+        1 if scored else 0,
+    )
+
+def average_finish(finish_sum, finish_count):
+    return finish_sum / finish_count if finish_count else None
+
+# ONE grouped pass over a season's results gives every driver's counters.
+# The field is anyone with results that season plus, for the current
+# season, every rostered driver – so zero-point drivers still get a row.
+# `points` here is penalties only: race points come from the season's
+# points system (points.py) and are added on top. Penalties come from the
+# event log; a driver_removed event voids the driver's earlier penalties.
+STANDINGS_SQL = """
+    WITH season_results AS (
+        SELECT r.driver_id, r.finish_position, r.pole, r.fastest_lap
+        FROM races ra JOIN results r ON r.race_id = ra.race_id
+        WHERE ra.series = :series AND ra.season = :season
+    ),
+    penalties AS (
+        SELECT e.driver_id, SUM(e.points) AS points
+        FROM result_events e JOIN drivers d ON d.driver_id = e.driver_id
+        WHERE e.kind = 'penalty' AND e.series = :series AND e.season = :season
+          AND e.event_id > (SELECT COALESCE(MAX(x.event_id), 0) FROM result_events x
+                            WHERE x.kind = 'driver_removed' AND x.driver_id = e.driver_id
+                              AND x.series = e.series AND x.season = e.season)
+        GROUP BY e.driver_id
+    ),
+    field AS (
+        SELECT driver_id FROM drivers WHERE series = :series AND :season = :current_season
+        UNION
+        SELECT driver_id FROM season_results
+        UNION
+        SELECT driver_id FROM penalties
+    )
+    SELECT f.driver_id,
+           COALESCE(MAX(p.points), 0) AS points,
+           COUNT(*) FILTER (WHERE r.finish_position = 1) AS wins,
+           COUNT(*) FILTER (WHERE r.finish_position BETWEEN 1 AND 5) AS top_5s,
+           COUNT(*) FILTER (WHERE r.finish_position BETWEEN 1 AND 10) AS top_10s,
+           COUNT(*) FILTER (WHERE r.pole = 'Yes') AS poles,
+           COALESCE(SUM(r.finish_position), 0) AS finish_sum,
+           COUNT(r.finish_position) AS finish_count,
+           AVG(r.finish_position) AS avg_finish
+    FROM field f
+    LEFT JOIN season_results r ON r.driver_id = f.driver_id
+    LEFT JOIN penalties p ON p.driver_id = f.driver_id
+    GROUP BY f.driver_id
+"""
+
+def standings_params(series, season):
+    return {'series': series, 'season': season, 'current_season': CURRENT_SEASON}
+
+def compute_standings(c, series: str, season: str):
+    # From-scratch totals: {driver_id: [STANDINGS_STATS...]}
+    c.execute(STANDINGS_SQL, standings_params(series, season))
+    totals = {row[0]: list(row[1:8]) for row in c.fetchall()}
+    for driver_id, race_points in points.season_points(c, series, season).items():
+        totals[driver_id][0] += race_points
+    return totals
+
+def rebuild_standings(c, series: str, season: str, race_points=None):
+    # race_points: {driver_id: points} when the caller already scored the season
+    bump_standings_version(c, series, season)
+    c.execute("DELETE FROM standings WHERE series = ? AND season = ?", (series, season))
+    c.execute(f"""INSERT INTO standings (driver_id, series, season, points, wins, top_5s, top_10s, poles, finish_sum, finish_count, avg_finish)
+                  SELECT driver_id, :series, :season, points, wins, top_5s, top_10s, poles, finish_sum, finish_count, avg_finish
+                  FROM ({STANDINGS_SQL})""", standings_params(series, season))
+    if race_points is None:
+        race_points = points.season_points(c, series, season)
+    c.executemany("UPDATE standings SET points = points + ? WHERE driver_id = ? AND series = ? AND season = ?",
+                  [(p, driver_id, series, season) for driver_id, p in race_points.items() if p])
+
+def rescore_history(c, series: str = None):
+    # Every season (of one series, or all) re-scored under its current points
+    # system in ONE vectorized pass, then written back. Returns the seasons touched.
+    scored = points.score_history(c, series)
+    c.execute("SELECT DISTINCT series, season FROM standings WHERE ? IS NULL OR series = ?", (series, series))
+    seasons = sorted(set(scored) | set(c.fetchall()))
+    for ser, season in seasons:
+        rebuild_standings(c, ser, season, scored.get((ser, season), {}))
+        c.execute("DELETE FROM standings_checkpoints WHERE series = ? AND season = ?", (ser, season))
+    return seasons
+
+async def update_standings(series: str, season: str = None):
+    # FULL REBUILD – used for repairs; write commands go through apply_standings_delta
     series = validate_series(series)
-    conn = sqlite3.connect('ascrl.db')
-    c = conn.cursor()
-    c.execute("DELETE FROM standings WHERE series = ?", (series,))
-    c.execute("SELECT driver_name FROM drivers WHERE series = ?", (series,))
-    drivers = [row[0] for row in c.fetchall()]
-    c.execute("SELECT driver_name, track, finish_position, pole, fastest_lap FROM results WHERE series = ?", (series,))
-    results = c.fetchall()
-    for driver in drivers:
-        driver_res = [r for r in results if r[0] == driver]
-        points = sum(
-            calculate_points(r[2])
-            + (1 if r[3] == 'Yes' else 0)
-            + (1 if r[4] == 'FL' else 0)
-            for r in driver_res if r[2] is not None
-        )
-        wins = sum(1 for r in driver_res if r[2] == 1)
-        top_5s = sum(1 for r in driver_res if r[2] and 1 <= r[2] <= 5)
-        top_10s = sum(1 for r in driver_res if r[2] and 1 <= r[2] <= 10)
-        poles = sum(1 for r in driver_res if r[3] == 'Yes')
-        finishes = [r[2] for r in driver_res if r[2] is not None]
-        avg_finish = sum(finishes) / len(finishes) if finishes else None
-        c.execute("""INSERT INTO standings (driver_name, series, points, wins, top_5s, top_10s, poles, avg_finish)
-                     VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                  (driver, series, points, wins, top_5s, top_10s, poles, avg_finish))
-    conn.commit()
-    conn.close()
+    await db.transaction(rebuild_standings, series, season or CURRENT_SEASON)
+    cache.invalidate(series, STANDINGS_VIEWS)
+
+def apply_standings_delta(c, series: str, season: str, removed=(), added=()):
+    # removed / added: (driver_id, finish_position, pole, fastest_lap, stages)
+    # rows leaving or entering `results`. Runs on the caller's cursor, so the
+    # delta commits (or rolls back) together with the results change itself.
+    c.execute("SELECT 1 FROM standings WHERE series = ? AND season = ? LIMIT 1", (series, season))
+    seeded = c.fetchone() is not None
+    system = points.load_system(c, series, season)
+    if not seeded or not system.additive:
+        # First results for this series/season – seed every driver's row once.
+        # Drop-worst and playoff resets move other drivers too: re-score the season.
+        rebuild_standings(c, series, season)
+        return
+    bump_standings_version(c, series, season)
+    deltas = {}
+    for sign, rows in ((-1, removed), (1, added)):
+        for driver_id, finish, pole, fastest_lap, stages in rows:
+            acc = deltas.setdefault(driver_id, [0] * len(STANDINGS_STATS))
+            for i, value in enumerate(result_stats(finish, pole, fastest_lap, stages, system)):
+                acc[i] += sign * value
+    for driver_id, d in deltas.items():
+        c.execute("""UPDATE standings SET points = points + ?, wins = wins + ?, top_5s = top_5s + ?,
+                         top_10s = top_10s + ?, poles = poles + ?, finish_sum = finish_sum + ?,
+                         finish_count = finish_count + ?,
+                         avg_finish = CASE WHEN finish_count + ? > 0
+                                           THEN (finish_sum + ?) * 1.0 / (finish_count + ?) END
+                     WHERE driver_id = ? AND season = ?""",
+                  (*d, d[6], d[5], d[6], driver_id, season))
+        if c.rowcount == 0:
+            c.execute("""INSERT INTO standings (driver_id, series, season, points, wins, top_5s, top_10s, poles, avg_finish, finish_sum, finish_count)
+                         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                      (driver_id, series, season, *d[:5], average_finish(d[5], d[6]), d[5], d[6]))
+    if STANDINGS_VERIFY:
+        drift = verify_standings(c, series, season)
+        if drift:
+            logging.error(f"{series} {season} standings drifted on {len(drift)} drivers after delta – rebuilding: {drift[:5]}")
+            rebuild_standings(c, series, season)
+
+def add_standings_rows(c, series: str, drivers):
+    # Newly rostered drivers get a zero row, but only once the season has standings
+    bump_standings_version(c, series, CURRENT_SEASON)
+    c.executemany("""INSERT OR IGNORE INTO standings (driver_id, series, season, points, wins, top_5s, top_10s, poles, avg_finish, finish_sum, finish_count)
+                     SELECT d.driver_id, d.series, :season, 0, 0, 0, 0, 0, NULL, 0, 0
+                     FROM drivers d
+                     WHERE d.driver_name = :driver AND d.series = :series
+                       AND EXISTS (SELECT 1 FROM standings WHERE series = :series AND season = :season)""",
+                  [{'driver': d, 'series': series, 'season': CURRENT_SEASON} for d in drivers])
+
+def verify_standings(c, series: str, season: str):
+    # Compare stored rows with a from-scratch recompute; returns (driver, stored, expected) mismatches
+    c.execute(f"SELECT driver_id, {', '.join(STANDINGS_STATS)}, avg_finish FROM standings WHERE series = ? AND season = ?", (series, season))
+    stored = {row[0]: row[1:] for row in c.fetchall()}
+    c.execute("SELECT driver_id, driver_name FROM drivers WHERE series = ?", (series,))
+    names = dict(c.fetchall())
+    drift = []
+    for driver_id, stats in compute_standings(c, series, season).items():
+        row = stored.pop(driver_id, None)
+        expected_avg = average_finish(stats[5], stats[6])
+        if (row is None or tuple(row[:-1]) != tuple(stats)
+                or (row[-1] is None) != (expected_avg is None)
+                or (expected_avg is not None and abs(row[-1] - expected_avg) > 1e-9)):
+            drift.append((names.get(driver_id, driver_id), row, tuple(stats)))
+    drift.extend((names.get(driver_id, driver_id), row, None) for driver_id, row in stored.items())
+    return drift
+
+# ──────────────────────────────────────────────────────────────────────
+# Result event log – append-only history, standings replayed from it
+# ──────────────────────────────────────────────────────────────────────
+# Every change to `results` is also appended to result_events, in the same
+# transaction: 'posted' and 'cleared' result rows, 'penalty' point
+# adjustments and 'driver_removed'. One admin action is one batch. Replaying
+# a season's events gives its standings as of any event. A checkpoint every
+# CHECKPOINT_EVERY events keeps that to the events since the last one.
+CHECKPOINT_EVERY = 200
+
+def next_batch(c) -> int:
+    c.execute("SELECT COALESCE(MAX(batch_id), 0) + 1 FROM result_events")
+    return c.fetchone()[0]
+
+def log_results(c, batch: int, kind: str, series: str, season: str, race_id: int, rows, note=None):
+    # rows: (driver_id, finish_position, pole, fastest_lap, stages), as fed to apply_standings_delta
+    c.executemany("""INSERT INTO result_events (batch_id, kind, series, season, race_id, driver_id,
+                                                finish_position, pole, fastest_lap, stages, note, created_at)
+                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))""",
+                  [(batch, kind, series, season, race_id, *row, note) for row in rows])
+    maybe_checkpoint(c, series, season)
+
+def log_event(c, batch: int, kind: str, series: str, season: str, driver_id: int, points=None, note=None):
+    c.execute("""INSERT INTO result_events (batch_id, kind, series, season, driver_id, points, note, created_at)
+                 VALUES (?, ?, ?, ?, ?, ?, ?, datetime('now'))""", (batch, kind, series, season, driver_id, points, note))
+    maybe_checkpoint(c, series, season)
+
+def apply_event(state, system, kind, driver_id, finish, pole, fastest_lap, stages, points):
+    # state: {driver_id: [STANDINGS_STATS...]}, updated in place
+    if kind == 'driver_removed':
+        state.pop(driver_id, None)
+        return
+    acc = state.setdefault(driver_id, [0] * len(STANDINGS_STATS))
+    if kind == 'penalty':
+        acc[0] += points
+        return
+    sign = 1 if kind == 'posted' else -1
+    for i, value in enumerate(result_stats(finish, pole, fastest_lap, stages, system)):
+        acc[i] += sign * value
+
+def replay_standings(c, series: str, season: str, upto: int = None, raw: bool = False):
+    # Standings as of event `upto` (None = now): ({driver_id: stats}, last event applied).
+    # Events add up per result; for a drop-worst / playoff system the points
+    # are then re-scored from the results as they stood. raw=True skips that
+    # (checkpoints hold the plain running sums).
+    system = points.load_system(c, series, season)
+    c.execute("""SELECT event_id, state FROM standings_checkpoints
+                 WHERE series = ? AND season = ? AND (? IS NULL OR event_id <= ?)
+                 ORDER BY event_id DESC LIMIT 1""", (series, season, upto, upto))
+    row = c.fetchone()
+    last, state = (row[0], {int(k): v for k, v in json.loads(row[1]).items()}) if row else (0, {})
+    c.execute("""SELECT event_id, kind, driver_id, finish_position, pole, fastest_lap, stages, points FROM result_events
+                 WHERE series = ? AND season = ? AND event_id > ? AND (? IS NULL OR event_id <= ?)
+                 ORDER BY event_id""", (series, season, last, upto, upto))
+    for event_id, *event in c.fetchall():
+        apply_event(state, system, *event)
+        last = event_id
+    if not raw and not system.additive:
+        rows = results_as_of(c, series, season, last)
+        scored = points.season_points(c, series, season, rows, system)
+        for driver_id, finish, pole, fastest_lap, stages in ((r[4], *r[5:9]) for r in rows):
+            if driver_id in state:
+                state[driver_id][0] -= system.race_points(finish, pole, fastest_lap, stages)
+        for driver_id, value in scored.items():
+            if driver_id in state:
+                state[driver_id][0] += value
+    return state, last
+
+def results_as_of(c, series: str, season: str, upto: int):
+    # The season's results rows as they stood after event `upto`, in points.RESULTS_SQL's shape
+    c.execute("""SELECT e.kind, e.race_id, e.driver_id, e.finish_position, e.pole, e.fastest_lap, e.stages,
+                        COALESCE(ra.date, '')
+                 FROM result_events e LEFT JOIN races ra ON ra.race_id = e.race_id
+                 WHERE e.series = ? AND e.season = ? AND e.event_id <= ?
+                   AND e.kind IN ('posted', 'cleared', 'driver_removed')
+                 ORDER BY e.event_id""", (series, season, upto))
+    held = {}
+    for kind, race_id, driver_id, finish, pole, fastest_lap, stages, date in c.fetchall():
+        if kind == 'driver_removed':
+            held = {key: row for key, row in held.items() if key[1] != driver_id}
+        elif kind == 'posted':
+            held[(race_id, driver_id)] = (series, season, date, race_id, driver_id, finish, pole, fastest_lap, stages)
+        else:
+            held.pop((race_id, driver_id), None)
+    return list(held.values())
+
+def maybe_checkpoint(c, series: str, season: str):
+    c.execute("SELECT COALESCE(MAX(event_id), 0) FROM standings_checkpoints WHERE series = ? AND season = ?", (series, season))
+    since = c.fetchone()[0]
+    c.execute("SELECT COUNT(*) FROM result_events WHERE series = ? AND season = ? AND event_id > ?", (series, season, since))
+    if c.fetchone()[0] < CHECKPOINT_EVERY:
+        return
+    state, last = replay_standings(c, series, season, raw=True)
+    c.execute("INSERT INTO standings_checkpoints (series, season, event_id, state, created_at) VALUES (?, ?, ?, ?, datetime('now'))",
+              (series, season, last, json.dumps(state, separators=(',', ':'))))
+
+def race_snapshot_event(c, race_id: int):
+    # Last event that touched a race's results – "standings after this race was posted"
+    c.execute("SELECT MAX(event_id) FROM result_events WHERE race_id = ? AND kind = 'posted'", (race_id,))
+    return c.fetchone()[0]
+
+def undo_race_batch(c, series: str, race_id: int, season: str):
+    # Reverts the race's latest results batch that isn't an undo and hasn't been undone,
+    # by appending compensating events. Returns (batch, reverted, skipped) or None.
+    c.execute("""SELECT MAX(e.batch_id) FROM result_events e
+                 WHERE e.race_id = ? AND e.kind IN ('posted', 'cleared') AND e.batch_id > 0
+                   AND e.reverts IS NULL
+                   AND NOT EXISTS (SELECT 1 FROM result_events u WHERE u.reverts = e.batch_id)""",
+              (race_id,))
+    batch = c.fetchone()[0]
+    if batch is None:
+        return None
+    c.execute("""SELECT kind, driver_id, finish_position, pole, fastest_lap, stages FROM result_events
+                 WHERE batch_id = ? AND race_id = ? AND kind IN ('posted', 'cleared') ORDER BY event_id DESC""",
+              (batch, race_id))
+    removed, added, skipped = [], [], 0
+    for kind, driver_id, finish, pole, fastest_lap, stages in c.fetchall():
+        c.execute("SELECT finish_position, pole, fastest_lap, stages FROM results WHERE race_id = ? AND driver_id = ?", (race_id, driver_id))
+        current = c.fetchone()
+        if kind == 'posted' and current == (finish, pole, fastest_lap, stages):
+            c.execute("DELETE FROM results WHERE race_id = ? AND driver_id = ?", (race_id, driver_id))
+            removed.append((driver_id, finish, pole, fastest_lap, stages))
+        elif kind == 'cleared' and current is None and driver_exists(c, driver_id):
+            c.execute("INSERT INTO results (race_id, driver_id, finish_position, pole, fastest_lap, stages) VALUES (?, ?, ?, ?, ?, ?)",
+                      (race_id, driver_id, finish, pole, fastest_lap, stages))
+            added.append((driver_id, finish, pole, fastest_lap, stages))
+        else:
+            skipped += 1   # changed again since – leave the newer data alone
+    undo = next_batch(c)
+    c.executemany("""INSERT INTO result_events (batch_id, kind, series, season, race_id, driver_id,
+                                                finish_position, pole, fastest_lap, stages, reverts, note, created_at)
+                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'undo', datetime('now'))""",
+                  [(undo, 'cleared', series, season, race_id, *row, batch) for row in removed] +
+                  [(undo, 'posted', series, season, race_id, *row, batch) for row in added])
+    maybe_checkpoint(c, series, season)
+    apply_standings_delta(c, series, season, removed=removed, added=added)
+    refresh_winner(c, race_id)
+    return batch, len(removed) + len(added), skipped
+
+def driver_exists(c, driver_id: int) -> bool:
+    c.execute("SELECT 1 FROM drivers WHERE driver_id = ?", (driver_id,))
+    return c.fetchone() is not None
+
+# ──────────────────────────────────────────────────────────────────────
+# Race / driver identity helpers – everything below joins on integer ids
+# (parse_race_spec / find_race live in league.py, shared with the API)
+# ──────────────────────────────────────────────────────────────────────
+def refresh_winner(c, race_id: int):
+    c.execute("DELETE FROM winners WHERE race_id = ?", (race_id,))
+    # LIMIT 1: winners is one row per race, whatever state results is in
+    c.execute("""INSERT INTO winners (race_id, driver_id) SELECT race_id, driver_id FROM results
+                 WHERE race_id = ? AND finish_position = 1 ORDER BY driver_id LIMIT 1""", (race_id,))
+
+def clear_race_results(c, series: str, race_id: int, season: str):
+    # Removes one race's results + winner and takes them back out of standings
+    c.execute("SELECT driver_id, finish_position, pole, fastest_lap, stages FROM results WHERE race_id = ?", (race_id,))
+    cleared = c.fetchall()
+    c.execute("DELETE FROM results WHERE race_id = ?", (race_id,))
+    c.execute("DELETE FROM winners WHERE race_id = ?", (race_id,))
+    if cleared:
+        log_results(c, next_batch(c), 'cleared', series, season, race_id, cleared)
+        apply_standings_delta(c, series, season, removed=cleared)
+    return len(cleared)
+
+def delete_driver(c, driver_id: int):
+    # Nobody else's standings move – the driver's own rows simply go. Under a
+    # playoff system the reset field can change, so those seasons re-score.
+    batch = next_batch(c)
+    c.execute("""SELECT series, season FROM standings WHERE driver_id = ?
+                 UNION SELECT ra.series, ra.season FROM results r JOIN races ra ON ra.race_id = r.race_id WHERE r.driver_id = ?""",
+              (driver_id, driver_id))
+    seasons = c.fetchall()
+    for series, season in seasons:
+        bump_standings_version(c, series, season)
+        log_event(c, batch, 'driver_removed', series, season, driver_id)
+    c.execute("DELETE FROM results WHERE driver_id = ?", (driver_id,))
+    c.execute("DELETE FROM standings WHERE driver_id = ?", (driver_id,))
+    c.execute("DELETE FROM winners WHERE driver_id = ?", (driver_id,))
+    c.execute("DELETE FROM drivers WHERE driver_id = ?", (driver_id,))
+    for series, season in seasons:
+        if not points.load_system(c, series, season).additive:
+            rebuild_standings(c, series, season)
 
 # ──────────────────────────────────────────────────────────────────────
 # Import Truck Series – YOUR REAL DRIVERS & SCHEDULE ONLY
 # ──────────────────────────────────────────────────────────────────────
-def import_truck_data():
-    conn = sqlite3.connect('ascrl.db')
-    c = conn.cursor()
-
-    # YOUR REAL TRUCK DRIVERS – NO SAMPLES
-    truck_drivers = [
-        ('#10 MajorBlaze', 'Truck'),
-        ('#9 DakotaThomas', 'Truck'),
-        ('#6 RickySpanish', 'Truck'),
-        ('#44 MattWilson', 'Truck'),
-        ('#29 FordemGators', 'Truck'),
-        ('#58 Mission', 'Truck'),
-        ('#34 Dezzy', 'Truck'),
-        ('#07 DeepPulchrify', 'Truck'),
-        ('#31 Hatter', 'Truck'),
-        ('#64 Wavy_Delta', 'Truck'),
-        ('#03 Ant_was_he', 'Truck'),
-        ('#71 Dewshine', 'Truck'),
-        ('#73 Rhino', 'Truck'),
-        ('#88 8LRacing', 'Truck'),
-        ('#7 SolidOne', 'Truck'),
-        ('#96 Orangeman', 'Truck'),
-        ('#94 Toxic_Inky', 'Truck'),
-        ('#08 The_Stone', 'Truck'),
-        ('#11 Skilled_Poison', 'Truck'),
-        ('#13 Speedhunter', 'Truck'),
-        ('#17 ChukWhiskey', 'Truck'),
-        ('#49 Lostcozov', 'Truck'),
-        ('#51 OfficialJaron', 'Truck'),
-        ('#52 Brentski', 'Truck'),
-        ('#53 MadReaper', 'Truck'),
-        ('#68 Ctill', 'Truck'),
-        ('#70 Scooterjay', 'Truck'),
-        ('#81 Big_Fella', 'Truck'),
-        ('#41 SithWarriorUno', 'Truck')
-    ]
-    c.executemany("INSERT OR IGNORE INTO drivers (driver_name, series) VALUES (?, ?)", truck_drivers)
-
-    # YOUR REAL SCHEDULE
-    truck_races = [
-        ("Daytona", "2025-10-20", "Truck", "Season 1"),
-        ("Lime Rock", "2025-10-27", "Truck", "Season 1"),
-        ("Martinsville", "2025-11-03", "Truck", "Season 1"),
-        ("Nashville", "2025-11-10", "Truck", "Season 1"),
-        ("The Rock", "2025-11-17", "Truck", "Season 1"),
-        ("Thanksgiving Break", "2025-11-24", "Truck", "Season 1"),
-        ("Texas", "2025-12-01", "Truck", "Season 1"),
-        ("Michigan", "2025-12-08", "Truck", "Season 1"),
-        ("IRP", "2025-12-15", "Truck", "Season 1"),
-        ("Christmas Break", "2025-12-22", "Truck", "Season 1"),
-        ("Atlanta", "2025-12-29", "Truck", "Season 1"),
-        ("Bristol", "2026-01-05", "Truck", "Season 1"),
-        ("Roval", "2026-01-12", "Truck", "Season 1"),
-        ("Homestead", "2026-01-19", "Truck", "Season 1")
-    ]
-    c.executemany("INSERT OR REPLACE INTO races (track, date, series, season) VALUES (?, ?, ?, ?)", truck_races)
+# YOUR REAL TRUCK DRIVERS – NO SAMPLES
+TRUCK_DRIVERS = [
+    ('#10 MajorBlaze', 'Truck'),
+    ('#9 DakotaThomas', 'Truck'),
+    ('#6 RickySpanish', 'Truck'),
+    ('#44 MattWilson', 'Truck'),
+    ('#29 FordemGators', 'Truck'),
+    ('#58 Mission', 'Truck'),
+    ('#34 Dezzy', 'Truck'),
+    ('#07 DeepPulchrify', 'Truck'),
+    ('#31 Hatter', 'Truck'),
+    ('#64 Wavy_Delta', 'Truck'),
+    ('#03 Ant_was_he', 'Truck'),
+    ('#71 Dewshine', 'Truck'),
+    ('#73 Rhino', 'Truck'),
+    ('#88 8LRacing', 'Truck'),
+    ('#7 SolidOne', 'Truck'),
+    ('#96 Orangeman', 'Truck'),
+    ('#94 Toxic_Inky', 'Truck'),
+    ('#08 The_Stone', 'Truck'),
+    ('#11 Skilled_Poison', 'Truck'),
+    ('#13 Speedhunter', 'Truck'),
+    ('#17 ChukWhiskey', 'Truck'),
+    ('#49 Lostcozov', 'Truck'),
+    ('#51 OfficialJaron', 'Truck'),
+    ('#52 Brentski', 'Truck'),
+    ('#53 MadReaper', 'Truck'),
+    ('#68 Ctill', 'Truck'),
+    ('#70 Scooterjay', 'Truck'),
+    ('#81 Big_Fella', 'Truck'),
+    ('#41 SithWarriorUno', 'Truck')
+]
+
+# YOUR REAL SCHEDULE
+TRUCK_RACES = [
+    ("Daytona", "2025-10-20", "Truck", "Season 1"),
+    ("Lime Rock", "2025-10-27", "Truck", "Season 1"),
+    ("Martinsville", "2025-11-03", "Truck", "Season 1"),
+    ("Nashville", "2025-11-10", "Truck", "Season 1"),
+    ("The Rock", "2025-11-17", "Truck", "Season 1"),
+    ("Thanksgiving Break", "2025-11-24", "Truck", "Season 1"),
+    ("Texas", "2025-12-01", "Truck", "Season 1"),
+    ("Michigan", "2025-12-08", "Truck", "Season 1"),
+    ("IRP", "2025-12-15", "Truck", "Season 1"),
+    ("Christmas Break", "2025-12-22", "Truck", "Season 1"),
+    ("Atlanta", "2025-12-29", "Truck", "Season 1"),
+    ("Bristol", "2026-01-05", "Truck", "Season 1"),
+    ("Roval", "2026-01-12", "Truck", "Season 1"),
+    ("Homestead", "2026-01-19", "Truck", "Season 1")
+]
+
+def seed_changed(c, name, *data):
+    # True (and records the new fingerprint) only when the seed differs from last import
+    fingerprint = hashlib.sha256(repr(data).encode()).hexdigest()
+    c.execute("SELECT value FROM bot_meta WHERE key = ?", (f"seed:{name}",))
+    row = c.fetchone()
+    if row and row[0] == fingerprint:
+        return False
+    c.execute("INSERT OR REPLACE INTO bot_meta (key, value) VALUES (?, ?)", (f"seed:{name}", fingerprint))
+    return True
+
+def import_truck_data(c):
+    if not seed_changed(c, 'truck', TRUCK_DRIVERS, TRUCK_RACES):
+        print("TRUCK SEED UNCHANGED – IMPORT SKIPPED")
+        return False
+    c.executemany("INSERT OR IGNORE INTO drivers (driver_name, series) VALUES (?, ?)", TRUCK_DRIVERS)
+    # IGNORE, not REPLACE – replacing would hand a seeded race a new race_id and orphan its results
+    c.executemany("INSERT OR IGNORE INTO races (track, date, series, season) VALUES (?, ?, ?, ?)", TRUCK_RACES)
 
     # NO RESULTS. NO WINNERS. YOUR DATA IS KING.
-    conn.commit()
-    conn.close()
     print("TRUCK SERIES LOADED WITH YOUR REAL DRIVERS – NO RESULTS ADDED")
+    return True
 
 # ──────────────────────────────────────────────────────────────────────
 # Import Xfinity & ARCA – SAFE INITIALIZATION
 # ──────────────────────────────────────────────────────────────────────
-def import_xfinity_data():
-    conn = sqlite3.connect('ascrl.db')
-    c = conn.cursor()
+def import_xfinity_data(c):
     print("XFINITY SERIES INITIALIZED – AWAITING SCHEDULE")
-    conn.commit()
-    conn.close()
 
-def import_arca_data():
-    conn = sqlite3.connect('ascrl.db')
-    c = conn.cursor()
+def import_arca_data(c):
     print("ARCA SERIES INITIALIZED – AWAITING SCHEDULE")
-    conn.commit()
-    conn.close()
 
 # ──────────────────────────────────────────────────────────────────────
 # Bot startup – SAFE: NO CRASH ON STARTUP
 # ──────────────────────────────────────────────────────────────────────
+# Background tasks are registered by name – at most ONE of each ever runs
+background_tasks = {}
+
+def start_background_task(name, factory):
+    task = background_tasks.get(name)
+    if task is None or task.done():
+        task = background_tasks[name] = asyncio.get_running_loop().create_task(factory(), name=name)
+    return task
+
+# ONE-SHOT STARTUP – setup_hook runs once per process, before the gateway
+# connects; on_ready fires again on every reconnect and stays cheap.
+@bot.event
+async def setup_hook():
+    applied = await db.transaction(init_database)
+    if applied:
+        print(f"Schema migrations applied: {', '.join(map(str, applied))}")
+    await db.transaction(import_truck_data)
+    await db.transaction(import_xfinity_data)
+    await db.transaction(import_arca_data)
+
+    # STANDINGS ARE KEPT INCREMENTALLY – ONLY REBUILD A SEASON THAT DRIFTED
+    def check_standings(c):
+        report = []
+        for series in SUPPORTED_SERIES:
+            c.execute("""SELECT ra.season, COUNT(*) FROM races ra JOIN results r ON r.race_id = ra.race_id
+                         WHERE ra.series = ? GROUP BY ra.season""", (series,))
+            seasons = c.fetchall()
+            for season, count in seasons:
+                try:
+                    drift = verify_standings(c, series, season)
+                    if drift:
+                        rebuild_standings(c, series, season)
+                        report.append(f"{series} {season} standings rebuilt ({len(drift)} drivers drifted, {count} results)")
+                    else:
+                        report.append(f"{series} {season} standings verified ({count} results)")
+                except Exception as e:
+                    report.append(f"Error updating {series} {season}: {e}")
+            if not seasons:
+                report.append(f"{series} has no results — standings skipped")
+        return report
+    for line in await db.transaction(check_standings):
+        print(line)
+    cache.clear()
+
+    await db.read(names.load, list(TRACK_INFO))
+    await sync_slash_commands()
+    await reminder_scheduler.load()
+    start_background_task('reminders', run_reminders)
+    start_background_task('loop_lag', metrics.watch_loop_lag)
+    if metrics.METRICS_FILE:
+        start_background_task('metrics_dump', metrics.dump_prometheus)
+
 @bot.event
 async def on_ready():
     print(f'Logged in as {bot.user}')
-    init_database()
-    import_truck_data()
-    import_xfinity_data()
-    import_arca_data()
-
-    # ONLY UPDATE STANDINGS IF RESULTS EXIST
-    conn = sqlite3.connect('ascrl.db')
-    c = conn.cursor()
-    for series in SUPPORTED_SERIES:
-        c.execute("SELECT COUNT(*) FROM results WHERE series = ?", (series,))
-        count = c.fetchone()[0]
-        if count > 0:
-            try:
-                update_standings(series)
-                print(f"{series} standings updated ({count} results)")
-            except Exception as e:
-                print(f"Error updating {series}: {e}")
-        else:
-            print(f"{series} has no results — standings skipped")
-    conn.close()
-
-    bot.loop.create_task(schedule_reminders())
     print('Bot ready – restart to update')
 
 # ──────────────────────────────────────────────────────────────────────
-# Reminder task (All Series)
-# ──────────────────────────────────────────────────────────────────────
-async def schedule_reminders():
-    while True:
-        now = datetime.now(timezone.utc)
-        conn = sqlite3.connect('ascrl.db')
-        c = conn.cursor()
-        c.execute("SELECT track, date, series FROM races WHERE date != 'N/A' AND season = 'Season 1'")
-        races = c.fetchall()
-        conn.close()
-        for track, date, series in races:
-            try:
-                race_time = datetime.strptime(date, '%Y-%m-%d').replace(tzinfo=timezone.utc)
-                time_diff = (race_time - now).total_seconds()
-                if 3600 <= time_diff <= 3660:
-                    guild = bot.get_guild(int(SERVER_ID))
-                    channel = discord.utils.get(guild.text_channels, name='race-results')
-                    if channel:
-                        role = discord.utils.get(guild.roles, name=f"{series} Series Fans")
-                        role_mention = role.mention if role else f"{series} Series Fans"
-                        embed = discord.Embed(
-                            title=f"{series} Series Race Reminder - Season 1",
-                            description=f"**Track**: {track}\n**Date**: {date}\n**Time**: 9:00 PM EST\n**Role**: {role_mention}",
-                            color=discord.Colour.orange()
-                        )
-                        embed.set_thumbnail(url=EMOJI_URLS['race_car'])
-                        await channel.send(embed=embed)
-                        logging.info(f"Sent reminder for {series} race at {track}")
-            except ValueError:
-                continue
-        await asyncio.sleep(60)
+# Reminder task (All Series) – fires at each REMINDER_OFFSETS deadline
+# ──────────────────────────────────────────────────────────────────────
+async def send_race_reminder(series, track, date, season, start, label):
+    guild = bot.get_guild(int(SERVER_ID))
+    channel = discord.utils.get(guild.text_channels, name='race-results') if guild else None
+    if not channel:
+        raise RuntimeError("#race-results channel not found")
+    role = discord.utils.get(guild.roles, name=f"{series} Series Fans")
+    role_mention = role.mention if role else f"{series} Series Fans"
+    embed = discord.Embed(
+        title=f"{series} Series Race Reminder - {season}",
+        description=f"**Track**: {track}\n**Date**: {date}\n**Time**: {start_time_label(series)}\n**Green flag in**: {label}\n**Role**: {role_mention}",
+        color=discord.Colour.orange()
+    )
+    embed.set_thumbnail(url=EMOJI_URLS['race_car'])
+    # Reminders coming due together leave as one message
+    await outbound.send(channel, embed=embed)
+
+reminder_scheduler = ReminderScheduler(send_race_reminder, race_start, REMINDER_OFFSETS)
+
+async def run_reminders():
+    # Deadlines may come due before the guild cache is filled
+    await bot.wait_until_ready()
+    await reminder_scheduler.run()
+
         # ──────────────────────────────────────────────────────────────────────
 # PART 3: ADMIN COMMANDS – THEME, CHART, DRIVER TOOLS
 # NO !reload – RESTART BOT TO UPDATE
@@ -357,6 +825,83 @@ async def schedule_reminders():
 # ──────────────────────────────────────────────────────────────────────
 # nascar_theme – creates channels, roles, emojis
 # ──────────────────────────────────────────────────────────────────────
+# The whole diff is worked out from the cached guild first, so a server
+# that is already themed costs no API calls at all. Missing pieces go out
+# on one outbound queue per rate-limit bucket (channels, roles, emojis,
+# guild settings), so the four kinds run in parallel with each other while
+# each bucket is fed in order. Images come from the asset cache (assets.py),
+# fetched concurrently while the channels and roles are being created.
+THEME_CATEGORIES = {
+    'Race Series': ['cup-series', 'truck-series', 'xfinity-series', 'arca-series'],
+    'Pit Stop': ['general-chat', 'off-topic', 'nascar-news'],
+    'Victory Lane': ['race-results', 'win-announcements', 'hall-of-fame']
+}
+
+def theme_plan(guild):
+    # Everything missing from the guild – computed before any API call
+    plan = {'categories': [], 'channels': [], 'roles': [], 'emojis': []}
+    for cat_name, channels in THEME_CATEGORIES.items():
+        if not discord.utils.get(guild.categories, name=cat_name):
+            plan['categories'].append(cat_name)
+        plan['channels'] += [(cat_name, ch_name) for ch_name in channels
+                             if not discord.utils.get(guild.channels, name=ch_name)]
+    for s in SUPPORTED_SERIES:
+        role_name = f"{s} Series Fans"
+        if not discord.utils.get(guild.roles, name=role_name):
+            colour = discord.Colour.blue() if s in ['Cup', 'Xfinity'] else discord.Colour.dark_red()
+            plan['roles'].append((role_name, colour))
+    plan['emojis'] = [(emoji_name, url) for emoji_name, url in EMOJI_URLS.items()
+                      if not discord.utils.get(guild.emojis, name=emoji_name)]
+    return plan
+
+async def apply_theme(guild, plan):
+    # -> (created count per kind, failures, asset fetch outcomes)
+    def queue(kind):
+        return (guild.id, kind), f"{guild.name}/{kind}"
+
+    async def run_all(kind, calls):
+        key, label = queue(kind)
+        done = await asyncio.gather(*(outbound.call(key, fn, *args, label=label, **kwargs) for fn, args, kwargs in calls),
+                                    return_exceptions=True)
+        errors = [e for e in done if isinstance(e, Exception)]
+        for e in errors:
+            logging.error(f"Theme {kind} error: {e}")
+        return len(done) - len(errors), len(errors)
+
+    async def channels():
+        made, failed = await run_all('channels', [(guild.create_category, (name,), {}) for name in plan['categories']])
+        categories = {name: discord.utils.get(guild.categories, name=name) for name in THEME_CATEGORIES}
+        more, more_failed = await run_all('channels', [(guild.create_text_channel, (ch_name,), {'category': categories[cat_name]})
+                                                       for cat_name, ch_name in plan['channels']])
+        return made + more, failed + more_failed
+
+    async def emojis_and_cosmetics():
+        urls = [url for _, url in plan['emojis']] + [SERVER_ICON_URL]
+        if 'BANNER' in guild.features:
+            urls.append(SERVER_BANNER_URL)
+        images, outcomes = await assets.fetch_all(urls)
+        emojis = await run_all('emojis', [(guild.create_custom_emoji, (), {'name': name, 'image': images[url]})
+                                          for name, url in plan['emojis'] if images[url]])
+        # Icon + banner in ONE guild edit, and none if they match what was last applied here
+        cosmetics = {'icon': images[SERVER_ICON_URL], 'banner': images.get(SERVER_BANNER_URL)}
+        cosmetics = {field: data for field, data in cosmetics.items() if data}
+        fingerprint = hashlib.sha256(b''.join(cosmetics[field] for field in sorted(cosmetics))).hexdigest()
+        meta_key = f"theme_cosmetics:{guild.id}"
+        applied = await db.fetchone("SELECT value FROM bot_meta WHERE key = ?", (meta_key,))
+        edited = (0, 0)
+        if cosmetics and (not applied or applied[0] != fingerprint or not guild.icon):
+            edited = await run_all('guild', [(guild.edit, (), cosmetics)])
+            if edited[0]:
+                await db.execute("INSERT OR REPLACE INTO bot_meta (key, value) VALUES (?, ?)", (meta_key, fingerprint))
+        return emojis, edited, outcomes
+
+    (channels_made, channels_failed), (roles_made, roles_failed), (emojis, edited, outcomes) = await asyncio.gather(
+        channels(),
+        run_all('roles', [(guild.create_role, (), {'name': name, 'colour': colour, 'hoist': True}) for name, colour in plan['roles']]),
+        emojis_and_cosmetics())
+    created = {'channels': channels_made, 'roles': roles_made, 'emojis': emojis[0], 'cosmetics': edited[0]}
+    return created, channels_failed + roles_failed + emojis[1] + edited[1], outcomes
+
 @bot.command()
 @has_admin_role()
 async def nascar_theme(ctx, confirm: str = 'no'):
@@ -364,90 +909,72 @@ async def nascar_theme(ctx, confirm: str = 'no'):
         if confirm.lower() != 'yes':
             await ctx.send("Run `!nascar_theme yes` to confirm.")
             return
-        guild = bot.get_guild(int(SERVER_ID))
+        guild = ctx.guild or bot.get_guild(int(SERVER_ID))
         if not guild:
             await ctx.send("Bot not in server.")
             return
 
-        # CATEGORIES & CHANNELS
-        categories = {
-            'Race Series': ['cup-series', 'truck-series', 'xfinity-series', 'arca-series'],
-            'Pit Stop': ['general-chat', 'off-topic', 'nascar-news'],
-            'Victory Lane': ['race-results', 'win-announcements', 'hall-of-fame']
-        }
-        for cat_name, channels in categories.items():
-            category = discord.utils.get(guild.categories, name=cat_name)
-            if not category:
-                category = await guild.create_category(cat_name)
-            for ch_name in channels:
-                if not discord.utils.get(guild.channels, name=ch_name):
-                    await guild.create_text_channel(ch_name, category=category)
-
-        # ROLES – AUTO-GENERATED FOR ALL SERIES
-        for s in SUPPORTED_SERIES:
-            role_name = f"{s} Series Fans"
-            if not discord.utils.get(guild.roles, name=role_name):
-                colour = discord.Colour.blue() if s in ['Cup', 'Xfinity'] else discord.Colour.dark_red()
-                await guild.create_role(name=role_name, colour=colour, hoist=True)
-
-        # EMOJIS
-        async with aiohttp.ClientSession() as session:
-            for emoji_name, url in EMOJI_URLS.items():
-                if not discord.utils.get(guild.emojis, name=emoji_name):
-                    try:
-                        async with session.get(url) as resp:
-                            if resp.status == 200:
-                                image_bytes = await resp.read()
-                                await guild.create_custom_emoji(name=emoji_name, image=image_bytes)
-                    except Exception as e:
-                        logging.error(f"Emoji {emoji_name} error: {e}")
-
-            # SERVER ICON & BANNER
-            try:
-                async with session.get(SERVER_ICON_URL) as resp:
-                    if resp.status == 200:
-                        await guild.edit(icon=await resp.read())
-                async with session.get(SERVER_BANNER_URL) as resp:
-                    if resp.status == 200 and 'BANNER' in guild.features:
-                        await guild.edit(banner=await resp.read())
-            except Exception as e:
-                logging.error(f"Server cosmetics error: {e}")
-
-        await ctx.send("NASCAR theme applied! All series ready!")
+        started = time.perf_counter()
+        plan = theme_plan(guild)
+        created, failed, outcomes = await apply_theme(guild, plan)
+        made = ", ".join(f"{n} {kind}" for kind, n in created.items() if n) or "nothing missing"
+        fetched = ", ".join(f"{n} {outcome}" for outcome, n in sorted(outcomes.items()))
+        await ctx.send(f"NASCAR theme applied in {time.perf_counter() - started:.1f}s! Created: {made}. "
+                       f"Images: {fetched}." + (f" {failed} failed – see the log." if failed else " All series ready!"))
     except Exception as e:
         await ctx.send(f"Theme error: {str(e)}")
         logging.error(f"Theme error: {str(e)}")
 
 # ──────────────────────────────────────────────────────────────────────
-# chart – top 10 points
+# chart – standings / progression / heatmap, rendered off the event loop
 # ──────────────────────────────────────────────────────────────────────
+CHART_DRIVERS = {'standings': 10, 'progression': 10, 'heatmap': 20}
+
+def chart_data(c, kind, series, season):
+    # Renderer args for charts.RENDERERS[kind], or None when there is nothing to draw
+    c.execute("""SELECT d.driver_name, s.points FROM standings s JOIN drivers d ON d.driver_id = s.driver_id
+                 WHERE s.series = ? AND s.season = ? ORDER BY s.points DESC, s.avg_finish ASC NULLS LAST LIMIT ?""",
+              (series, season, CHART_DRIVERS[kind]))
+    top = c.fetchall()
+    if not top:
+        return None
+    if kind == 'standings':
+        return (f'{series} Series Standings - {season}', top)
+    c.execute("""SELECT ra.race_id, ra.track, d.driver_name, r.finish_position, r.pole, r.fastest_lap, r.stages
+                  FROM races ra
+                  JOIN results r ON r.race_id = ra.race_id
+                  JOIN drivers d ON d.driver_id = r.driver_id
+                  WHERE ra.series = ? AND ra.season = ? AND r.finish_position IS NOT NULL
+                  ORDER BY ra.date, ra.race_id""", (series, season))
+    rows = c.fetchall()
+    if kind == 'progression':
+        # Points each race earned under the season's system (before drops / playoff resets)
+        system = points.load_system(c, series, season)
+        rows = [(race_id, track, driver, system.race_points(*result)) for race_id, track, driver, *result in rows]
+    else:
+        rows = [row[:4] for row in rows]
+    if not rows:
+        return None
+    title = 'Points Progression' if kind == 'progression' else 'Finishing Positions'
+    return (f'{series} {title} - {season}', rows, [driver for driver, _ in top])
+
 @bot.command()
 @has_admin_role()
-async def chart(ctx, series: str = 'Cup'):
+async def chart(ctx, series: str = 'Cup', kind: str = 'standings'):
     try:
         series = validate_series(series)
-        conn = sqlite3.connect('ascrl.db')
-        c = conn.cursor()
-        c.execute("SELECT driver_name, points FROM standings WHERE series = ? ORDER BY points DESC LIMIT 10", (series,))
-        data = c.fetchall()
-        conn.close()
-        if not data:
+        kind = kind.lower()
+        if kind not in CHART_DRIVERS:
+            await ctx.send(f"Chart types: {', '.join(CHART_DRIVERS)}")
+            return
+        # Version first: a cached PNG for the current version skips the data query entirely
+        version = await db.read(standings_version, series, CURRENT_SEASON)
+        png = await charts.get(kind, series, CURRENT_SEASON, version,
+                               lambda: db.read(chart_data, kind, series, CURRENT_SEASON))
+        if png is None:
             await ctx.send(f"No data for {series}.")
             return
-        drivers, points = zip(*data)
-        plt.figure(figsize=(10, 6))
-        colors = [f'hsl({i*36}, 70%, 50%)' for i in range(len(drivers))]
-        plt.bar(drivers, points, color=colors)
-        plt.xlabel('Drivers')
-        plt.ylabel('Points')
-        plt.title(f'{series} Series Standings - Season 1')
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-        chart_path = 'standings_chart.png'
-        plt.savefig(chart_path)
-        plt.close()
-        await ctx.send(file=discord.File(chart_path))
-        os.remove(chart_path)
+        await ctx.send(file=discord.File(io.BytesIO(png), filename=f'{series.lower()}_{kind}.png'))
     except Exception as e:
         await ctx.send(f"Chart error: {str(e)}")
         logging.error(f"Chart error: {str(e)}")
@@ -465,22 +992,21 @@ async def assign_driver(ctx, *, args):
             return
         driver_name, series = parts
         series = validate_series(series)
-        conn = sqlite3.connect('ascrl.db')
-        c = conn.cursor()
-        c.execute("SELECT COUNT(*) FROM drivers WHERE series = ?", (series,))
-        if c.fetchone()[0] >= 100:
+
+        def work(c):
+            c.execute("SELECT COUNT(*) FROM drivers WHERE series = ?", (series,))
+            if c.fetchone()[0] >= 100:
+                return False
+            c.execute("INSERT OR IGNORE INTO drivers (driver_name, series) VALUES (?, ?)", (driver_name, series))
+            add_standings_rows(c, series, [driver_name])
+            return True
+
+        if not await db.transaction(work):
             await ctx.send(f"{series} full (100 max).")
-            conn.close()
             return
-        c.execute("INSERT OR IGNORE INTO drivers (driver_name, series) VALUES (?, ?)", (driver_name, series))
-        conn.commit()
-        conn.close()
+        cache.invalidate(series, STANDINGS_VIEWS)
+        names.add('driver', driver_name, series)
         await ctx.send(f"{driver_name} → {series}")
-        # Only update standings if results exist
-        c = conn.cursor()
-        c.execute("SELECT COUNT(*) FROM results WHERE series = ?", (series,))
-        if c.fetchone()[0] > 0:
-            update_standings(series)
     except Exception as e:
         await ctx.send(f"Error: {str(e)}")
 
@@ -496,26 +1022,26 @@ async def batch_assign_drivers(ctx, series: str, *, drivers: str):
         if not driver_list:
             await ctx.send("Use: `!batch_assign_drivers Truck #99 Speedy;#88 Racer`")
             return
-        conn = sqlite3.connect('ascrl.db')
-        c = conn.cursor()
-        c.execute("SELECT COUNT(*) FROM drivers WHERE series = ?", (series,))
-        current = c.fetchone()[0]
-        max_allowed = 100 - current
-        if len(driver_list) > max_allowed:
+
+        def work(c):
+            c.execute("SELECT COUNT(*) FROM drivers WHERE series = ?", (series,))
+            max_allowed = 100 - c.fetchone()[0]
+            if len(driver_list) > max_allowed:
+                return None, max_allowed
+            added = 0
+            for driver in driver_list:
+                c.execute("INSERT OR IGNORE INTO drivers (driver_name, series) VALUES (?, ?)", (driver, series))
+                added += c.rowcount
+            add_standings_rows(c, series, driver_list)
+            return added, max_allowed
+
+        added, max_allowed = await db.transaction(work)
+        if added is None:
             await ctx.send(f"Only {max_allowed} spots left.")
-            conn.close()
             return
-        added = 0
+        cache.invalidate(series, STANDINGS_VIEWS)
         for driver in driver_list:
-            c.execute("INSERT OR IGNORE INTO drivers (driver_name, series) VALUES (?, ?)", (driver, series))
-            added += c.rowcount
-        conn.commit()
-        conn.close()
-        # Only update standings if results exist
-        c = conn.cursor()
-        c.execute("SELECT COUNT(*) FROM results WHERE series = ?", (series,))
-        if c.fetchone()[0] > 0:
-            update_standings(series)
+            names.add('driver', driver, series)
         await ctx.send(f"Added {added} drivers to {series}.")
     except Exception as e:
         await ctx.send(f"Error: {str(e)}")
@@ -532,56 +1058,84 @@ async def batch_remove_drivers(ctx, series: str, *, drivers: str):
         if not driver_list:
             await ctx.send("Use: `!batch_remove_drivers Truck #99 Speedy;#88 Racer`")
             return
-        conn = sqlite3.connect('ascrl.db')
-        c = conn.cursor()
-        removed = 0
-        for driver in driver_list:
-            c.execute("DELETE FROM drivers WHERE driver_name = ? AND series = ?", (driver, series))
-            c.execute("DELETE FROM results WHERE driver_name = ? AND series = ?", (driver, series))
-            c.execute("DELETE FROM standings WHERE driver_name = ? AND series = ?", (driver, series))
-            c.execute("DELETE FROM winners WHERE winner = ? AND series = ?", (driver, series))
-            removed += c.rowcount
-        conn.commit()
-        conn.close()
-        # Only update standings if results exist
-        c = conn.cursor()
-        c.execute("SELECT COUNT(*) FROM results WHERE series = ?", (series,))
-        if c.fetchone()[0] > 0:
-            update_standings(series)
-        await ctx.send(f"Removed {removed} drivers from {series}.")
+
+        def work(c):
+            removed = []
+            for driver in driver_list:
+                c.execute("SELECT driver_id FROM drivers WHERE driver_name = ? AND series = ?", (driver, series))
+                row = c.fetchone()
+                if row:
+                    delete_driver(c, row[0])
+                    removed.append(driver)
+            return removed
+
+        await snapshot_before('batch_remove_drivers')
+        removed = await db.transaction(work)
+        cache.invalidate(series, STANDINGS_VIEWS)
+        for driver in removed:
+            names.remove('driver', driver, series)
+        await ctx.send(f"Removed {len(removed)} drivers from {series}.")
     except Exception as e:
         await ctx.send(f"Error: {str(e)}")
 
 # ──────────────────────────────────────────────────────────────────────
 # clear_driver
 # ──────────────────────────────────────────────────────────────────────
-@bot.command()
+@bot.hybrid_command(description="Remove a driver and their results from a series")
 @has_admin_role()
 async def clear_driver(ctx, driver_name: str, series: str = 'Cup'):
     try:
         series = validate_series(series)
         driver_name = driver_name.strip('"\'')
-        conn = sqlite3.connect('ascrl.db')
-        c = conn.cursor()
-        c.execute("SELECT driver_name FROM drivers WHERE driver_name = ? AND series = ?", (driver_name, series))
-        if not c.fetchone():
-            await ctx.send(f"{driver_name} not in {series}.")
-            conn.close()
+        driver_name = names.resolve('driver', driver_name, series) or driver_name
+
+        def work(c):
+            c.execute("SELECT driver_id FROM drivers WHERE driver_name = ? AND series = ?", (driver_name, series))
+            row = c.fetchone()
+            if not row:
+                return False
+            delete_driver(c, row[0])
+            return True
+
+        await snapshot_before('clear_driver')
+        if not await db.transaction(work):
+            await ctx.send(f"{driver_name} not in {series}.{did_you_mean('driver', driver_name, series)}")
             return
-        c.execute("DELETE FROM drivers WHERE driver_name = ? AND series = ?", (driver_name, series))
-        c.execute("DELETE FROM results WHERE driver_name = ? AND series = ?", (driver_name, series))
-        c.execute("DELETE FROM standings WHERE driver_name = ? AND series = ?", (driver_name, series))
-        c.execute("DELETE FROM winners WHERE winner = ? AND series = ?", (driver_name, series))
-        conn.commit()
-        conn.close()
-        # Only update standings if results exist
-        c = conn.cursor()
-        c.execute("SELECT COUNT(*) FROM results WHERE series = ?", (series,))
-        if c.fetchone()[0] > 0:
-            update_standings(series)
+        cache.invalidate(series, STANDINGS_VIEWS)
+        names.remove('driver', driver_name, series)
         await ctx.send(f"{driver_name} removed from {series}.")
     except Exception as e:
         await ctx.send(f"Error: {str(e)}")
+
+# ──────────────────────────────────────────────────────────────────────
+# verify_standings – compare incremental standings with a full recompute
+# ──────────────────────────────────────────────────────────────────────
+@bot.command(name='verify_standings')
+@has_admin_role()
+async def verify_standings_cmd(ctx, series: str = None, fix: str = 'no'):
+    try:
+        series_list = [validate_series(series)] if series else SUPPORTED_SERIES
+
+        def work(c):
+            lines = []
+            for ser in series_list:
+                drift = verify_standings(c, ser, CURRENT_SEASON)
+                if not drift:
+                    lines.append(f"{ser}: OK")
+                    continue
+                lines.append(f"{ser}: {len(drift)} drivers drifted (" + ", ".join(str(d[0]) for d in drift[:5]) + (", …" if len(drift) > 5 else "") + ")")
+                if fix.lower() == 'yes':
+                    rebuild_standings(c, ser, CURRENT_SEASON)
+                    lines.append(f"{ser}: rebuilt from results")
+            return lines
+
+        lines = await db.transaction(work)
+        if fix.lower() == 'yes':
+            for ser in series_list:
+                cache.invalidate(ser, STANDINGS_VIEWS)
+        await ctx.send("```" + "\n".join(lines) + "```")
+    except Exception as e:
+        await ctx.send(f"Error: {str(e)}")
         # ──────────────────────────────────────────────────────────────────────
 # PART 4: RACE TOOLS, BATCH DATA, USER COMMANDS, BOT RUN
 # ──────────────────────────────────────────────────────────────────────
@@ -599,11 +1153,15 @@ async def add_race(ctx, series: str, track: str, date: str):
         except ValueError:
             await ctx.send("Use YYYY-MM-DD, e.g., 2025-10-21")
             return
-        conn = sqlite3.connect('ascrl.db')
-        c = conn.cursor()
-        c.execute("INSERT OR REPLACE INTO races (track, date, series, season) VALUES (?, ?, ?, ?)", (track.title(), date, series, 'Season 1'))
-        conn.commit()
-        conn.close()
+        # A race is (series, season, track, date) – re-adding an existing one is a no-op
+        added = await db.execute("INSERT INTO races (track, date, series, season) VALUES (?, ?, ?, ?) ON CONFLICT DO NOTHING",
+                                 (track.title(), date, series, CURRENT_SEASON))
+        if not added:
+            await ctx.send(f"{series} race at {track} on {date} already scheduled.")
+            return
+        cache.invalidate(series, SCHEDULE_VIEWS)
+        reminder_scheduler.add_race(series, track.title(), date, CURRENT_SEASON)
+        names.add_race(series, track.title(), date, CURRENT_SEASON)
         await ctx.send(f"Added {series} race: {track} on {date}")
         logging.info(f"Added {series} race: {track} {date}")
     except Exception as e:
@@ -622,23 +1180,22 @@ async def remove_race(ctx, series: str, track: str, date: str):
         except ValueError:
             await ctx.send("Use YYYY-MM-DD")
             return
-        conn = sqlite3.connect('ascrl.db')
-        c = conn.cursor()
-        c.execute("SELECT track FROM races WHERE track = ? AND date = ? AND series = ?", (track.title(), date, series))
-        if not c.fetchone():
+
+        def work(c):
+            c.execute("SELECT race_id, season FROM races WHERE track = ? AND date = ? AND series = ?", (track.title(), date, series))
+            races = c.fetchall()
+            for race_id, season in races:
+                clear_race_results(c, series, race_id, season)
+                c.execute("DELETE FROM races WHERE race_id = ?", (race_id,))
+            return bool(races)
+
+        await snapshot_before('remove_race')
+        if not await db.transaction(work):
             await ctx.send(f"No {series} race at {track} on {date}.")
-            conn.close()
             return
-        c.execute("DELETE FROM races WHERE track = ? AND date = ? AND series = ?", (track.title(), date, series))
-        c.execute("DELETE FROM results WHERE track = ? AND series = ?", (track.title(), series))
-        c.execute("DELETE FROM winners WHERE track = ? AND series = ?", (track.title(), series))
-        conn.commit()
-        conn.close()
-        # Only update standings if results exist
-        c = conn.cursor()
-        c.execute("SELECT COUNT(*) FROM results WHERE series = ?", (series,))
-        if c.fetchone()[0] > 0:
-            update_standings(series)
+        cache.invalidate(series)
+        reminder_scheduler.remove_race(series, track.title(), date)
+        names.remove_race(series, track.title(), date)
         await ctx.send(f"Removed {series} race: {track} {date}")
     except Exception as e:
         await ctx.send(f"Error: {str(e)}")
@@ -651,12 +1208,9 @@ async def remove_race(ctx, series: str, track: str, date: str):
 async def batch_add_races(ctx, series: str, *, races: str):
     try:
         series = validate_series(series)
-        conn = sqlite3.connect('ascrl.db')
-        c = conn.cursor()
         races_list = [r.strip() for r in races.split(';') if r.strip()]
         if not races_list:
             await ctx.send("Use: track,date; e.g., 'Daytona,2025-10-21'")
-            conn.close()
             return
         valid_races = []
         for race in races_list:
@@ -670,14 +1224,26 @@ async def batch_add_races(ctx, series: str, *, races: str):
             except ValueError:
                 await ctx.send(f"Bad date: {date}")
                 continue
-            valid_races.append((track.title(), date, series, 'Season 1'))
+            valid_races.append((track.title(), date, series, CURRENT_SEASON))
         if valid_races:
-            c.executemany("INSERT OR REPLACE INTO races (track, date, series, season) VALUES (?, ?, ?, ?)", valid_races)
-            conn.commit()
-            await ctx.send(f"Added {len(valid_races)} races to {series}")
+            def work(c):
+                # Only rows that really went in – an already scheduled race is left alone
+                inserted = []
+                for race in valid_races:
+                    c.execute("INSERT INTO races (track, date, series, season) VALUES (?, ?, ?, ?) ON CONFLICT DO NOTHING", race)
+                    if c.rowcount:
+                        inserted.append(race)
+                return inserted
+
+            inserted = await db.transaction(work)
+            cache.invalidate(series, SCHEDULE_VIEWS)
+            for track, date, ser, season in inserted:
+                reminder_scheduler.add_race(ser, track, date, season)
+                names.add_race(ser, track, date, season)
+            skipped = len(valid_races) - len(inserted)
+            await ctx.send(f"Added {len(inserted)} races to {series}" + (f" ({skipped} already scheduled)" if skipped else ""))
         else:
             await ctx.send("No valid races.")
-        conn.close()
     except Exception as e:
         await ctx.send(f"Error: {str(e)}")
 
@@ -689,14 +1255,11 @@ async def batch_add_races(ctx, series: str, *, races: str):
 async def batch_remove_races(ctx, series: str, *, races: str):
     try:
         series = validate_series(series)
-        conn = sqlite3.connect('ascrl.db')
-        c = conn.cursor()
         races_list = [r.strip() for r in races.split(';') if r.strip()]
         if not races_list:
             await ctx.send("Use: track,date; e.g., 'Daytona,2025-10-21'")
-            conn.close()
             return
-        removed = 0
+        to_remove = []
         for race in races_list:
             parts = [p.strip() for p in race.split(',')]
             if len(parts) != 2:
@@ -708,86 +1271,244 @@ async def batch_remove_races(ctx, series: str, *, races: str):
             except ValueError:
                 await ctx.send(f"Bad date: {date}")
                 continue
-            c.execute("SELECT track FROM races WHERE track = ? AND date = ? AND series = ?", (track.title(), date, series))
-            if not c.fetchone():
-                await ctx.send(f"No race: {track} {date}")
-                continue
-            c.execute("DELETE FROM races WHERE track = ? AND date = ? AND series = ?", (track.title(), date, series))
-            c.execute("DELETE FROM results WHERE track = ? AND series = ?", (track.title(), series))
-            c.execute("DELETE FROM winners WHERE track = ? AND series = ?", (track.title(), series))
-            removed += 1
-        conn.commit()
-        conn.close()
-        # Only update standings if results exist
-        c = conn.cursor()
-        c.execute("SELECT COUNT(*) FROM results WHERE series = ?", (series,))
-        if c.fetchone()[0] > 0:
-            update_standings(series)
-        await ctx.send(f"Removed {removed} races from {series}")
+            to_remove.append((track, date))
+
+        def work(c):
+            missing = []
+            for track, date in to_remove:
+                c.execute("SELECT race_id, season FROM races WHERE track = ? AND date = ? AND series = ?", (track.title(), date, series))
+                races = c.fetchall()
+                if not races:
+                    missing.append((track, date))
+                for race_id, season in races:
+                    clear_race_results(c, series, race_id, season)
+                    c.execute("DELETE FROM races WHERE race_id = ?", (race_id,))
+            return missing
+
+        await snapshot_before('batch_remove_races')
+        missing = await db.transaction(work)
+        cache.invalidate(series)
+        for track, date in to_remove:
+            if (track, date) not in missing:
+                reminder_scheduler.remove_race(series, track.title(), date)
+                names.remove_race(series, track.title(), date)
+        for track, date in missing:
+            await ctx.send(f"No race: {track} {date}")
+        await ctx.send(f"Removed {len(to_remove) - len(missing)} races from {series}")
     except Exception as e:
         await ctx.send(f"Error: {str(e)}")
 
 # ──────────────────────────────────────────────────────────────────────
-# batch_race_data (pole + FL support)
+# batch_race_data (pole + FL support) – validate everything, write once
 # ──────────────────────────────────────────────────────────────────────
+MAX_FIELD = 40
+MAX_POSITION = 36
+REPORT_LINES = 15
+
+# Header names accepted in a results CSV (sim export or hand-made)
+CSV_COLUMNS = {
+    'driver': ('driver', 'driver_name', 'driver name', 'name', 'player'),
+    'position': ('pos', 'position', 'finish', 'finish_position', 'fin'),
+    'pole': ('pole', 'pole_position'),
+    'fastest_lap': ('fl', 'fastest_lap', 'fastest lap', 'fastestlap'),
+    'stages': ('stages',),
+}
+# Per-stage finish columns: stage1 / s1 / "stage 1" ... (or one 'stages' column as 3/1)
+STAGE_COLUMN_RE = re.compile(r'^(?:stage|s)\s*_?(\d)$')
+CSV_TRUE = {'yes', 'y', 'x', '1', 'true', 'pole', 'fl'}
+
+def parse_results_text(results: str):
+    results = re.sub(r'[\'"]', '', results)
+    entries = [r.strip() for r in results.split(';') if r.strip()]
+    return [(f"#{n} `{entry}`", entry.split(',')) for n, entry in enumerate(entries, 1)]
+
+def parse_results_csv(text: str):
+    rows = [r for r in csv.reader(io.StringIO(text)) if any(cell.strip() for cell in r)]
+    if not rows:
+        return []
+    header = [h.strip().lower() for h in rows[0]]
+    idx = {key: next((header.index(a) for a in aliases if a in header), None) for key, aliases in CSV_COLUMNS.items()}
+    if idx['driver'] is None or idx['position'] is None:
+        # No recognisable header – columns are driver,position[,pole][,FL][,stages] like the text form
+        return [(f"row {n}", row) for n, row in enumerate(rows, 1)]
+
+    def cell(row, key):
+        i = idx[key]
+        return row[i].strip() if i is not None and i < len(row) else ''
+
+    stage_columns = sorted((int(m.group(1)), i) for i, h in enumerate(header) if (m := STAGE_COLUMN_RE.match(h)))
+    parsed = []
+    for n, row in enumerate(rows[1:], 2):
+        pole = 'yes' if cell(row, 'pole').lower() in CSV_TRUE else ''
+        fastest_lap = 'FL' if cell(row, 'fastest_lap').lower() in CSV_TRUE else ''
+        stages = cell(row, 'stages') or '/'.join(row[i].strip() if i < len(row) else '' for _, i in stage_columns)
+        parsed.append((f"row {n}", [cell(row, 'driver'), cell(row, 'position'), pole, fastest_lap, stages]))
+    return parsed
+
+def parse_stage_finishes(text):
+    # "3/1" -> "3/1"; "" -> None; a blank stage stays blank ("/4"). Raises ValueError
+    parts = [p.strip() for p in text.split('/')] if text else []
+    while parts and not parts[-1]:
+        parts.pop()
+    for p in parts:
+        if p and not (p.isdigit() and 1 <= int(p) <= MAX_POSITION):
+            raise ValueError(f"Bad stage finish: {p}")
+    return '/'.join(parts) or None
+
+def validate_result_rows(rows):
+    # -> (entered, problems, errors): good rows, per-line rejects, whole-set errors
+    entered, problems = [], []
+    drivers_seen, positions_seen = {}, {}
+    for label, parts in rows:
+        parts = [p.strip() for p in parts]
+        if len(parts) < 2 or not parts[0]:
+            problems.append((label, "Use driver,position[,pole][,FL][,stages]"))
+            continue
+        driver, position = parts[0], parts[1]
+        pole = 'Yes' if len(parts) >= 3 and parts[2].lower() == 'yes' else ''
+        fastest_lap = 'FL' if len(parts) >= 4 and parts[3].upper() == 'FL' else ''
+        try:
+            position = int(position)
+        except ValueError:
+            problems.append((label, f"Invalid position: {position}"))
+            continue
+        try:
+            stages = parse_stage_finishes(parts[4] if len(parts) >= 5 else '')
+        except ValueError as e:
+            problems.append((label, str(e)))
+            continue
+        if position < 1 or position > MAX_POSITION:
+            problems.append((label, f"Bad position: {position}"))
+            continue
+        if driver in drivers_seen:
+            problems.append((label, f"{driver} already listed at {drivers_seen[driver]}"))
+            continue
+        if position in positions_seen:
+            problems.append((label, f"P{position} already given to {positions_seen[position]}"))
+            continue
+        drivers_seen[driver] = label
+        positions_seen[position] = driver
+        entered.append((driver, position, pole, fastest_lap, stages))
+    errors = []
+    if sum(1 for e in entered if e[2]) > 1:
+        errors.append("Only one pole.")
+    if sum(1 for e in entered if e[3]) > 1:
+        errors.append("Only one fastest lap.")
+    if len(entered) > MAX_FIELD:
+        errors.append(f"Max {MAX_FIELD} drivers.")
+    return entered, problems, errors
+
+def ingest_results(c, series, race, entered, replace=False):
+    # One set-based pass: stage the field, diff it against what is stored, swap it in.
+    # By default the posted drivers are merged into the stored field, so a race can be
+    # entered in several batches. replace=True makes the post the whole field: stored
+    # drivers left out of it lose their row.
+    # Returns ((race_id, track, date, season), created?, [drivers added to the roster])
+    found = find_race(c, series, race)
+    created = found is None
+    if created:
+        _, track, date = parse_race_spec(race)
+        if track is None:
+            raise ValueError(f"No {series} race with id {race}.")
+        date = date or datetime.now().strftime('%Y-%m-%d')
+        c.execute("INSERT INTO races (track, date, series, season) VALUES (?, ?, ?, ?)",
+                  (track, date, series, CURRENT_SEASON))
+        found = (c.lastrowid, track, date, CURRENT_SEASON)
+    race_id, track, date, season = found
+    c.execute('''CREATE TEMP TABLE IF NOT EXISTS results_staging
+                 (driver_name TEXT PRIMARY KEY, driver_id INTEGER, finish_position INTEGER, pole TEXT, fastest_lap TEXT,
+                  stages TEXT)''')
+    c.execute("DELETE FROM results_staging")
+    c.executemany("INSERT INTO results_staging (driver_name, finish_position, pole, fastest_lap, stages) VALUES (?, ?, ?, ?, ?)", entered)
+    c.execute("""SELECT driver_name FROM results_staging s
+                 WHERE NOT EXISTS (SELECT 1 FROM drivers d WHERE d.driver_name = s.driver_name AND d.series = ?)""", (series,))
+    new_drivers = [row[0] for row in c.fetchall()]
+    c.execute("INSERT OR IGNORE INTO drivers (driver_name, series) SELECT driver_name, ? FROM results_staging", (series,))
+    c.execute("""UPDATE results_staging SET driver_id =
+                     (SELECT d.driver_id FROM drivers d WHERE d.driver_name = results_staging.driver_name AND d.series = ?)""",
+              (series,))
+    if replace:
+        c.execute("SELECT driver_id, finish_position, pole, fastest_lap, stages FROM results WHERE race_id = ?", (race_id,))
+        replaced = c.fetchall()
+        c.execute("DELETE FROM results WHERE race_id = ? AND driver_id NOT IN (SELECT driver_id FROM results_staging)",
+                  (race_id,))
+    else:
+        # A merge must not hand out a finish that a driver outside this post already holds
+        c.execute("""SELECT s.finish_position FROM results r JOIN results_staging s ON s.finish_position = r.finish_position
+                     WHERE r.race_id = ? AND r.driver_id NOT IN (SELECT driver_id FROM results_staging)
+                     ORDER BY s.finish_position""", (race_id,))
+        taken = [row[0] for row in c.fetchall()]
+        if taken:
+            raise ValueError(f"{', '.join(f'P{p}' for p in taken)} already stored for other drivers – "
+                             f"post with `replace` to overwrite the whole field.")
+        c.execute("""SELECT r.driver_id, r.finish_position, r.pole, r.fastest_lap, r.stages
+                     FROM results r JOIN results_staging s ON s.driver_id = r.driver_id
+                     WHERE r.race_id = ?""", (race_id,))
+        replaced = c.fetchall()
+    # WHERE true keeps SQLite from reading ON CONFLICT as a join constraint
+    c.execute("""INSERT INTO results (race_id, driver_id, finish_position, pole, fastest_lap, stages)
+                 SELECT ?, driver_id, finish_position, pole, fastest_lap, stages FROM results_staging WHERE true
+                 ON CONFLICT (race_id, driver_id) DO UPDATE SET finish_position = excluded.finish_position,
+                     pole = excluded.pole, fastest_lap = excluded.fastest_lap, stages = excluded.stages""", (race_id,))
+    c.execute("SELECT driver_id, finish_position, pole, fastest_lap, stages FROM results_staging")
+    posted = c.fetchall()
+    batch = next_batch(c)
+    log_results(c, batch, 'cleared', series, season, race_id, replaced)
+    log_results(c, batch, 'posted', series, season, race_id, posted)
+    apply_standings_delta(c, series, season, removed=replaced, added=posted)
+    refresh_winner(c, race_id)
+    c.execute("DELETE FROM results_staging")
+    return found, created, new_drivers
+
 @bot.command()
 @has_admin_role()
-async def batch_race_data(ctx, series: str, race: str, *, results: str):
+async def batch_race_data(ctx, series: str, race: str, *, results: str = ''):
     try:
         series = validate_series(series)
-        conn = sqlite3.connect('ascrl.db')
-        c = conn.cursor()
-        race = race.title()
-        c.execute("SELECT track FROM races WHERE track = ? AND series = ?", (race, series))
-        if not c.fetchone():
-            c.execute("INSERT OR REPLACE INTO races (track, date, series, season) VALUES (?, ?, ?, ?)",
-                      (race, datetime.now().strftime('%Y-%m-%d'), series, 'Season 1'))
-        results = re.sub(r'[\'"]', '', results)
-        results_list = [r.strip() for r in results.split(';') if r.strip()]
-        if not results_list:
-            await ctx.send("Use: driver,position[,pole][,FL]")
-            conn.close()
-            return
-        pole_count = sum(1 for r in results_list if ',Yes' in r or ',yes' in r)
-        fl_count = sum(1 for r in results_list if ',FL' in r or ',fl' in r)
-        if pole_count > 1:
-            await ctx.send("Only one pole.")
-            conn.close()
-            return
-        if fl_count > 1:
-            await ctx.send("Only one fastest lap.")
-            conn.close()
+        try:
+            parse_race_spec(race)
+        except ValueError:
+            await ctx.send("Race is a track, Track@YYYY-MM-DD or a race id")
             return
-        if len(results_list) > 40:
-            await ctx.send("Max 40 drivers.")
-            conn.close()
+        # Leading `replace`: the post is the whole field, anyone left out is cleared
+        words = results.split(None, 1)
+        replace = bool(words) and words[0].lower() == 'replace'
+        if replace:
+            results = words[1] if len(words) > 1 else ''
+        attachment = next((a for a in ctx.message.attachments if a.filename.lower().endswith('.csv')), None)
+        if attachment:
+            rows = parse_results_csv((await attachment.read()).decode('utf-8-sig', errors='replace'))
+        else:
+            rows = parse_results_text(results)
+        if not rows:
+            await ctx.send("Use: [replace] driver,position[,pole][,FL][,stage finishes as 3/1] separated by `;` – or attach "
+                           "a results .csv. Drivers are added to what is already stored; `replace` makes this the whole field.")
             return
-        for result in results_list:
-            parts = [p.strip() for p in result.split(',')]
-            if len(parts) < 2:
-                await ctx.send(f"Invalid: {result}")
-                continue
-            driver, position = parts[0], parts[1]
-            pole = 'Yes' if len(parts) >= 3 and parts[2].lower() == 'yes' else ''
-            fastest_lap = 'FL' if len(parts) >= 4 and parts[3].upper() == 'FL' else ''
-            try:
-                position = int(position)
-                if position < 1 or position > 36:
-                    await ctx.send(f"Bad position: {position}")
-                    continue
-            except ValueError:
-                await ctx.send(f"Invalid position: {position}")
-                continue
-            c.execute("SELECT driver_name FROM drivers WHERE driver_name = ? AND series = ?", (driver, series))
-            if not c.fetchone():
-                c.execute("INSERT OR IGNORE INTO drivers (driver_name, series) VALUES (?, ?)", (driver, series))
-            c.execute("DELETE FROM results WHERE driver_name = ? AND track = ? AND series = ?", (driver, race, series))
-            c.execute("INSERT OR REPLACE INTO results (driver_name, track, finish_position, pole, fastest_lap, series) VALUES (?, ?, ?, ?, ?, ?)",
-                      (driver, race, position, pole, fastest_lap, series))
-        conn.commit()
-        conn.close()
-        update_standings(series)
-        await ctx.send(f"Results entered: {series} – {race}")
+        entered, problems, errors = validate_result_rows(rows)
+        if not errors and not entered:
+            errors.append("No valid result lines.")
+
+        report = []
+        if errors:
+            report.append(f"Nothing saved for {series} – {race}: " + " ".join(errors))
+        else:
+            found, created, new_drivers = await db.transaction(ingest_results, series, race, entered, replace)
+            race_id, track, date, season = found
+            # May also have created the race, so schedule views go too
+            cache.invalidate(series)
+            if created:
+                reminder_scheduler.add_race(series, track, date, season)
+                names.add_race(series, track, date, season)
+            for driver in new_drivers:
+                names.add('driver', driver, series)
+            how = "field replaced" if replace else "merged with stored results"
+            report.append(f"Results entered: {series} – {track} {date} ({len(entered)} drivers, {how})")
+        if problems:
+            report.append(f"Skipped {len(problems)} line(s):")
+            report.extend(f"• {label}: {why}" for label, why in problems[:REPORT_LINES])
+            if len(problems) > REPORT_LINES:
+                report.append(f"… and {len(problems) - REPORT_LINES} more")
+        await ctx.send("\n".join(report)[:2000])
     except Exception as e:
         await ctx.send(f"Error: {str(e)}")
 
@@ -799,79 +1520,182 @@ async def batch_race_data(ctx, series: str, race: str, *, results: str):
 async def clear_results(ctx, series: str, race: str):
     try:
         series = validate_series(series)
-        conn = sqlite3.connect('ascrl.db')
-        c = conn.cursor()
-        race = race.title()
-        c.execute("SELECT track FROM races WHERE track = ? AND series = ?", (race, series))
-        if not c.fetchone():
+
+        def work(c):
+            found = find_race(c, series, race)
+            if found:
+                race_id, track, date, season = found
+                clear_race_results(c, series, race_id, season)
+            return found
+
+        await snapshot_before('clear_results')
+        found = await db.transaction(work)
+        if not found:
             await ctx.send(f"No race: {race} in {series}.")
-            conn.close()
             return
-        c.execute("DELETE FROM results WHERE track = ? AND series = ?", (race, series))
-        c.execute("DELETE FROM winners WHERE track = ? AND series = ?", (race, series))
-        conn.commit()
-        conn.close()
-        # Only update standings if results exist
-        c = conn.cursor()
-        c.execute("SELECT COUNT(*) FROM results WHERE series = ?", (series,))
-        if c.fetchone()[0] > 0:
-            update_standings(series)
-        await ctx.send(f"Cleared results: {series} – {race}")
+        cache.invalidate(series, STANDINGS_VIEWS)
+        await ctx.send(f"Cleared results: {series} – {found[1]} {found[2]}")
     except Exception as e:
         await ctx.send(f"Error: {str(e)}")
 
 # ──────────────────────────────────────────────────────────────────────
-# schedule
+# undo_results – revert a race's last upload / clear from the event log
 # ──────────────────────────────────────────────────────────────────────
 @bot.command()
-async def schedule(ctx, series: str = None):
+@has_admin_role()
+async def undo_results(ctx, series: str, race: str):
     try:
-        embed = discord.Embed(title=f"ASCRL {series or 'All'} Schedule - Season 1", color=discord.Colour.blue())
-        conn = sqlite3.connect('ascrl.db')
-        c = conn.cursor()
-        query = "SELECT track, date, series FROM races WHERE season = 'Season 1'"
-        params = []
-        if series:
-            series = validate_series(series)
-            query += " AND series = ?"
-            params.append(series)
-        c.execute(query, params)
-        races = c.fetchall()
-        conn.close()
-        if not races:
-            await ctx.send("No races found.")
+        series = validate_series(series)
+
+        def work(c):
+            found = find_race(c, series, race)
+            if not found:
+                return None, None
+            race_id, track, date, season = found
+            return found, undo_race_batch(c, series, race_id, season)
+
+        await snapshot_before('undo_results')
+        found, undone = await db.transaction(work)
+        if not found:
+            await ctx.send(f"No race: {race} in {series}.")
             return
-        table = "Track                Date        Series\n"
-        table += "-" * 40 + "\n"
-        for track, date, ser in sorted(races, key=lambda x: x[1]):
-            table += f"{track:<20} {date}  {ser}\n"
-        embed.description = f"```{table}```"
-        embed.set_thumbnail(url=EMOJI_URLS['checkered_flag'])
-        embed.set_footer(text="All races 9:00 PM EST")
-        await ctx.send(embed=embed)
+        if not undone:
+            await ctx.send(f"Nothing to undo for {series} – {found[1]} {found[2]}.")
+            return
+        batch, reverted, skipped = undone
+        cache.invalidate(series)
+        note = f" ({skipped} rows changed since – left alone)" if skipped else ""
+        await ctx.send(f"Undid upload #{batch}: {series} – {found[1]} {found[2]}, {reverted} rows reverted{note}")
     except Exception as e:
         await ctx.send(f"Error: {str(e)}")
 
 # ──────────────────────────────────────────────────────────────────────
-# standings – DEFAULTS TO TRUCK + SAFE DB
+# penalty – points adjustment, recorded in the event log
 # ──────────────────────────────────────────────────────────────────────
 @bot.command()
-async def standings(ctx, series: str = 'Truck'):
-    series = validate_series(series)
-    conn = None
+@has_admin_role()
+async def penalty(ctx, series: str, driver_name: str, points: int, *, reason: str = ''):
+    try:
+        series = validate_series(series)
+        driver_name = driver_name.strip('"\'')
+        driver_name = names.resolve('driver', driver_name, series) or driver_name
+
+        def work(c):
+            c.execute("SELECT driver_id FROM drivers WHERE driver_name = ? AND series = ?", (driver_name, series))
+            row = c.fetchone()
+            if not row:
+                return False
+            log_event(c, next_batch(c), 'penalty', series, CURRENT_SEASON, row[0], points, reason.strip() or None)
+            rebuild_standings(c, series, CURRENT_SEASON)
+            return True
+
+        if not await db.transaction(work):
+            await ctx.send(f"{driver_name} not in {series}.{did_you_mean('driver', driver_name, series)}")
+            return
+        cache.invalidate(series, STANDINGS_VIEWS)
+        await ctx.send(f"{driver_name} ({series}): {points:+d} points" + (f" – {reason.strip()}" if reason.strip() else ""))
+    except Exception as e:
+        await ctx.send(f"Error: {str(e)}")
+
+# ──────────────────────────────────────────────────────────────────────
+# points – scoring rules per series / season (points.py), and re-scoring
+# ──────────────────────────────────────────────────────────────────────
+POINTS_USAGE = ("`!points [series] [season]` · `!points set <series|*> <season|*> rule=value …` · "
+                "`!points reset <series|*> <season|*>` · `!points rescore [series]`\n"
+                f"Rules: {', '.join(points.FIELDS)}\n"
+                "e.g. `!points set Cup Season 2 finish=40,35,34,33` `stages=10,9,8|10,9,8` `drop_worst=2` `playoff_after=none`")
+
+def points_series(series):
+    return series if series == points.ANY else validate_series(series)
+
+@bot.command(name='points')
+@has_admin_role()
+async def points_cmd(ctx, *args):
     try:
-        conn = sqlite3.connect('ascrl.db')
-        c = conn.cursor()
-        c.execute("SELECT driver_name, points, wins, top_5s, top_10s, poles, avg_finish FROM standings WHERE series = ? ORDER BY points DESC, avg_finish ASC NULLS LAST LIMIT 40", (series,))
-        standings = c.fetchall()
-        if not standings:
-            await ctx.send(f"No standings for {series}.")
+        action = args[0].lower() if args else None
+        if action not in ('set', 'reset', 'rescore'):
+            series = validate_series(args[0]) if args else 'Truck'
+            season = points.split_season(args[1:])[0] or CURRENT_SEASON
+            system = await db.read(points.load_system, series, season)
+            await ctx.send(f"**{series} {season} points** (rule: {' / '.join(system.source)})\n"
+                           "```" + "\n".join(system.describe()) + "```")
             return
+        if action == 'rescore':
+            series = validate_series(args[1]) if len(args) > 1 else None
+
+            def work(c):
+                return None, rescore_history(c, series)
+        else:
+            season, rules = points.split_season(args[2:])
+            if not season or (action == 'set') != bool(rules):
+                await ctx.send(POINTS_USAGE)
+                return
+            series = points_series(args[1])
+            if action == 'reset' and (series, season) == (points.ANY, points.ANY):
+                await ctx.send("The league-wide rule can't be removed – change it with `!points set * * …`")
+                return
+            rules = [rule.partition('=') for rule in rules]
+            if any(not sep for _, sep, _ in rules):
+                await ctx.send(POINTS_USAGE)
+                return
+
+            def work(c):
+                if action == 'set':
+                    system = points.load_system(c, series, season)
+                    for field, _, value in rules:
+                        system = points.parse_rule(system, field.strip().lower(), value.strip())
+                    points.save_system(c, series, season, system)
+                else:
+                    c.execute("DELETE FROM points_systems WHERE series = ? AND season = ?", (series, season))
+                return points.load_system(c, series, season), rescore_history(c, None if series == points.ANY else series)
+
+        await snapshot_before('points')
+        system, seasons = await db.transaction(work)
+        for ser in {ser for ser, _ in seasons}:
+            cache.invalidate(ser)
+        report = f"Re-scored {len(seasons)} season(s)."
+        if system is not None:
+            report = (f"**{series} {season} points** (rule: {' / '.join(system.source)})\n"
+                      "```" + "\n".join(system.describe()) + "```" + report)
+        await ctx.send(report)
+    except Exception as e:
+        await ctx.send(f"Error: {str(e)}")
+
+# ──────────────────────────────────────────────────────────────────────
+# standings_at – standings as they stood right after a race was posted
+# ──────────────────────────────────────────────────────────────────────
+@bot.hybrid_command(description="Standings as they stood right after a race")
+async def standings_at(ctx, series: str, race: str):
+    try:
+        series = validate_series(series)
+        race = canonical_race_spec(race, series)
 
-        embed = discord.Embed(title=f"ASCRL {series} Standings - Season 1", color=discord.Colour.gold())
+        def work(c):
+            found = find_race(c, series, race)
+            if not found:
+                return None, []
+            race_id, track, date, season = found
+            event = race_snapshot_event(c, race_id)
+            if event is None:
+                return found, []
+            state, _ = replay_standings(c, series, season, event)
+            c.execute("SELECT driver_id, driver_name FROM drivers WHERE series = ?", (series,))
+            names = dict(c.fetchall())
+            rows = [(names.get(driver_id, f"(removed #{driver_id})"), stats[0], stats[1], average_finish(stats[5], stats[6]))
+                    for driver_id, stats in state.items() if stats[6] or stats[0]]
+            return found, sorted(rows, key=lambda r: (-r[1], r[3] is None, r[3] or 0, r[0]))
+
+        found, rows = await db.read(work)
+        if not found:
+            await ctx.send(f"No race: {race} in {series}.")
+            return
+        if not rows:
+            await ctx.send(f"No results posted for {series} – {found[1]} {found[2]}.")
+            return
+        embed = discord.Embed(title=f"ASCRL {series} Standings after {found[1]} ({found[2]})", color=discord.Colour.gold())
         table = "Pos  Driver               Points  Wins  Avg\n"
         table += "-" * 50 + "\n"
-        for i, (driver, points, wins, top_5s, top_10s, poles, avg_finish) in enumerate(standings, 1):
+        for i, (driver, points, wins, avg_finish) in enumerate(rows[:40], 1):
             avg = f"{avg_finish:.2f}" if avg_finish else 'N/A'
             table += f"{i:<4} {driver:<20} {points:<7} {wins:<5} {avg}\n"
         embed.description = f"```{table}```"
@@ -879,81 +1703,340 @@ async def standings(ctx, series: str = 'Truck'):
         await ctx.send(embed=embed)
     except Exception as e:
         await ctx.send(f"Error: {str(e)}")
+
+# ──────────────────────────────────────────────────────────────────────
+# Paged views – one page per query, the next one fetched on a button press
+# ──────────────────────────────────────────────────────────────────────
+# !results and !schedule answer with ONE message and a discord.ui view
+# instead of a burst of embeds. Each press edits that message in place, so
+# a whole season costs one send plus one edit per page actually looked at.
+PAGE_TIMEOUT = 300          # seconds idle before the controls are disabled
+RESULTS_PER_PAGE = 20
+SCHEDULE_PER_PAGE = 15
+RACE_MENU_SPAN = 12         # races either side of the current one in the picker (menus max out at 25)
+
+class Pager(discord.ui.View):
+    # Subclasses implement render() -> Embed and set their controls' state there
+    def __init__(self, owner_id):
+        super().__init__(timeout=PAGE_TIMEOUT)
+        self.owner_id = owner_id
+        self.message = None
+
+    async def interaction_check(self, interaction):
+        if interaction.user.id == self.owner_id:
+            return True
+        await interaction.response.send_message("Run the command yourself to page through it.", ephemeral=True)
+        return False
+
+    async def start(self, ctx):
+        self.message = await ctx.send(embed=await self.render(), view=self)
+
+    async def show(self, interaction):
+        await interaction.response.edit_message(embed=await self.render(), view=self)
+
+    async def on_timeout(self):
+        for item in self.children:
+            item.disabled = True
+        try:
+            await outbound.edit(self.message, view=self)
+        except discord.HTTPException:
+            pass        # message deleted, or the channel is gone
+
+# ──────────────────────────────────────────────────────────────────────
+# Results pages – keyset over (date, race_id), LIMIT/OFFSET within a race
+# ──────────────────────────────────────────────────────────────────────
+RACES_WITH_RESULTS = ("ra.series = ? AND ra.season = ? "
+                      "AND EXISTS (SELECT 1 FROM results r WHERE r.race_id = ra.race_id)")
+
+def race_neighbours(c, series, season, date, race_id, older, limit):
+    # Races with results just before/after (date, race_id), nearest first
+    op, order = ('<', 'DESC') if older else ('>', 'ASC')
+    c.execute(f"""SELECT race_id, track, date FROM races ra
+                  WHERE {RACES_WITH_RESULTS} AND (ra.date, ra.race_id) {op} (?, ?)
+                  ORDER BY ra.date {order}, ra.race_id {order} LIMIT ?""",
+              (series, season, date, race_id, limit))
+    return c.fetchall()
+
+def results_page(c, series, season, race_id, part):
+    # Everything one results page shows; race_id None (or since deleted) = latest race
+    race = None
+    if race_id is not None:
+        c.execute(f"SELECT race_id, track, date FROM races ra WHERE ra.race_id = ? AND {RACES_WITH_RESULTS}",
+                  (race_id, series, season))
+        race = c.fetchone()
+    if race is None:
+        c.execute(f"""SELECT race_id, track, date FROM races ra WHERE {RACES_WITH_RESULTS}
+                      ORDER BY ra.date DESC, ra.race_id DESC LIMIT 1""", (series, season))
+        race = c.fetchone()
+        part = 0
+    if race is None:
+        return None
+    race_id, track, date = race
+    c.execute("SELECT COUNT(*) FROM results WHERE race_id = ? AND finish_position IS NOT NULL", (race_id,))
+    finishers = c.fetchone()[0]
+    part = min(part, max(finishers - 1, 0) // RESULTS_PER_PAGE)
+    c.execute("""SELECT r.finish_position, d.driver_name, r.pole, r.fastest_lap, r.stages
+                 FROM results r JOIN drivers d ON d.driver_id = r.driver_id
+                 WHERE r.race_id = ? AND r.finish_position IS NOT NULL
+                 ORDER BY r.finish_position, d.driver_name LIMIT ? OFFSET ?""",
+              (race_id, RESULTS_PER_PAGE, part * RESULTS_PER_PAGE))
+    rows = c.fetchall()
+    system = points.load_system(c, series, season)
+    rows = [(finish, driver, pole, fastest_lap, system.race_points(finish, pole, fastest_lap, stages))
+            for finish, driver, pole, fastest_lap, stages in rows]
+    c.execute("""SELECT d.driver_name FROM results r JOIN drivers d ON d.driver_id = r.driver_id
+                 WHERE r.race_id = ? AND r.finish_position = 1""", (race_id,))
+    winner = c.fetchone()
+    return {
+        'race': race, 'part': part, 'finishers': finishers, 'rows': rows,
+        'winner': winner[0] if winner else None,
+        'older': race_neighbours(c, series, season, date, race_id, True, RACE_MENU_SPAN),
+        'newer': race_neighbours(c, series, season, date, race_id, False, RACE_MENU_SPAN),
+    }
+
+class ResultsPager(Pager):
+    def __init__(self, owner_id, series, season, race_id=None):
+        super().__init__(owner_id)
+        self.series, self.season = series, season
+        self.race_id, self.part = race_id, 0
+        self.older_id = self.newer_id = None
+        self.parts = 1
+
+    async def render(self):
+        return self.embed(await db.read(results_page, self.series, self.season, self.race_id, self.part, label='results_page'))
+
+    def embed(self, page):
+        if page is None:
+            # Every result was cleared while the view was open
+            for item in self.children:
+                item.disabled = True
+            return discord.Embed(title=f"{self.series} Results", description=f"No results for {self.series}.",
+                                 color=discord.Colour.green())
+        (self.race_id, track, date), self.part = page['race'], page['part']
+        self.parts = max(1, -(-page['finishers'] // RESULTS_PER_PAGE))
+        self.older_id = page['older'][0][0] if page['older'] else None
+        self.newer_id = page['newer'][0][0] if page['newer'] else None
+        self.older_race.disabled = self.older_id is None
+        self.newer_race.disabled = self.newer_id is None
+        self.prev_part.disabled = self.part == 0
+        self.next_part.disabled = self.part >= self.parts - 1
+        menu = [*reversed(page['older']), page['race'], *page['newer']]
+        self.pick_race.options = [discord.SelectOption(label=t[:100], description=d, value=str(rid), default=rid == self.race_id)
+                                  for rid, t, d in menu]
+
+        embed = discord.Embed(title=f"{self.series} Results - {track} ({date})",
+                              description=self.season + (f" (Part {self.part + 1}/{self.parts})" if self.parts > 1 else ""),
+                              color=discord.Colour.green())
+        embed.add_field(name="Winner", value=page['winner'] or 'N/A', inline=False)
+        text = "\n".join(f"{finish}. **{driver}** ({race_points} pts)" +
+                         (" (Pole)" if pole == 'Yes' else "") + (" (FL)" if fastest_lap == 'FL' else "")
+                         for finish, driver, pole, fastest_lap, race_points in page['rows'])
+        embed.add_field(name=f"Results ({page['finishers']})", value=text or "No data", inline=False)
+        embed.set_thumbnail(url=get_trophy_url(self.series))
+        return embed
+
+    @discord.ui.button(label="◀ Older race", style=discord.ButtonStyle.secondary, row=0)
+    async def older_race(self, interaction, button):
+        self.race_id, self.part = self.older_id, 0
+        await self.show(interaction)
+
+    @discord.ui.button(label="‹", style=discord.ButtonStyle.primary, row=0)
+    async def prev_part(self, interaction, button):
+        self.part -= 1
+        await self.show(interaction)
+
+    @discord.ui.button(label="›", style=discord.ButtonStyle.primary, row=0)
+    async def next_part(self, interaction, button):
+        self.part += 1
+        await self.show(interaction)
+
+    @discord.ui.button(label="Newer race ▶", style=discord.ButtonStyle.secondary, row=0)
+    async def newer_race(self, interaction, button):
+        self.race_id, self.part = self.newer_id, 0
+        await self.show(interaction)
+
+    @discord.ui.select(placeholder="Jump to race…", row=1)
+    async def pick_race(self, interaction, select):
+        self.race_id, self.part = int(select.values[0]), 0
+        await self.show(interaction)
+
+# ──────────────────────────────────────────────────────────────────────
+# Schedule pages – LIMIT/OFFSET on idx_races_series_season_date
+# ──────────────────────────────────────────────────────────────────────
+def schedule_scope(series, season):
+    return ("season = ? AND series = ?", (season, series)) if series else ("season = ?", (season,))
+
+def schedule_start_page(c, series, season, today):
+    # The page holding the next race (the last page once the season is over)
+    where, params = schedule_scope(series, season)
+    c.execute(f"SELECT COUNT(*), COUNT(*) FILTER (WHERE date < ?) FROM races WHERE {where}", (today, *params))
+    total, done = c.fetchone()
+    return min(done, max(total - 1, 0)) // SCHEDULE_PER_PAGE
+
+def schedule_page(c, series, season, page):
+    # (total races, [(track, date, series)]) for one page
+    where, params = schedule_scope(series, season)
+    c.execute(f"SELECT COUNT(*) FROM races WHERE {where}", params)
+    total = c.fetchone()[0]
+    c.execute(f"SELECT track, date, series FROM races WHERE {where} ORDER BY date, race_id LIMIT ? OFFSET ?",
+              (*params, SCHEDULE_PER_PAGE, page * SCHEDULE_PER_PAGE))
+    return total, c.fetchall()
+
+class SchedulePager(Pager):
+    def __init__(self, owner_id, series, season, page):
+        super().__init__(owner_id)
+        self.series, self.season, self.page = series, season, page
+        self.pages = 1
+
+    async def render(self):
+        # Pages are cached under 'schedule', so race edits drop them with the full view
+        key = ('schedule', self.series, self.season, ('page', self.page))
+        total, races = await cache.get_or_build(
+            key, lambda: db.read(schedule_page, self.series, self.season, self.page, label='schedule_page'))
+        self.pages = max(1, -(-total // SCHEDULE_PER_PAGE))
+        if self.page >= self.pages:
+            self.page = self.pages - 1
+            return await self.render()
+        self.first.disabled = self.prev.disabled = self.page == 0
+        self.next.disabled = self.last.disabled = self.page >= self.pages - 1
+
+        embed = discord.Embed(title=f"ASCRL {self.series or 'All'} Schedule - {self.season}", color=discord.Colour.blue())
+        if not races:
+            embed.description = "No races found."
+            return embed
+        today = datetime.now().strftime('%Y-%m-%d')
+        table = "  Track                Date        Series\n"
+        table += "-" * 42 + "\n"
+        for track, date, ser in races:
+            table += f"{'>' if date >= today else ' '} {track:<20} {date}  {ser}\n"
+        embed.description = f"```{table}```"
+        embed.set_thumbnail(url=EMOJI_URLS['checkered_flag'])
+        times = {start_time_label(ser) for ser in ([self.series] if self.series else SUPPORTED_SERIES)}
+        start = (f"All races {times.pop()}" if len(times) == 1
+                 else "Start: " + ", ".join(f"{ser} {start_time_label(ser)}" for ser in SUPPORTED_SERIES))
+        embed.set_footer(text=f"Page {self.page + 1}/{self.pages} · {total} races · {start}")
+        return embed
+
+    @discord.ui.button(label="⏮", style=discord.ButtonStyle.secondary)
+    async def first(self, interaction, button):
+        self.page = 0
+        await self.show(interaction)
+
+    @discord.ui.button(label="◀", style=discord.ButtonStyle.primary)
+    async def prev(self, interaction, button):
+        self.page -= 1
+        await self.show(interaction)
+
+    @discord.ui.button(label="▶", style=discord.ButtonStyle.primary)
+    async def next(self, interaction, button):
+        self.page += 1
+        await self.show(interaction)
+
+    @discord.ui.button(label="⏭", style=discord.ButtonStyle.secondary)
+    async def last(self, interaction, button):
+        self.page = self.pages - 1
+        await self.show(interaction)
+
+# ──────────────────────────────────────────────────────────────────────
+# schedule – paged, opens on the page with the next race
+# ──────────────────────────────────────────────────────────────────────
+@bot.hybrid_command(description="Season schedule, opened on the next race")
+async def schedule(ctx, series: str = None):
+    try:
+        if series:
+            series = validate_series(series)
+        today = datetime.now().strftime('%Y-%m-%d')
+        page = await cache.get_or_build(
+            ('schedule', series, CURRENT_SEASON, ('start', today)),
+            lambda: db.read(schedule_start_page, series, CURRENT_SEASON, today))
+        await SchedulePager(ctx.author.id, series, CURRENT_SEASON, page).start(ctx)
+    except Exception as e:
+        await ctx.send(f"Error: {str(e)}")
+
+# ──────────────────────────────────────────────────────────────────────
+# standings – DEFAULTS TO TRUCK + SAFE DB
+# ──────────────────────────────────────────────────────────────────────
+@bot.hybrid_command(description="Championship standings for a series")
+async def standings(ctx, series: str = 'Truck'):
+    series = validate_series(series)
+    try:
+        async def build():
+            standings = await db.fetchall("""SELECT d.driver_name, s.points, s.wins, s.top_5s, s.top_10s, s.poles, s.avg_finish
+                                             FROM standings s JOIN drivers d ON d.driver_id = s.driver_id
+                                             WHERE s.series = ? AND s.season = ?
+                                             ORDER BY s.points DESC, s.avg_finish ASC NULLS LAST LIMIT 40""", (series, CURRENT_SEASON))
+            if not standings:
+                return f"No standings for {series}.", None
+
+            embed = discord.Embed(title=f"ASCRL {series} Standings - {CURRENT_SEASON}", color=discord.Colour.gold())
+            table = "Pos  Driver               Points  Wins  Avg\n"
+            table += "-" * 50 + "\n"
+            for i, (driver, points, wins, top_5s, top_10s, poles, avg_finish) in enumerate(standings, 1):
+                avg = f"{avg_finish:.2f}" if avg_finish else 'N/A'
+                table += f"{i:<4} {driver:<20} {points:<7} {wins:<5} {avg}\n"
+            embed.description = f"```{table}```"
+            embed.set_thumbnail(url=get_trophy_url(series))
+            return None, embed
+
+        await send_cached(ctx, ('standings', series, CURRENT_SEASON, ()), build)
+    except Exception as e:
+        await ctx.send(f"Error: {str(e)}")
         logging.error(f"Standings error: {str(e)}")
-    finally:
-        if conn:
-            conn.close()
 
 # ──────────────────────────────────────────────────────────────────────
 # driver
 # ──────────────────────────────────────────────────────────────────────
-@bot.command()
+@bot.hybrid_command(description="A driver's season stats")
 async def driver(ctx, driver_name: str, series: str = 'Truck'):
     series = validate_series(series)
+    driver_name = names.resolve('driver', driver_name, series) or driver_name
     try:
-        conn = sqlite3.connect('ascrl.db')
-        c = conn.cursor()
-        c.execute("SELECT points, wins, top_5s, top_10s, poles, avg_finish FROM standings WHERE driver_name = ? AND series = ?", (driver_name, series))
-        profile = c.fetchone()
-        conn.close()
-        if not profile:
-            await ctx.send(f"No profile for {driver_name} in {series}.")
-            return
-        embed = discord.Embed(title=f"{driver_name} - {series}", color=discord.Colour.red())
-        embed.add_field(name="Points", value=profile[0], inline=True)
-        embed.add_field(name="Wins", value=profile[1], inline=True)
-        embed.add_field(name="Top 5s", value=profile[2], inline=True)
-        embed.add_field(name="Top 10s", value=profile[3], inline=True)
-        embed.add_field(name="Poles", value=profile[4], inline=True)
-        embed.add_field(name="Avg Finish", value=f"{profile[5]:.2f}" if profile[5] else 'N/A', inline=True)
-        embed.set_thumbnail(url=get_trophy_url(series))
-        await ctx.send(embed=embed)
+        async def build():
+            profile = await db.fetchone("""SELECT s.points, s.wins, s.top_5s, s.top_10s, s.poles, s.avg_finish
+                                           FROM drivers d JOIN standings s ON s.driver_id = d.driver_id
+                                           WHERE d.driver_name = ? AND d.series = ? AND s.season = ?""",
+                                        (driver_name, series, CURRENT_SEASON))
+            if not profile:
+                return f"No profile for {driver_name} in {series}.{did_you_mean('driver', driver_name, series)}", None
+            embed = discord.Embed(title=f"{driver_name} - {series}", color=discord.Colour.red())
+            embed.add_field(name="Points", value=profile[0], inline=True)
+            embed.add_field(name="Wins", value=profile[1], inline=True)
+            embed.add_field(name="Top 5s", value=profile[2], inline=True)
+            embed.add_field(name="Top 10s", value=profile[3], inline=True)
+            embed.add_field(name="Poles", value=profile[4], inline=True)
+            embed.add_field(name="Avg Finish", value=f"{profile[5]:.2f}" if profile[5] else 'N/A', inline=True)
+            embed.set_thumbnail(url=get_trophy_url(series))
+            return None, embed
+
+        await send_cached(ctx, ('driver', series, CURRENT_SEASON, (driver_name,)), build)
     except Exception as e:
         await ctx.send(f"Error: {str(e)}")
 
 # ──────────────────────────────────────────────────────────────────────
-# results
+# results – paged, opens on the latest race with results
 # ──────────────────────────────────────────────────────────────────────
-@bot.command()
+@bot.hybrid_command(description="Race results, opened on the latest race")
 async def results(ctx, series: str = None, race: str = None):
     try:
         series = validate_series(series or 'Truck')
-        conn = sqlite3.connect('ascrl.db')
-        c = conn.cursor()
-        query = "SELECT driver_name, track, finish_position, pole, fastest_lap FROM results WHERE series = ?"
-        params = [series]
-        if race:
-            query += " AND track = ?"
-            params.append(race.title())
-        c.execute(query, params)
-        results = c.fetchall()
-        conn.close()
-        if not results:
+        race = canonical_race_spec(race, series)
+
+        def first_page(c):
+            # (season, page); page None when there is nothing to show
+            if not race:
+                return CURRENT_SEASON, results_page(c, series, CURRENT_SEASON, None, 0)
+            found = find_race(c, series, race)
+            if not found:
+                return CURRENT_SEASON, None
+            page = results_page(c, series, found[3], found[0], 0)
+            return found[3], page if page and page['race'][0] == found[0] else None
+
+        season, page = await db.read(first_page, label='results_page')
+        if page is None:
             await ctx.send(f"No results for {series}" + (f" at {race}" if race else ""))
             return
-        race_groups = {}
-        for driver, track, finish, pole, fastest_lap in results:
-            if track not in race_groups:
-                race_groups[track] = []
-            if finish is not None:
-                race_groups[track].append({'driver': driver, 'position': finish, 'pole': pole == 'Yes', 'fastest_lap': fastest_lap == 'FL'})
-        for track, track_results in race_groups.items():
-            track_results = sorted(track_results, key=lambda x: x['position'])
-            winner = next((r for r in track_results if r['position'] == 1), None)
-            chunks = [track_results[i:i+25] for i in range(0, len(track_results), 25)]
-            for idx, chunk in enumerate(chunks):
-                embed = discord.Embed(title=f"{series} Results - {track}", description=f"Season 1" + (f" (Part {idx+1})" if len(chunks) > 1 else ""), color=discord.Colour.green())
-                embed.add_field(name="Winner", value=winner['driver'] if winner else 'N/A', inline=False)
-                text = "\n".join(
-                    f"{r['position']}. **{r['driver']}** ({calculate_points(r['position'])} pts)" +
-                    (" (Pole)" if r['pole'] else "") +
-                    (" (FL)" if r['fastest_lap'] else "")
-                    for r in chunk
-                )
-                embed.add_field(name=f"Results ({len(chunk)})", value=text or "No data", inline=False)
-                embed.set_thumbnail(url=get_trophy_url(series))
-                await ctx.send(embed=embed)
-                await asyncio.sleep(1)
+        pager = ResultsPager(ctx.author.id, series, season)
+        pager.message = await ctx.send(embed=pager.embed(page), view=pager)
     except Exception as e:
         await ctx.send(f"Error: {str(e)}")
 
@@ -964,18 +2047,19 @@ async def results(ctx, series: str = None, race: str = None):
 async def reminder(ctx, series: str = None):
     try:
         series = validate_series(series or 'Truck')
-        conn = sqlite3.connect('ascrl.db')
-        c = conn.cursor()
-        c.execute("SELECT track, date FROM races WHERE series = ? AND season = 'Season 1' AND date > ? ORDER BY date ASC LIMIT 1", (series, datetime.now().strftime('%Y-%m-%d')))
-        next_race = c.fetchone()
-        conn.close()
-        if not next_race:
-            await ctx.send(f"No upcoming {series} race.")
-            return
-        track, date = next_race
-        embed = discord.Embed(title=f"Next {series} Race", description=f"**Track**: {track}\n**Date**: {date}\n**Time**: 9:00 PM EST", color=discord.Colour.orange())
-        embed.set_thumbnail(url=EMOJI_URLS['race_car'])
-        await ctx.send(embed=embed)
+        today = datetime.now().strftime('%Y-%m-%d')
+
+        async def build():
+            next_race = await db.fetchone("SELECT track, date FROM races WHERE series = ? AND season = ? AND date > ? ORDER BY date ASC LIMIT 1", (series, CURRENT_SEASON, today))
+            if not next_race:
+                return f"No upcoming {series} race.", None
+            track, date = next_race
+            embed = discord.Embed(title=f"Next {series} Race", description=f"**Track**: {track}\n**Date**: {date}\n**Time**: {start_time_label(series)}", color=discord.Colour.orange())
+            embed.set_thumbnail(url=EMOJI_URLS['race_car'])
+            return None, embed
+
+        # Today's date is part of the key, so the answer rolls over at midnight
+        await send_cached(ctx, ('reminder', series, CURRENT_SEASON, (today,)), build)
     except Exception as e:
         await ctx.send(f"Error: {str(e)}")
 
@@ -985,21 +2069,123 @@ async def reminder(ctx, series: str = None):
 @bot.command()
 async def leaderboard(ctx):
     try:
-        embed = discord.Embed(title="ASCRL Leaderboard - Season 1", color=discord.Colour.gold())
-        conn = sqlite3.connect('ascrl.db')
-        c = conn.cursor()
-        for ser in SUPPORTED_SERIES:
-            c.execute("SELECT driver_name, points, wins FROM standings WHERE series = ? ORDER BY points DESC LIMIT 3", (ser,))
-            standings = c.fetchall()
-            text = "\n".join(f"{i+1}. **{d[0]}** – {d[1]} pts ({d[2]}W)" for i, d in enumerate(standings)) if standings else "No data"
-            embed.add_field(name=f"{ser} Top 3", value=text, inline=False)
-        conn.close()
-        await ctx.send(embed=embed)
+        async def build():
+            embed = discord.Embed(title=f"ASCRL Leaderboard - {CURRENT_SEASON}", color=discord.Colour.gold())
+
+            def top3(c):
+                return [(ser, c.execute("""SELECT d.driver_name, s.points, s.wins FROM standings s JOIN drivers d ON d.driver_id = s.driver_id
+                                           WHERE s.series = ? AND s.season = ? ORDER BY s.points DESC LIMIT 3""",
+                                        (ser, CURRENT_SEASON)).fetchall())
+                        for ser in SUPPORTED_SERIES]
+
+            for ser, standings in await db.read(top3):
+                text = "\n".join(f"{i+1}. **{d[0]}** – {d[1]} pts ({d[2]}W)" for i, d in enumerate(standings)) if standings else "No data"
+                embed.add_field(name=f"{ser} Top 3", value=text, inline=False)
+            return None, embed
+
+        await send_cached(ctx, ('leaderboard', None, CURRENT_SEASON, ()), build)
     except Exception as e:
         await ctx.send(f"Error: {str(e)}")
 
+# ──────────────────────────────────────────────────────────────────────
+# cache_stats – read cache hit/miss counters
+# ──────────────────────────────────────────────────────────────────────
+@bot.command()
+@has_admin_role()
+async def cache_stats(ctx, action: str = None):
+    try:
+        if action and action.lower() == 'clear':
+            dropped = cache.clear()
+            await ctx.send(f"Read cache cleared ({dropped} entries).")
+            return
+        stats = cache.stats()
+        chart_stats = charts.stats()
+        await ctx.send(f"```Entries: {stats['entries']}\nHits: {stats['hits']}\nMisses: {stats['misses']}\n"
+                       f"Hit rate: {stats['hit_rate']:.1%}\nInvalidated: {stats['invalidations']}\n"
+                       f"Charts: {chart_stats['entries']} cached, {chart_stats['hits']} hits, {chart_stats['misses']} renders "
+                       f"on {chart_stats['workers']}```")
+    except Exception as e:
+        await ctx.send(f"Error: {str(e)}")
+
+# ──────────────────────────────────────────────────────────────────────
+# backup – on-demand snapshot, or list the recent ones
+# ──────────────────────────────────────────────────────────────────────
+@bot.command()
+@has_admin_role()
+async def backup(ctx, action: str = None):
+    try:
+        if action and action.lower() == 'list':
+            snapshots = await asyncio.to_thread(backups.list_snapshots)
+            if not snapshots:
+                await ctx.send("No snapshots yet.")
+                return
+            listing = '\n'.join(f"{taken:%Y-%m-%d %H:%M}  {size // 1024:>5} KiB  {label}" for _, taken, label, size in snapshots[:15])
+            await ctx.send(f"```{listing}```Restore: stop the bot, then `python backups.py restore FILE --yes`")
+            return
+        path = await backups.snapshot_async('manual')
+        await ctx.send(f"Snapshot saved: `{os.path.basename(path)}`")
+    except Exception as e:
+        await ctx.send(f"Error: {str(e)}")
+
+# ──────────────────────────────────────────────────────────────────────
+# perf – p50/p95/p99 per command, per DB call and for event-loop lag
+# ──────────────────────────────────────────────────────────────────────
+def perf_table(title, rows, limit):
+    def ms(value):
+        return f"{value * 1000:.1f}" if value is not None else '-'
+    lines = [title, f"{'name':<28} {'n':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"]
+    for name, count, p50, p95, p99, peak in rows[:limit]:
+        lines.append(f"{name[:28]:<28} {count:>6} {ms(p50):>8} {ms(p95):>8} {ms(p99):>8} {ms(peak):>8}")
+    return '\n'.join(lines)
+
+@bot.command()
+@has_admin_role()
+async def perf(ctx, action: str = None):
+    try:
+        if action and action.lower() == 'reset':
+            metrics.registry.reset()
+            await ctx.send("Perf counters reset.")
+            return
+        if action and action.lower() == 'db':
+            rows = sorted(metrics.registry.summary('db'), key=lambda r: -(r[3] or 0))
+            await ctx.send(f"```{perf_table('DB calls by p95 (ms)', rows, 15)}```")
+            return
+        db_share = {name: p50 for name, _, p50, _, _, _ in metrics.registry.summary('command_db')}
+        commands_rows = metrics.registry.summary('command')
+        lag = metrics.registry.summary('loop_lag')
+        text = perf_table('Commands (ms)', commands_rows, 12)
+        if commands_rows:
+            text += "\nDB p50 share: " + ", ".join(f"{name} {db_share.get(name, 0) * 1000:.1f}"
+                                                   for name, *_ in commands_rows[:6])
+        text += "\n\n" + perf_table('Event loop lag (ms)', lag, 1)
+        sent = outbound.stats
+        text += (f"\n\nOutbound: {sent['send_requests']} messages for {sent['send_queued']} sends "
+                 f"({sent['sends_packed']} packed), {sent['edits_coalesced']} edits coalesced, "
+                 f"{sum(v for k, v in sent.items() if k.endswith('_failed'))} failed")
+        waiting = {name: depth for name, depth in outbound.depths().items() if depth}
+        if waiting:
+            text += "\nQueued: " + ", ".join(f"#{name} {depth}" for name, depth in list(waiting.items())[:6])
+        await ctx.send(f"```{text}```Use `!perf db` for DB calls, `!perf reset` to clear.")
+    except Exception as e:
+        await ctx.send(f"Error: {str(e)}")
+
+# ──────────────────────────────────────────────────────────────────────
+# Slash autocomplete – wired once every hybrid command exists
+# ──────────────────────────────────────────────────────────────────────
+for _command in (standings, schedule, driver, results, clear_driver, standings_at):
+    _command.autocomplete('series')(series_autocomplete)
+for _command in (driver, clear_driver):
+    _command.autocomplete('driver_name')(driver_autocomplete)
+for _command in (results, standings_at):
+    _command.autocomplete('race')(race_autocomplete)
+
 # ──────────────────────────────────────────────────────────────────────
 # Run the bot
 # ──────────────────────────────────────────────────────────────────────
 print("Starting ASCRL NASCAR Bot – Cup + Truck + Xfinity + ARCA READY")
-bot.run(BOT_TOKEN)
\ No newline at end of file
+for line in startup_report():
+    print(line)
+    logging.info(line)
+bot.run(BOT_TOKEN, log_handler=None)   # logging is already set up – don't let discord.py add a handler
+charts.close()
+db.close()
\ No newline at end of file
@@ -0,0 +1,163 @@
+# ──────────────────────────────────────────────────────────────────────
+# OUTBOUND – ONE QUEUE PER CHANNEL, PACKED SENDS, COALESCED EDITS
+# ──────────────────────────────────────────────────────────────────────
+# Bot-initiated traffic (reminders, announcements, view expiry edits,
+# guild setup) goes through here instead of calling the API directly.
+#   - every channel (or guild, for setup calls) gets a FIFO and one worker,
+#     so a burst never stacks concurrent requests on the same rate-limit
+#     bucket. Pacing comes from discord.py, which reads the X-RateLimit
+#     headers and waits on each bucket before sending. There are no fixed
+#     sleeps here.
+#   - queued embed-only sends to one channel go out together, up to
+#     MAX_EMBEDS embeds (and EMBED_CHARS characters) per message
+#   - an edit queued for a message that already has one pending is folded
+#     into it. The newest value of each field wins, and it is ONE request.
+# Queue depths are published as gauges and enqueue-to-delivery waits as a
+# histogram (metrics.py), so !perf and the Prometheus dump show backlog.
+import asyncio
+import collections
+import logging
+import time
+
+import metrics
+
+MAX_EMBEDS = 10             # Discord's per-message limit
+EMBED_CHARS = 6000          # total text across a message's embeds
+
+log = logging.getLogger('ascrl.outbound')
+
+class Job:
+    __slots__ = ('kind', 'target', 'fn', 'kwargs', 'futures', 'queued')
+
+    def __init__(self, kind, target, kwargs, fn=None):
+        self.kind = kind            # 'send' | 'edit' | 'call'
+        self.target = target        # channel, message, or None for calls
+        self.fn = fn
+        self.kwargs = kwargs
+        self.futures = [asyncio.get_running_loop().create_future()]
+        self.queued = time.perf_counter()
+
+    def packable(self):
+        # A plain embeds-only send can share a message with its neighbours
+        return self.kind == 'send' and set(self.kwargs) == {'embeds'}
+
+class Outbound:
+    def __init__(self):
+        self._queues = {}       # key -> deque[Job]
+        self._names = {}        # key -> label for metrics
+        self._workers = {}      # key -> Task
+        self._edits = {}        # message id -> pending edit Job
+        self.stats = collections.Counter()
+
+    # ──────────────────────────────────────────────────────────────────
+    # Enqueue – each returns once the request has gone out
+    # ──────────────────────────────────────────────────────────────────
+    async def send(self, channel, content=None, *, embed=None, embeds=None, wait=True, **kwargs):
+        # Same arguments as channel.send(); wait=False queues without waiting for delivery
+        embeds = [embed] if embed is not None else list(embeds or ())
+        if content is not None:
+            kwargs['content'] = content
+        if embeds:
+            kwargs['embeds'] = embeds
+        job = Job('send', channel, kwargs)
+        self._enqueue(channel.id, str(channel), job)
+        return await self._result(job.futures[0], wait)
+
+    async def edit(self, message, *, wait=True, **fields):
+        pending = self._edits.get(message.id)
+        if pending is not None:
+            pending.kwargs.update(fields)
+            future = asyncio.get_running_loop().create_future()
+            pending.futures.append(future)
+            self.stats['edits_coalesced'] += 1
+            return await self._result(future, wait)
+        job = Job('edit', message, fields)
+        self._edits[message.id] = job
+        self._enqueue(message.channel.id, str(message.channel), job)
+        return await self._result(job.futures[0], wait)
+
+    async def call(self, key, fn, *args, label=None, wait=True, **kwargs):
+        # Any other API call, in order with everything else queued under key;
+        # label names the queue in metrics
+        job = Job('call', None, (args, kwargs), fn=fn)
+        self._enqueue(key, label or str(key), job)
+        return await self._result(job.futures[0], wait)
+
+    @staticmethod
+    async def _result(future, wait):
+        if not wait:
+            # Failures are logged by the worker; nobody is waiting to see them
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            return None
+        return await asyncio.shield(future)
+
+    def _enqueue(self, key, name, job):
+        queue = self._queues.setdefault(key, collections.deque())
+        queue.append(job)
+        self._names[key] = name
+        self.stats[f"{job.kind}_queued"] += 1
+        metrics.registry.set_gauge('outbound_queue_depth', name, len(queue))
+        if key not in self._workers:
+            self._workers[key] = asyncio.create_task(self._drain(key), name=f"outbound:{name}")
+
+    # ──────────────────────────────────────────────────────────────────
+    # Worker – one per non-empty queue, exits when it runs dry
+    # ──────────────────────────────────────────────────────────────────
+    async def _drain(self, key):
+        queue, name = self._queues[key], self._names[key]
+        try:
+            while queue:
+                batch = [queue.popleft()]
+                if batch[0].packable():
+                    count, chars = len(batch[0].kwargs['embeds']), sum(map(len, batch[0].kwargs['embeds']))
+                    while queue and queue[0].packable() and queue[0].target.id == batch[0].target.id:
+                        more = queue[0].kwargs['embeds']
+                        if count + len(more) > MAX_EMBEDS or chars + sum(map(len, more)) > EMBED_CHARS:
+                            break
+                        batch.append(queue.popleft())
+                        count, chars = count + len(more), chars + sum(map(len, more))
+                metrics.registry.set_gauge('outbound_queue_depth', name, len(queue))
+                await self._deliver(batch)
+        finally:
+            del self._workers[key]
+            if not queue:
+                del self._queues[key]
+                metrics.registry.set_gauge('outbound_queue_depth', name, 0)
+
+    async def _deliver(self, batch):
+        first = batch[0]
+        if first.kind == 'edit':
+            self._edits.pop(first.target.id, None)     # later edits start a new job
+        futures = [f for job in batch for f in job.futures]
+        try:
+            if first.kind == 'call':
+                args, kwargs = first.kwargs
+                result = await first.fn(*args, **kwargs)
+            elif first.kind == 'edit':
+                result = await first.target.edit(**first.kwargs)
+            elif len(batch) > 1:
+                result = await first.target.send(embeds=[e for job in batch for e in job.kwargs['embeds']])
+                self.stats['sends_packed'] += len(batch) - 1
+            else:
+                result = await first.target.send(**first.kwargs)
+        except Exception as e:
+            self.stats[f"{first.kind}_failed"] += len(batch)
+            log.error(f"outbound {first.kind} failed: {e}", extra={'kind': first.kind, 'jobs': len(batch)})
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self.stats[f"{first.kind}_requests"] += 1
+        now = time.perf_counter()
+        for job in batch:
+            metrics.registry.observe('outbound', job.kind, now - job.queued)
+        for future in futures:
+            if not future.done():
+                future.set_result(result)
+
+    def depths(self):
+        # {queue label: jobs waiting}, deepest first
+        return dict(sorted(((self._names[key], len(q)) for key, q in self._queues.items()), key=lambda kv: -kv[1]))
+
+# Process-wide instance
+outbound = Outbound()
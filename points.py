@@ -0,0 +1,286 @@
+# ──────────────────────────────────────────────────────────────────────
+# POINTS – TABLE-DRIVEN SCORING PER SERIES / SEASON, VECTORIZED RECOMPUTE
+# ──────────────────────────────────────────────────────────────────────
+# Rules live in the points_systems table, one row per (series, season).
+# '*' matches anything, so a lookup takes the first of (series, season),
+# (series, '*'), ('*', season), ('*', '*'). The ('*', '*') row is seeded
+# with the original 40/35/34/37-n table plus +1 pole and +1 fastest lap.
+#   finish             points for P1, P2, ...; any finish past the end gets `beyond`
+#   pole, fastest_lap  bonus points
+#   stages             per stage, points for stage P1, P2, ...
+#   drop_worst         each driver's N lowest race scores are dropped once
+#                      more than N races have run (regular season only)
+#   playoff_after      races in the regular season; NULL = no playoffs
+#   playoff_size       drivers reset into the playoffs
+#   playoff_base       what each playoff driver restarts on
+#   playoff_win_bonus  extra per regular-season win
+# Playoffs need both playoff_after and playoff_size; with either unset
+# there is no reset and every race counts as regular season. A result
+# without a classified finish scores nothing at all.
+# Scoring a whole history is one NumPy pass: every result is looked up
+# in a [system, position] table at once, and the drop and playoff rules
+# run on a [driver-season, race] matrix. NumPy is imported on first use,
+# never at bot startup.
+import json
+
+ANY = '*'
+FIELDS = ('finish', 'beyond', 'pole', 'fastest_lap', 'stages', 'drop_worst',
+          'playoff_after', 'playoff_size', 'playoff_base', 'playoff_win_bonus')
+LIST_FIELDS = ('finish', 'stages')
+
+class PointsSystem:
+    def __init__(self, finish, beyond=0, pole=0, fastest_lap=0, stages=(), drop_worst=0,
+                 playoff_after=None, playoff_size=0, playoff_base=0, playoff_win_bonus=0, source=(ANY, ANY)):
+        self.finish = [int(p) for p in finish]
+        self.beyond = int(beyond)
+        self.pole = int(pole)
+        self.fastest_lap = int(fastest_lap)
+        self.stages = [[int(p) for p in stage] for stage in stages]
+        self.drop_worst = int(drop_worst or 0)
+        self.playoff_after = int(playoff_after) if playoff_after else None
+        self.playoff_size = int(playoff_size or 0)
+        self.playoff_base = int(playoff_base or 0)
+        self.playoff_win_bonus = int(playoff_win_bonus or 0)
+        self.source = source        # the (series, season) row this came from
+
+    @property
+    def playoffs(self):
+        return bool(self.playoff_after and self.playoff_size)
+
+    @property
+    def additive(self):
+        # A result's points never depend on other results – standings can move by deltas
+        return not self.drop_worst and not self.playoffs
+
+    def finish_points(self, finish):
+        if not finish:
+            return 0
+        return self.finish[finish - 1] if finish <= len(self.finish) else self.beyond
+
+    def race_points(self, finish, pole, fastest_lap, stages=None):
+        # Scalar form of score() for one results row – deltas, replay and displays
+        if not finish:
+            return 0
+        points = self.finish_points(finish) + self.pole * (pole == 'Yes') + self.fastest_lap * (fastest_lap == 'FL')
+        for table, position in zip(self.stages, parse_stages(stages)):
+            if 1 <= position <= len(table):
+                points += table[position - 1]
+        return points
+
+    def row(self):
+        return {field: json.dumps(getattr(self, field)) if field in LIST_FIELDS else getattr(self, field) for field in FIELDS}
+
+    def describe(self):
+        finish = ', '.join(map(str, self.finish[:12])) + (', …' if len(self.finish) > 12 else '')
+        lines = [f"Finish: {finish} (P{len(self.finish) + 1}+: {self.beyond})",
+                 f"Pole: +{self.pole}   Fastest lap: +{self.fastest_lap}"]
+        lines += [f"Stage {n}: {', '.join(map(str, table))}" for n, table in enumerate(self.stages, 1)]
+        if self.drop_worst:
+            lines.append(f"Drop worst: {self.drop_worst}")
+        if self.playoffs:
+            lines.append(f"Playoffs: top {self.playoff_size} after race {self.playoff_after} reset to "
+                         f"{self.playoff_base} + {self.playoff_win_bonus}/win")
+        return lines
+
+DEFAULT = PointsSystem(finish=[40, 35, 34] + list(range(33, 0, -1)), beyond=1, pole=1, fastest_lap=1)
+
+def parse_stages(stages):
+    # Stored stage finishes "3/1" -> [3, 1]; blanks and junk count as no finish
+    if not stages:
+        return []
+    return [int(p) if p.strip().isdigit() else 0 for p in str(stages).split('/')]
+
+# ──────────────────────────────────────────────────────────────────────
+# Storage
+# ──────────────────────────────────────────────────────────────────────
+def create_table(c):
+    c.execute(f'''CREATE TABLE IF NOT EXISTS points_systems
+                  (series TEXT NOT NULL, season TEXT NOT NULL,
+                   finish TEXT NOT NULL, beyond INTEGER NOT NULL DEFAULT 0,
+                   pole INTEGER NOT NULL DEFAULT 0, fastest_lap INTEGER NOT NULL DEFAULT 0,
+                   stages TEXT NOT NULL DEFAULT '[]', drop_worst INTEGER NOT NULL DEFAULT 0,
+                   playoff_after INTEGER, playoff_size INTEGER NOT NULL DEFAULT 0,
+                   playoff_base INTEGER NOT NULL DEFAULT 0, playoff_win_bonus INTEGER NOT NULL DEFAULT 0,
+                   PRIMARY KEY (series, season))''')
+    save_system(c, ANY, ANY, DEFAULT, replace=False)
+
+def _from_row(row):
+    values = dict(zip(('series', 'season') + FIELDS, row))
+    source = (values.pop('series'), values.pop('season'))
+    for field in LIST_FIELDS:
+        values[field] = json.loads(values[field])
+    return PointsSystem(**values, source=source)
+
+def load_systems(c):
+    # Every stored row: {(series, season): PointsSystem}
+    c.execute(f"SELECT series, season, {', '.join(FIELDS)} FROM points_systems")
+    return {(row[0], row[1]): _from_row(row) for row in c.fetchall()}
+
+def pick(systems, series, season):
+    for key in ((series, season), (series, ANY), (ANY, season), (ANY, ANY)):
+        if key in systems:
+            return systems[key]
+    return DEFAULT
+
+def load_system(c, series, season):
+    c.execute(f"""SELECT series, season, {', '.join(FIELDS)} FROM points_systems
+                  WHERE series IN (?, '{ANY}') AND season IN (?, '{ANY}')
+                  ORDER BY series = '{ANY}', season = '{ANY}' LIMIT 1""", (series, season))
+    row = c.fetchone()
+    return _from_row(row) if row else DEFAULT
+
+def save_system(c, series, season, system, replace=True):
+    row = system.row()
+    verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+    c.execute(f"""{verb} INTO points_systems (series, season, {', '.join(FIELDS)})
+                  VALUES (:series, :season, {', '.join(':' + f for f in FIELDS)})""",
+              {'series': series, 'season': season, **row})
+
+def split_season(words):
+    # ["Season", "1", "finish=43,35"] -> ("Season 1", ["finish=43,35"]): the season is
+    # every word before the first rule=value, so "Season 1", "*" and "2025" all work
+    count = next((i for i, word in enumerate(words) if '=' in word), len(words))
+    season = ' '.join(words[:count])
+    if season.lower().startswith('season ') and season[7:].strip().isdigit():
+        season = f"Season {int(season[7:])}"
+    return season, list(words[count:])
+
+def parse_rule(system, field, text):
+    # "finish=43,35,34" / "stages=10,9,8|10,9,8" / "playoff_after=26" -> new PointsSystem
+    if field not in FIELDS:
+        raise ValueError(f"Unknown rule {field}. Rules: {', '.join(FIELDS)}")
+    values = {f: getattr(system, f) for f in FIELDS}
+    try:
+        if field == 'finish':
+            values[field] = [int(p) for p in text.split(',') if p.strip()]
+            if not values[field]:
+                raise ValueError("finish needs at least one value")
+        elif field == 'stages':
+            values[field] = [[int(p) for p in stage.split(',') if p.strip()] for stage in text.split('|') if stage.strip()]
+        elif field == 'playoff_after' and text.lower() in ('', 'none', 'off', '0'):
+            values[field] = None
+        else:
+            values[field] = int(text)
+    except ValueError:
+        raise ValueError(f"{field}={text} – use whole numbers (lists comma-separated, stages split by |)") from None
+    return PointsSystem(**values)
+
+# ──────────────────────────────────────────────────────────────────────
+# Vectorized scoring
+# ──────────────────────────────────────────────────────────────────────
+RESULTS_SQL = """SELECT ra.series, ra.season, ra.date, ra.race_id, r.driver_id,
+                        r.finish_position, r.pole, r.fastest_lap, r.stages
+                 FROM races ra JOIN results r ON r.race_id = ra.race_id"""
+
+def load_results(c, series=None, season=None):
+    c.execute(f"{RESULTS_SQL} WHERE (:series IS NULL OR ra.series = :series) AND (:season IS NULL OR ra.season = :season)",
+              {'series': series, 'season': season})
+    return c.fetchall()
+
+def score(rows, systems):
+    # rows: (series, season, date, race_id, driver_id, finish, pole, fastest_lap, stages)
+    # systems: {(series, season): PointsSystem} for every season in rows.
+    # -> (points per row [ndarray], {(series, season): {driver_id: season points}})
+    import numpy as np
+    if not rows:
+        return np.zeros(0, dtype=np.int64), {}
+    seasons = sorted({(row[0], row[1]) for row in rows})
+    season_index = {key: i for i, key in enumerate(seasons)}
+    plan = [systems[key] for key in seasons]
+    n = len(rows)
+
+    g = np.fromiter((season_index[(row[0], row[1])] for row in rows), dtype=np.int64, count=n)
+    finish = np.fromiter((row[5] or 0 for row in rows), dtype=np.int64, count=n)
+    pole = np.fromiter((row[6] == 'Yes' for row in rows), dtype=bool, count=n)
+    fastest = np.fromiter((row[7] == 'FL' for row in rows), dtype=bool, count=n)
+    driver = np.fromiter((row[4] for row in rows), dtype=np.int64, count=n)
+
+    # Finish points: one [season, position] table, one fancy-index for every row
+    width = max(len(s.finish) for s in plan) + 1
+    table = np.zeros((len(plan), width + 1), dtype=np.int64)
+    for i, s in enumerate(plan):
+        table[i, 1:len(s.finish) + 1] = s.finish
+        table[i, len(s.finish) + 1:] = s.beyond
+    classified = finish > 0
+    points = table[g, np.minimum(finish, width)]
+    points += classified * (pole * np.array([s.pole for s in plan])[g] + fastest * np.array([s.fastest_lap for s in plan])[g])
+
+    # Stage points: [season, stage, position] table against a [row, stage] finish matrix
+    stage_count = max(len(s.stages) for s in plan)
+    if stage_count:
+        stage_width = max(len(t) for s in plan for t in s.stages) + 1
+        stage_table = np.zeros((len(plan), stage_count, stage_width), dtype=np.int64)
+        for i, s in enumerate(plan):
+            for k, t in enumerate(s.stages):
+                stage_table[i, k, 1:len(t) + 1] = t
+        entered = np.zeros((n, stage_count), dtype=np.int64)
+        for r, row in enumerate(rows):
+            if row[8]:
+                finishes = parse_stages(row[8])[:stage_count]
+                entered[r, :len(finishes)] = finishes
+        entered = np.where((entered < 0) | (entered >= stage_width), 0, entered)
+        points += classified * stage_table[g[:, None], np.arange(stage_count)[None, :], entered].sum(axis=1)
+
+    # [driver-season, race] matrix – races ordered by date within their season
+    race_keys = np.array([(season_index[(row[0], row[1])], row[2], row[3]) for row in rows],
+                         dtype=[('g', np.int64), ('date', object), ('race', np.int64)])
+    races, race_of = np.unique(race_keys, return_inverse=True)
+    race_season = races['g']
+    first_race = np.searchsorted(race_season, np.arange(len(plan)))
+    held = np.bincount(race_season, minlength=len(plan))
+    column = race_of - first_race[g]
+    pairs, cell_of = np.unique(np.stack([g, driver], axis=1), axis=0, return_inverse=True)
+    cell_of = cell_of.reshape(-1)
+    pair_season = pairs[:, 0]
+    matrix = np.zeros((len(pairs), held.max()), dtype=np.int64)
+    matrix[cell_of, column] = points
+    wins = np.zeros_like(matrix)
+    wins[cell_of, column] = finish == 1
+
+    columns = np.arange(matrix.shape[1])[None, :]
+    regular_len = np.array([min(s.playoff_after, h) if s.playoffs else h for s, h in zip(plan, held)])[pair_season]
+    in_regular = columns < regular_len[:, None]
+    regular = np.where(in_regular, matrix, 0).sum(axis=1)
+
+    # Drop worst N among regular-season races (missed races count as 0)
+    drop = np.array([s.drop_worst for s in plan])[pair_season]
+    drop = np.where(regular_len > drop, drop, 0)
+    if drop.any():
+        lowest = np.sort(np.where(in_regular, matrix, np.iinfo(np.int64).max), axis=1)
+        regular -= np.where(columns < drop[:, None], lowest, 0).sum(axis=1)
+
+    # Playoff reset: top playoff_size by regular-season points (wins break ties) restart together
+    total = regular.copy()
+    size = np.array([s.playoff_size if s.playoffs and h > s.playoff_after else 0 for s, h in zip(plan, held)])[pair_season]
+    if size.any():
+        regular_wins = np.where(in_regular, wins, 0).sum(axis=1)
+        order = np.lexsort((-regular_wins, -regular, pair_season))
+        rank = np.empty(len(pairs), dtype=np.int64)
+        rank[order] = np.arange(len(pairs)) - np.searchsorted(pair_season[order], pair_season[order])
+        reset = np.array([s.playoff_base for s in plan])[pair_season] + \
+            np.array([s.playoff_win_bonus for s in plan])[pair_season] * regular_wins
+        total = np.where(rank < size, reset, regular)
+        total += np.where(in_regular, 0, matrix).sum(axis=1)
+
+    totals = {}
+    for (season_i, driver_id), value in zip(pairs.tolist(), total.tolist()):
+        totals.setdefault(seasons[season_i], {})[driver_id] = value
+    return points, totals
+
+def season_points(c, series, season, rows=None, system=None):
+    # {driver_id: race points} for one season; rows default to the live results
+    rows = load_results(c, series, season) if rows is None else rows
+    system = system or load_system(c, series, season)
+    if system.additive:
+        # Nothing depends on other races – a plain sum, and NumPy stays unloaded
+        totals = {}
+        for row in rows:
+            totals[row[4]] = totals.get(row[4], 0) + system.race_points(*row[5:9])
+        return totals
+    return score(rows, {(series, season): system})[1].get((series, season), {})
+
+def score_history(c, series=None):
+    # Every season (of one series, or all) in one pass: {(series, season): {driver_id: points}}
+    rows = load_results(c, series)
+    systems = load_systems(c)
+    return score(rows, {(r[0], r[1]): pick(systems, r[0], r[1]) for r in rows})[1]
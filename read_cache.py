@@ -0,0 +1,82 @@
+# ──────────────────────────────────────────────────────────────────────
+# READ CACHE – FORMATTED REPLIES FOR READ-ONLY COMMANDS
+# ──────────────────────────────────────────────────────────────────────
+# Keys are (command, series, season, args). series is None for views that
+# span every series (!leaderboard, !schedule with no series). Entries live
+# until a write command invalidates the views it touched. With max_entries
+# set, the least recently used entry is evicted beyond that many – for
+# caches whose keys come from outside (the HTTP API's URL paths).
+import asyncio
+import collections
+
+class ReadCache:
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        self._pending = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    async def get_or_build(self, key, build):
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        if key in self._pending:
+            # Same view already being built – share it instead of querying twice
+            self.hits += 1
+            return await asyncio.shield(self._pending[key])
+        self.misses += 1
+        generation = self._generation
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            value = await build()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        finally:
+            self._pending.pop(key, None)
+        # A write landed while we were building – hand the value out but don't keep it
+        if generation == self._generation:
+            self._entries[key] = value
+            if self.max_entries is not None and len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        future.set_result(value)
+        return value
+
+    def invalidate(self, series=None, commands=None):
+        # Drop views for `series` (plus all-series views); series=None drops every series
+        self._generation += 1
+        stale = [key for key in self._entries
+                 if (commands is None or key[0] in commands)
+                 and (series is None or key[1] is None or key[1] == series)]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self):
+        return self.invalidate()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'invalidations': self.invalidations,
+            'evictions': self.evictions,
+        }
+
+# Process-wide instance shared by every command
+cache = ReadCache()
@@ -0,0 +1,133 @@
+# ──────────────────────────────────────────────────────────────────────
+# RACE REMINDERS – MIN-HEAP OF DEADLINES, SLEEPS UNTIL THE NEXT ONE
+# ──────────────────────────────────────────────────────────────────────
+# Every (race, offset) pair is one heap entry; adding a race that is
+# already queued at the same start pushes nothing new. The heap is built
+# once from the races table and then kept current by add_race/remove_race,
+# so nothing is re-read or re-parsed on a timer. Removed races are dropped lazily: an
+# entry only fires if its race is still scheduled at the same start time.
+# Sent reminders are recorded in the reminders_sent table, so a restart
+# never repeats one.
+import asyncio
+import heapq
+import logging
+from datetime import datetime, timedelta, timezone
+
+import ascrl_db as db
+
+MISSED_GRACE = timedelta(minutes=5)   # still send if we were down right at the deadline
+MAX_SLEEP = 3600                       # re-check the clock at least hourly
+
+def offset_label(offset: timedelta) -> str:
+    minutes = int(offset.total_seconds() // 60)
+    if minutes % 1440 == 0:
+        return f"{minutes // 1440}d" if minutes != 1440 else "24h"
+    if minutes % 60 == 0:
+        return f"{minutes // 60}h"
+    return f"{minutes}m"
+
+class ReminderScheduler:
+    def __init__(self, send, start_time, offsets):
+        # send(series, track, date, season, start, offset) -> awaitable
+        # start_time(series, date) -> aware datetime of the green flag
+        self._send = send
+        self._start_time = start_time
+        self._offsets = sorted(offsets, reverse=True)
+        self._heap = []
+        self._queued = set()  # heap entries minus the deadline, one per (race, offset, start)
+        self._races = {}      # (series, track, date) -> (start, season)
+        self._sent = set()    # (series, track, date, offset label)
+        self._wakeup = asyncio.Event()
+        self.loaded = False
+
+    # ──────────────────────────────────────────────────────────────────
+    # Building / updating the heap
+    # ──────────────────────────────────────────────────────────────────
+    async def load(self):
+        def fetch(c):
+            c.execute("SELECT track, date, series, season FROM races WHERE date != 'N/A'")
+            races = c.fetchall()
+            c.execute("SELECT series, track, date, offset FROM reminders_sent")
+            return races, c.fetchall()
+        races, sent = await db.read(fetch)
+        self._heap.clear()
+        self._queued.clear()
+        self._races.clear()
+        self._sent = set(sent)
+        for track, date, series, season in races:
+            self.add_race(series, track, date, season, wake=False)
+        self.loaded = True
+        self._wakeup.set()
+
+    def add_race(self, series, track, date, season='Season 1', wake=True):
+        try:
+            start = self._start_time(series, date)
+        except ValueError:
+            return
+        key = (series, track, date)
+        self._races[key] = (start, season)
+        now = datetime.now(timezone.utc)
+        for offset in self._offsets:
+            deadline = start - offset
+            entry = (series, track, date, offset_label(offset), start)
+            if deadline + MISSED_GRACE < now or entry in self._queued:
+                continue
+            self._queued.add(entry)
+            heapq.heappush(self._heap, (deadline, *entry))
+        if wake:
+            self._wakeup.set()
+
+    def remove_race(self, series, track, date):
+        # Heap entries are skipped when popped; nothing to sift here
+        self._races.pop((series, track, date), None)
+        self._wakeup.set()
+
+    def upcoming(self, limit=10):
+        live = [e for e in self._heap if self._is_live(e)]
+        return sorted(live)[:limit]
+
+    def _is_live(self, entry):
+        deadline, series, track, date, label, start = entry
+        race = self._races.get((series, track, date))
+        return race is not None and race[0] == start and (series, track, date, label) not in self._sent
+
+    # ──────────────────────────────────────────────────────────────────
+    # Run loop
+    # ──────────────────────────────────────────────────────────────────
+    async def run(self):
+        # Run as a single background task – the bot's task registry ensures one
+        if not self.loaded:
+            await self.load()
+        while True:
+            self._wakeup.clear()
+            now = datetime.now(timezone.utc)
+            due = []
+            while self._heap and self._heap[0][0] <= now:
+                entry = heapq.heappop(self._heap)
+                self._queued.discard(entry[1:])
+                if self._is_live(entry) and now - entry[0] <= MISSED_GRACE:
+                    due.append(entry)
+            # Fired together, so the sender can batch reminders that share a channel
+            await asyncio.gather(*(self._fire(entry) for entry in due))
+            timeout = MAX_SLEEP
+            if self._heap:
+                timeout = min(timeout, max(0.0, (self._heap[0][0] - now).total_seconds()))
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _fire(self, entry):
+        deadline, series, track, date, label, start = entry
+        key = (series, track, date, label)
+        if key in self._sent:
+            return          # already went out – never send a reminder twice
+        self._sent.add(key)
+        try:
+            await self._send(series, track, date, self._races[(series, track, date)][1], start, label)
+        except Exception as e:
+            logging.error(f"Reminder {label} for {series} at {track} failed: {e}")
+            return
+        await db.execute("INSERT OR IGNORE INTO reminders_sent (series, track, date, offset, sent_at) VALUES (?, ?, ?, ?, ?)",
+                         (*key, datetime.now(timezone.utc).isoformat()))
+        logging.info(f"Sent {label} reminder for {series} race at {track}")
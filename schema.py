@@ -0,0 +1,256 @@
+# ──────────────────────────────────────────────────────────────────────
+# SCHEMA – VERSIONED MIGRATIONS FOR ascrl.db, EACH RUNS ONCE
+# ──────────────────────────────────────────────────────────────────────
+# The bot runs init_database on its writer thread at startup; scripts can
+# call it on any plain connection. Each migration and its schema_version
+# row commit together or not at all, so a crash mid-upgrade never leaves
+# a half-built schema behind.
+from datetime import datetime, timezone
+
+import points
+
+# Every step is also safe on a database that predates schema_version, so an
+# old ascrl.db is brought up to date without re-running anything twice.
+def migrate_base_tables(c):
+    c.execute('''CREATE TABLE IF NOT EXISTS drivers
+                 (driver_name TEXT PRIMARY KEY, series TEXT)''')
+    c.execute('''CREATE TABLE IF NOT EXISTS races
+                 (track TEXT, date TEXT, series TEXT, season TEXT, PRIMARY KEY (track, date, series))''')
+    c.execute('''CREATE TABLE IF NOT EXISTS results
+                 (driver_name TEXT, track TEXT, finish_position INTEGER, pole TEXT, fastest_lap TEXT, series TEXT,
+                  FOREIGN KEY (driver_name) REFERENCES drivers(driver_name),
+                  FOREIGN KEY (track, series) REFERENCES races(track, series))''')
+    c.execute('''CREATE TABLE IF NOT EXISTS standings
+                 (driver_name TEXT, series TEXT, points INTEGER, wins INTEGER, top_5s INTEGER,
+                  top_10s INTEGER, poles INTEGER, avg_finish REAL,
+                  FOREIGN KEY (driver_name) REFERENCES drivers(driver_name))''')
+    c.execute('''CREATE TABLE IF NOT EXISTS winners
+                 (date TEXT, track TEXT, winner TEXT, series TEXT,
+                  FOREIGN KEY (track, series) REFERENCES races(track, series))''')
+    c.execute("PRAGMA table_info(results)")
+    cols = [col[1] for col in c.fetchall()]
+    if 'fastest_lap' not in cols:
+        c.execute("ALTER TABLE results ADD COLUMN fastest_lap TEXT")
+
+def migrate_standings_totals(c):
+    # Running finish totals so avg_finish can be updated incrementally
+    c.execute("PRAGMA table_info(standings)")
+    cols = [col[1] for col in c.fetchall()]
+    if 'finish_sum' not in cols:
+        c.execute("ALTER TABLE standings ADD COLUMN finish_sum INTEGER DEFAULT 0")
+    if 'finish_count' not in cols:
+        c.execute("ALTER TABLE standings ADD COLUMN finish_count INTEGER DEFAULT 0")
+        # Backfill the new totals once so deltas start from correct numbers
+        c.execute("""UPDATE standings SET
+                         finish_sum = (SELECT COALESCE(SUM(r.finish_position), 0) FROM results r
+                                       WHERE r.driver_name = standings.driver_name AND r.series = standings.series),
+                         finish_count = (SELECT COUNT(r.finish_position) FROM results r
+                                         WHERE r.driver_name = standings.driver_name AND r.series = standings.series)""")
+
+def migrate_indexes(c):
+    # Indexes for the standings aggregate, per-race lookups, schedules and !standings
+    c.execute("CREATE INDEX IF NOT EXISTS idx_results_series_driver ON results (series, driver_name)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_results_series_track ON results (series, track)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_races_series_season_date ON races (series, season, date)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_standings_series_points ON standings (series, points DESC)")
+
+def migrate_reminder_ledger(c):
+    c.execute('''CREATE TABLE IF NOT EXISTS reminders_sent
+                 (series TEXT, track TEXT, date TEXT, offset TEXT, sent_at TEXT,
+                  PRIMARY KEY (series, track, date, offset))''')
+
+def migrate_bot_meta(c):
+    # Small key/value store – seed fingerprints live here
+    c.execute('''CREATE TABLE IF NOT EXISTS bot_meta
+                 (key TEXT PRIMARY KEY, value TEXT)''')
+
+# The tables migration 6 rebuilds, with a column only their new form has
+ID_TABLES = {'drivers': 'driver_id', 'races': 'race_id', 'results': 'race_id',
+             'standings': 'driver_id', 'winners': 'race_id'}
+
+def has_column(c, table, column):
+    c.execute(f"PRAGMA table_info({table})")
+    return column in [col[1] for col in c.fetchall()]
+
+def legacy_tables(c):
+    c.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    names = {name for name, in c.fetchall()}
+    return {table for table in ID_TABLES if f"legacy_{table}" in names}
+
+def migrate_race_ids(c):
+    # Integer surrogate keys. A driver is a (name, series) roster entry, a race
+    # is (series, season, track, date). results/winners/standings point at ids,
+    # so a second Martinsville or a new season never merges with the first.
+    # A run from before migrations were atomic can have stopped anywhere in
+    # here, so "races has race_id" alone doesn't mean done: leftover legacy_
+    # tables are picked up again. Tables are only renamed if still old-style,
+    # created if missing, and the copy below is idempotent.
+    legacy = legacy_tables(c)
+    if not legacy and has_column(c, 'races', 'race_id'):
+        return
+    for index in ('idx_results_series_driver', 'idx_results_series_track',
+                  'idx_races_series_season_date', 'idx_standings_series_points'):
+        c.execute(f"DROP INDEX IF EXISTS {index}")
+    for table, id_column in ID_TABLES.items():
+        if has_column(c, table, id_column) or not has_column(c, table, 'series'):
+            continue        # already rebuilt, or never existed
+        if table in legacy:
+            raise RuntimeError(f"Both {table} and legacy_{table} hold old-style rows – "
+                               f"an earlier migration was interrupted; merge them by hand")
+        c.execute(f"ALTER TABLE {table} RENAME TO legacy_{table}")
+    legacy = legacy_tables(c)
+    c.execute('''CREATE TABLE IF NOT EXISTS drivers
+                 (driver_id INTEGER PRIMARY KEY, driver_name TEXT NOT NULL, series TEXT NOT NULL,
+                  UNIQUE (driver_name, series))''')
+    c.execute('''CREATE TABLE IF NOT EXISTS races
+                 (race_id INTEGER PRIMARY KEY, series TEXT NOT NULL, season TEXT NOT NULL,
+                  track TEXT NOT NULL, date TEXT NOT NULL,
+                  UNIQUE (series, season, track, date))''')
+    c.execute('''CREATE TABLE IF NOT EXISTS results
+                 (race_id INTEGER NOT NULL REFERENCES races(race_id),
+                  driver_id INTEGER NOT NULL REFERENCES drivers(driver_id),
+                  finish_position INTEGER, pole TEXT, fastest_lap TEXT,
+                  PRIMARY KEY (race_id, driver_id)) WITHOUT ROWID''')
+    c.execute('''CREATE TABLE IF NOT EXISTS standings
+                 (driver_id INTEGER NOT NULL REFERENCES drivers(driver_id), series TEXT NOT NULL, season TEXT NOT NULL,
+                  points INTEGER, wins INTEGER, top_5s INTEGER, top_10s INTEGER, poles INTEGER, avg_finish REAL,
+                  finish_sum INTEGER DEFAULT 0, finish_count INTEGER DEFAULT 0,
+                  PRIMARY KEY (driver_id, season))''')
+    c.execute('''CREATE TABLE IF NOT EXISTS winners
+                 (race_id INTEGER PRIMARY KEY REFERENCES races(race_id),
+                  driver_id INTEGER NOT NULL REFERENCES drivers(driver_id))''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_results_driver ON results (driver_id, race_id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_races_series_season_date ON races (series, season, date)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_standings_series_season_points ON standings (series, season, points DESC)")
+
+    # Drops only start once the copy is complete, so a partial set of legacy_
+    # tables means the copy already ran
+    if len(legacy) == len(ID_TABLES):
+        # Roster, plus anyone who has results in a series they were never assigned to
+        c.execute("INSERT OR IGNORE INTO drivers (driver_name, series) SELECT driver_name, series FROM legacy_drivers")
+        c.execute("INSERT OR IGNORE INTO drivers (driver_name, series) SELECT DISTINCT driver_name, series FROM legacy_results")
+        c.execute("""INSERT OR IGNORE INTO races (series, season, track, date)
+                     SELECT series, COALESCE(season, 'Season 1'), track, COALESCE(date, 'N/A') FROM legacy_races""")
+        # Results for a race that was never scheduled keep a placeholder race
+        c.execute("""INSERT OR IGNORE INTO races (series, season, track, date)
+                     SELECT DISTINCT lr.series, 'Season 1', lr.track, 'N/A' FROM legacy_results lr
+                     WHERE NOT EXISTS (SELECT 1 FROM legacy_races r WHERE r.track = lr.track AND r.series = lr.series)""")
+        # Old rows only knew (track, series) – they belong to that track's first running
+        c.execute("""INSERT OR REPLACE INTO results (race_id, driver_id, finish_position, pole, fastest_lap)
+                     SELECT (SELECT ra.race_id FROM races ra WHERE ra.series = lr.series AND ra.track = lr.track
+                             ORDER BY ra.date LIMIT 1),
+                            d.driver_id, lr.finish_position, lr.pole, lr.fastest_lap
+                     FROM legacy_results lr JOIN drivers d ON d.driver_name = lr.driver_name AND d.series = lr.series""")
+        c.execute("""INSERT OR REPLACE INTO winners (race_id, driver_id)
+                     SELECT race_id, driver_id FROM (
+                         SELECT COALESCE(
+                                    (SELECT ra.race_id FROM races ra
+                                     WHERE ra.series = w.series AND ra.track = w.track AND ra.date = w.date),
+                                    (SELECT ra.race_id FROM races ra
+                                     WHERE ra.series = w.series AND ra.track = w.track ORDER BY ra.date LIMIT 1)) AS race_id,
+                                d.driver_id
+                         FROM legacy_winners w JOIN drivers d ON d.driver_name = w.winner AND d.series = w.series)
+                     WHERE race_id IS NOT NULL""")
+    for table in ID_TABLES:
+        if table in legacy:
+            c.execute(f"DROP TABLE legacy_{table}")
+    # standings is left empty on purpose – startup verification rebuilds it
+
+def migrate_change_log(c):
+    # Per-series change counters kept by triggers, so ANY writer (bot, scripts,
+    # sqlite shell) tells the site watcher which series moved. '*' = unknown series.
+    c.execute('''CREATE TABLE IF NOT EXISTS change_log
+                 (series TEXT PRIMARY KEY, version INTEGER NOT NULL, changed_at TEXT NOT NULL)''')
+    series_of = {
+        'drivers': '{row}.series',
+        'races': '{row}.series',
+        'standings': '{row}.series',
+        'results': '(SELECT series FROM races WHERE race_id = {row}.race_id)',
+        'winners': '(SELECT series FROM races WHERE race_id = {row}.race_id)',
+    }
+    for table, expr in series_of.items():
+        for event, rows in (('INSERT', ('NEW',)), ('UPDATE', ('OLD', 'NEW')), ('DELETE', ('OLD',))):
+            for row in rows:
+                c.execute(f"""CREATE TRIGGER IF NOT EXISTS log_{table}_{event.lower()}_{row.lower()} AFTER {event} ON {table}
+                              BEGIN
+                                  INSERT INTO change_log (series, version, changed_at)
+                                  VALUES (COALESCE({expr.format(row=row)}, '*'), 1, datetime('now'))
+                                  ON CONFLICT (series) DO UPDATE SET version = version + 1, changed_at = excluded.changed_at;
+                              END""")
+
+def migrate_result_events(c):
+    # Append-only history of every results change, plus replay checkpoints.
+    # Today's results become the opening batch (0), so replay starts complete.
+    c.execute('''CREATE TABLE IF NOT EXISTS result_events
+                 (event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  batch_id INTEGER NOT NULL,
+                  kind TEXT NOT NULL CHECK (kind IN ('posted', 'cleared', 'penalty', 'driver_removed')),
+                  series TEXT NOT NULL, season TEXT NOT NULL,
+                  race_id INTEGER, driver_id INTEGER NOT NULL,
+                  finish_position INTEGER, pole TEXT, fastest_lap TEXT,
+                  points INTEGER, reverts INTEGER, note TEXT, created_at TEXT NOT NULL)''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_result_events_season ON result_events (series, season, event_id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_result_events_race ON result_events (race_id, batch_id)")
+    for event in ('UPDATE', 'DELETE'):
+        c.execute(f"""CREATE TRIGGER IF NOT EXISTS result_events_no_{event.lower()} BEFORE {event} ON result_events
+                      BEGIN SELECT RAISE(ABORT, 'result_events is append-only'); END""")
+    c.execute('''CREATE TABLE IF NOT EXISTS standings_checkpoints
+                 (series TEXT, season TEXT, event_id INTEGER, state TEXT NOT NULL, created_at TEXT NOT NULL,
+                  PRIMARY KEY (series, season, event_id))''')
+    c.execute("""INSERT INTO result_events (batch_id, kind, series, season, race_id, driver_id,
+                                            finish_position, pole, fastest_lap, note, created_at)
+                 SELECT 0, 'posted', ra.series, ra.season, r.race_id, r.driver_id,
+                        r.finish_position, r.pole, r.fastest_lap, 'baseline', datetime('now')
+                 FROM results r JOIN races ra ON ra.race_id = r.race_id
+                 ORDER BY ra.date, r.race_id, r.finish_position""")
+
+def migrate_points_systems(c):
+    # Scoring rules move into the database (points.py). Stage finishes are
+    # stored per result as "3/1" (stage 1 P3, stage 2 P1); NULL = none.
+    points.create_table(c)
+    c.execute("ALTER TABLE results ADD COLUMN stages TEXT")
+    c.execute("ALTER TABLE result_events ADD COLUMN stages TEXT")
+
+# APPEND ONLY – never renumber or edit a shipped migration
+SCHEMA_MIGRATIONS = [
+    (1, migrate_base_tables),
+    (2, migrate_standings_totals),
+    (3, migrate_indexes),
+    (4, migrate_reminder_ledger),
+    (5, migrate_bot_meta),
+    (6, migrate_race_ids),
+    (7, migrate_change_log),
+    (8, migrate_result_events),
+    (9, migrate_points_systems),
+]
+
+def init_database(c):
+    conn = c.connection
+    c.execute('''CREATE TABLE IF NOT EXISTS schema_version
+                 (version INTEGER PRIMARY KEY, applied_at TEXT)''')
+    c.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+    current = c.fetchone()[0]
+    conn.commit()
+    applied = []
+    # Legacy sqlite3 transaction handling never BEGINs before DDL, so each
+    # migration would autocommit statement by statement. Take manual control:
+    # one BEGIN IMMEDIATE ... COMMIT per migration plus its version row.
+    isolation_level = conn.isolation_level
+    conn.isolation_level = None
+    try:
+        for version, migrate in SCHEMA_MIGRATIONS:
+            if version <= current:
+                continue
+            c.execute("BEGIN IMMEDIATE")
+            try:
+                migrate(c)
+                c.execute("INSERT INTO schema_version (version, applied_at) VALUES (?, ?)",
+                          (version, datetime.now(timezone.utc).isoformat()))
+            except BaseException:
+                c.execute("ROLLBACK")
+                raise
+            c.execute("COMMIT")
+            applied.append(version)
+    finally:
+        conn.isolation_level = isolation_level
+    return applied
@@ -0,0 +1,251 @@
+# ──────────────────────────────────────────────────────────────────────
+# SITE RENDER – TEMPLATES SHARED BY generate.py AND sync_site.py
+# ──────────────────────────────────────────────────────────────────────
+# One Jinja Environment per process: each template is compiled on first
+# use and reused after that. Output is streamed chunk by chunk into any
+# text stream (a file, sys.stdout, io.StringIO). Query rows can be passed
+# as lazy cursors, so a large table is never held as one string or list.
+import hashlib
+import json
+import os
+import re
+
+from jinja2 import DictLoader, Environment
+
+STREAM_BUFFER = 64      # template chunks per write() call
+
+# ──────────────────────────────────────────────────────────────────────
+# TEMPLATES – compiled once, shared by every page of both generators
+# ──────────────────────────────────────────────────────────────────────
+TEMPLATES = {
+    'base.html': """<!DOCTYPE html>
+<html>
+<head>
+  <title>{% block title %}ASCRL - Live{% endblock %}</title>
+  <meta name="viewport" content="width=device-width, initial-scale=1">
+  <style>
+    body { font-family: Arial; background: #000; color: #fff; margin: 0; }
+    .container { max-width: 1000px; margin: 0 auto; padding: 20px; }
+    h1 { color: #FFD700; text-align: center; }
+    a { color: #FFD700; }
+    table { width: 100%; border-collapse: collapse; margin: 20px 0; background: #111; }
+    th { background: #BC6C25; padding: 10px; color: #fff; }
+    td { padding: 8px; border-bottom: 1px solid #444; text-align: center; }
+    tr:hover { background: #222; }
+    .series { margin: 40px 0; }
+    .refresh { text-align: center; color: #0f0; font-size: 0.9em; }
+    .crumbs { font-size: 0.9em; }
+  </style>
+</head>
+<body>
+  <div class="container">
+    <p class="crumbs"><a href="{{ root }}index.html">ASCRL</a>{% block crumbs %}{% endblock %}</p>
+    {% block body %}{% endblock %}
+    <p class="refresh">Updated: {{ now }}</p>
+  </div>
+</body>
+</html>
+""",
+    'standings_table.html': """<table>
+  <tr><th>Pos</th><th>Driver</th><th>Pts</th><th>Wins</th><th>T5</th><th>T10</th><th>Poles</th><th>Avg</th></tr>
+  {% for row in standings %}
+  <tr><td>{{ loop.index }}</td><td><a href="{{ root }}{{ row.driver_href }}">{{ row.driver }}</a></td><td>{{ row.points }}</td><td>{{ row.wins }}</td>
+      <td>{{ row.top_5s }}</td><td>{{ row.top_10s }}</td><td>{{ row.poles }}</td><td>{{ row.avg_finish|avg }}</td></tr>
+  {% endfor %}
+</table>
+""",
+    'index.html': """{% extends 'base.html' %}
+{% block body %}
+    <h1>ASCRL LIVE</h1>
+    {% for s in series %}
+    <div class="series">
+      <h2><a href="{{ root }}{{ s.href }}">{{ s.name|upper }} SERIES</a> – {{ season }}</h2>
+      {% if s.next_race %}<p>Next race: <a href="{{ root }}{{ s.next_race.href }}">{{ s.next_race.track }}</a> ({{ s.next_race.date }})</p>{% endif %}
+      {% if s.standings %}{% with standings = s.standings %}{% include 'standings_table.html' %}{% endwith %}
+      {% else %}<p>No standings yet.</p>{% endif %}
+    </div>
+    {% endfor %}
+{% endblock %}
+""",
+    'season.html': """{% extends 'base.html' %}
+{% block title %}ASCRL {{ series }} – {{ season }}{% endblock %}
+{% block crumbs %} › {{ series }} › {{ season }}{% if other_seasons %} (also: {% for s in other_seasons %}<a href="{{ root }}{{ s.href }}">{{ s.name }}</a>{% if not loop.last %}, {% endif %}{% endfor %}){% endif %}{% endblock %}
+{% block body %}
+    <h1>{{ series|upper }} SERIES – {{ season }}</h1>
+    <div class="series">
+      <h2>STANDINGS</h2>
+      {% if standings %}{% include 'standings_table.html' %}{% else %}<p>No standings yet.</p>{% endif %}
+    </div>
+    <div class="series">
+      <h2>SCHEDULE</h2>
+      <table>
+        <tr><th>Track</th><th>Date</th><th>Winner</th></tr>
+        {% for race in races %}
+        <tr><td><a href="{{ root }}{{ race.href }}">{{ race.track }}</a></td><td>{{ race.date }}</td>
+            <td>{% if race.winner %}<a href="{{ root }}{{ race.winner_href }}">{{ race.winner }}</a>{% else %}TBD{% endif %}</td></tr>
+        {% endfor %}
+      </table>
+    </div>
+{% endblock %}
+""",
+    'race.html': """{% extends 'base.html' %}
+{% block title %}ASCRL {{ series }} – {{ race.track }} {{ race.date }}{% endblock %}
+{% block crumbs %} › <a href="{{ root }}{{ season_href }}">{{ series }} {{ race.season }}</a> › {{ race.track }}{% endblock %}
+{% block body %}
+    <h1>{{ series|upper }} – {{ race.track }}</h1>
+    <p style="text-align:center">{{ race.date }} · {{ race.season }}</p>
+    {% if results %}
+    <table>
+      <tr><th>Pos</th><th>Driver</th><th>Pole</th><th>FL</th></tr>
+      {% for r in results %}
+      <tr><td>{{ r.finish|default('DNS', true) }}</td><td><a href="{{ root }}{{ r.driver_href }}">{{ r.driver }}</a></td>
+          <td>{{ 'Yes' if r.pole else '' }}</td><td>{{ 'FL' if r.fastest_lap else '' }}</td></tr>
+      {% endfor %}
+    </table>
+    {% else %}<p>No results yet.</p>{% endif %}
+{% endblock %}
+""",
+    'driver.html': """{% extends 'base.html' %}
+{% block title %}ASCRL {{ series }} – {{ driver }}{% endblock %}
+{% block crumbs %} › <a href="{{ root }}{{ series_href }}">{{ series }}</a> › {{ driver }}{% endblock %}
+{% block body %}
+    <h1>{{ driver }}</h1>
+    <div class="series">
+      <h2>{{ series|upper }} SEASONS</h2>
+      <table>
+        <tr><th>Season</th><th>Pts</th><th>Wins</th><th>T5</th><th>T10</th><th>Poles</th><th>Avg</th></tr>
+        {% for s in seasons %}
+        <tr><td>{{ s.season }}</td><td>{{ s.points }}</td><td>{{ s.wins }}</td><td>{{ s.top_5s }}</td>
+            <td>{{ s.top_10s }}</td><td>{{ s.poles }}</td><td>{{ s.avg_finish|avg }}</td></tr>
+        {% endfor %}
+      </table>
+    </div>
+    <div class="series">
+      <h2>RESULTS</h2>
+      <table>
+        <tr><th>Season</th><th>Date</th><th>Track</th><th>Finish</th></tr>
+        {% for r in results %}
+        <tr><td>{{ r.season }}</td><td>{{ r.date }}</td><td><a href="{{ root }}{{ r.href }}">{{ r.track }}</a></td>
+            <td>{{ r.finish|default('DNS', true) }}{{ ' (Pole)' if r.pole else '' }}{{ ' (FL)' if r.fastest_lap else '' }}</td></tr>
+        {% endfor %}
+      </table>
+    </div>
+{% endblock %}
+""",
+    # ── WordPress embed: standings + schedule for every series/season ──
+    'wp_styles.html': """<style>
+.nascar-table, .nascar-schedule {
+  width: 100%;
+  border-collapse: collapse;
+  font-family: Arial, sans-serif;
+  background: #000;
+  color: #fff;
+  margin: 20px 0;
+}
+.nascar-table th, .nascar-schedule th {
+  background: #BC6C25;
+  padding: 12px;
+  text-align: left;
+  font-weight: bold;
+}
+.nascar-table td, .nascar-schedule td {
+  padding: 10px;
+  border-bottom: 1px solid #333;
+}
+.nascar-table tr:nth-child(even), .nascar-schedule tr:nth-child(even) {
+  background: #111;
+}
+.nascar-table tr:hover {
+  background: #222;
+}
+</style>
+""",
+    'wp_section.html': """<h2 style="text-align:center; color:#BC6C25;">ASCRL {{ section.series }} Series Standings - {{ section.season }}</h2>
+<table class="nascar-table">
+  <thead>
+    <tr><th>Pos</th><th>Driver</th><th>Points</th><th>Wins</th><th>Avg Finish</th></tr>
+  </thead>
+  <tbody>
+{% for driver, points, wins, avg_finish in section.standings %}
+    <tr><td>{{ loop.index }}</td><td>{{ driver }}</td><td>{{ points }}</td><td>{{ wins }}</td><td>{{ avg_finish|avg }}</td></tr>
+{% endfor %}
+  </tbody>
+</table>
+<h2 style="text-align:center; color:#BC6C25;">ASCRL {{ section.series }} Series Schedule - {{ section.season }}</h2>
+<table class="nascar-schedule">
+  <thead>
+    <tr><th>Track</th><th>Date</th><th>Winner</th></tr>
+  </thead>
+  <tbody>
+{% for track, date, winner in section.schedule %}
+    <tr><td>{{ track }}</td><td>{{ date }}</td><td>{{ winner or 'TBD' }}</td></tr>
+{% endfor %}
+  </tbody>
+</table>
+""",
+    'wp_page.html': """{% if not fragment %}<!DOCTYPE html>
+<html>
+<head>
+  <meta charset="utf-8">
+  <title>ASCRL Standings &amp; Schedule</title>
+</head>
+<body>
+{% endif %}
+{% include 'wp_styles.html' %}
+{% for section in sections %}
+{% include 'wp_section.html' %}
+{% endfor %}
+{% if not fragment %}
+</body>
+</html>
+{% endif %}
+""",
+}
+
+env = Environment(loader=DictLoader(TEMPLATES), autoescape=True, trim_blocks=True, lstrip_blocks=True)
+env.filters['avg'] = lambda value: f"{value:.2f}" if value else 'N/A'
+# Editing a template changes this, which forces every page to rebuild
+TEMPLATE_VERSION = hashlib.sha256(json.dumps(TEMPLATES, sort_keys=True).encode()).hexdigest()[:16]
+
+# ──────────────────────────────────────────────────────────────────────
+# Output
+# ──────────────────────────────────────────────────────────────────────
+def slug(text) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', str(text).lower()).strip('-')
+
+def stream(template, out, **context):
+    # Render straight into `out` – nothing is concatenated in memory
+    chunks = env.get_template(template).stream(**context)
+    chunks.enable_buffering(STREAM_BUFFER)
+    chunks.dump(out)
+
+def write_atomic(path, template, **context):
+    # Readers see the old file or the new one, never half of either
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = f"{path}.tmp{os.getpid()}"
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            stream(template, f, **context)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+def write_bytes_atomic(path, data: bytes):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def write_text_atomic(path, text):
+    write_bytes_atomic(path, text.encode('utf-8'))
+
+def rows(conn, sql, params=()):
+    # Lazy: the query runs when the template first iterates, one row at a time
+    cursor = conn.execute(sql, params)
+    try:
+        yield from cursor
+    finally:
+        cursor.close()
@@ -1,113 +1,58 @@
-import sqlite3
-from datetime import datetime
+# sync_site.py – WORDPRESS SYNC: STANDINGS + SCHEDULE, EVERY SERIES & SEASON
+# ──────────────────────────────────────────────────────────────────────
+# One connection and one pass through the shared templates in
+# site_render.py. Rows stream from the cursors straight into the output.
+#   python sync_site.py                   full HTML page on stdout
+#   python sync_site.py --fragment        just the embeddable block, for WordPress
+#   python sync_site.py --out sync.html   write to a file instead (atomic)
+#   python sync_site.py Cup Truck         limit to some series
+import sys
 
-def generate_standings_html():
-    conn = sqlite3.connect('ascrl.db')
-    c = conn.cursor()
-    c.execute("SELECT driver_name, points, wins, avg_finish FROM standings WHERE series = 'Cup' ORDER BY points DESC")
-    data = c.fetchall()
-    html = """
-<style>
-.nascar-table {
-  width: 100%;
-  border-collapse: collapse;
-  font-family: Arial, sans-serif;
-  background: #000;
-  color: #fff;
-  margin: 20px 0;
-}
-.nascar-table th {
-  background: #BC6C25;
-  padding: 12px;
-  text-align: left;
-  font-weight: bold;
-}
-.nascar-table td {
-  padding: 10px;
-  border-bottom: 1px solid #333;
-}
-.nascar-table tr:nth-child(even) {
-  background: #111;
-}
-.nascar-table tr:hover {
-  background: #222;
-}
-</style>
-<h2 style="text-align:center; color:#BC6C25;">ASCRL Cup Series Standings - Season 1</h2>
-<table class="nascar-table">
-  <thead>
-    <tr>
-      <th>Pos</th>
-      <th>Driver</th>
-      <th>Points</th>
-      <th>Wins</th>
-      <th>Avg Finish</th>
-    </tr>
-  </thead>
-  <tbody>
-"""
-    for i, row in enumerate(data, 1):
-        avg = row[3] or 'N/A'
-        html += f"<tr><td>{i}</td><td>{row[0]}</td><td>{row[1]}</td><td>{row[2]}</td><td>{avg}</td></tr>"
-    html += """
-  </tbody>
-</table>
-"""
-    conn.close()
-    return html
+import ascrl_db
+from league import SUPPORTED_SERIES, validate_series
+from site_render import rows, stream, write_atomic
 
-def generate_schedule_html():
-    conn = sqlite3.connect('ascrl.db')
-    c = conn.cursor()
-    c.execute("SELECT track, date FROM races WHERE series = 'Cup' ORDER BY date")
-    data = c.fetchall()
-    html = """
-<style>
-.nascar-schedule {
-  width: 100%;
-  border-collapse: collapse;
-  font-family: Arial, sans-serif;
-  background: #000;
-  color: #fff;
-  margin: 20px 0;
-}
-.nascar-schedule th {
-  background: #BC6C25;
-  padding: 12px;
-  text-align: left;
-  font-weight: bold;
-}
-.nascar-schedule td {
-  padding: 10px;
-  border-bottom: 1px solid #333;
-}
-.nascar-schedule tr:nth-child(even) {
-  background: #111;
-}
-</style>
-<h2 style="text-align:center; color:#BC6C25;">ASCRL Cup Series Schedule - Season 1</h2>
-<table class="nascar-schedule">
-  <thead>
-    <tr>
-      <th>Track</th>
-      <th>Date</th>
-    </tr>
-  </thead>
-  <tbody>
-"""
-    for track, date in data:
-        html += f"<tr><td>{track}</td><td>{date}</td></tr>"
-    html += """
-  </tbody>
-</table>
-"""
-    conn.close()
-    return html
+DB = 'ascrl.db'
 
-# Run sync
-print("=== ASCRL SITE SYNC (October 30, 2025) ===")
-print("\n1. STANDINGS HTML:")
-print(generate_standings_html())
-print("\n2. SCHEDULE HTML:")
-print(generate_schedule_html())
-print("\n3. Paste to WordPress and update pages.")
\ No newline at end of file
+STANDINGS_SQL = """SELECT d.driver_name, s.points, s.wins, s.avg_finish
+                   FROM standings s JOIN drivers d ON d.driver_id = s.driver_id
+                   WHERE s.series = ? AND s.season = ?
+                   ORDER BY s.points DESC, s.avg_finish ASC NULLS LAST, d.driver_name"""
+SCHEDULE_SQL = """SELECT ra.track, ra.date, d.driver_name
+                  FROM races ra
+                  LEFT JOIN winners w ON w.race_id = ra.race_id
+                  LEFT JOIN drivers d ON d.driver_id = w.driver_id
+                  WHERE ra.series = ? AND ra.season = ?
+                  ORDER BY ra.date, ra.race_id"""
+
+def sections(conn, series=None):
+    # Every (series, season) with races or standings, series in league order
+    wanted = series or SUPPORTED_SERIES
+    found = conn.execute("SELECT series, season FROM races UNION SELECT series, season FROM standings").fetchall()
+    for name in wanted:
+        for season in sorted(season for ser, season in found if ser == name):
+            yield {'series': name, 'season': season,
+                   'standings': rows(conn, STANDINGS_SQL, (name, season)),
+                   'schedule': rows(conn, SCHEDULE_SQL, (name, season))}
+
+def render_wordpress(conn, out, series=None, fragment=False):
+    # out: any text stream – a file, sys.stdout or io.StringIO
+    stream('wp_page.html', out, sections=sections(conn, series), fragment=fragment)
+
+def main(argv):
+    fragment = '--fragment' in argv
+    out_path = argv[argv.index('--out') + 1] if '--out' in argv else None
+    series = [validate_series(arg) for arg in argv
+              if not arg.startswith('--') and arg != out_path] or None
+    conn = ascrl_db.connect(DB)
+    try:
+        if out_path:
+            write_atomic(out_path, 'wp_page.html', sections=sections(conn, series), fragment=fragment)
+            print(f"Wrote {out_path} – paste to WordPress and update pages.")
+        else:
+            render_wordpress(conn, sys.stdout, series, fragment)
+    finally:
+        conn.close()
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
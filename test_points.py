@@ -0,0 +1,77 @@
+# Vectorized rescore (points.score) against the per-result sums the
+# incremental standings deltas apply – they must agree for every additive system.
+import sqlite3
+
+import pytest
+
+import points
+
+RACES = [(1, '2025-01-05'), (2, '2025-01-12'), (3, '2025-01-19'), (4, '2025-01-26')]
+FINISHES = {            # race -> [(driver, finish, pole, fastest_lap, stages)]
+    1: [(10, 1, 'Yes', '', '2/1'), (11, 2, '', 'FL', '1/3'), (12, 3, '', '', None)],
+    2: [(11, 1, '', '', '1/1'), (12, 2, 'Yes', 'FL', None), (10, 5, '', '', '4/2')],
+    3: [(12, 1, '', '', None), (10, 2, '', 'FL', None)],
+    4: [(10, 1, 'Yes', '', '1/1'), (11, 3, '', '', None), (12, 40, '', '', None)],
+}
+
+@pytest.fixture
+def c():
+    conn = sqlite3.connect(':memory:')
+    cur = conn.cursor()
+    cur.execute("CREATE TABLE races (race_id INTEGER PRIMARY KEY, series TEXT, season TEXT, date TEXT)")
+    cur.execute("CREATE TABLE results (race_id INTEGER, driver_id INTEGER, finish_position INTEGER, "
+                "pole TEXT, fastest_lap TEXT, stages TEXT)")
+    cur.executemany("INSERT INTO races VALUES (?, 'Truck', 'Season 1', ?)", RACES)
+    cur.executemany("INSERT INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                    [(race, *row) for race, rows in FINISHES.items() for row in rows])
+    points.create_table(cur)
+    yield cur
+    conn.close()
+
+def delta_totals(system):
+    # What apply_standings_delta adds up, one result at a time
+    totals = {}
+    for rows in FINISHES.values():
+        for driver, *result in rows:
+            totals[driver] = totals.get(driver, 0) + system.race_points(*result)
+    return totals
+
+@pytest.mark.parametrize('rules', [
+    {},
+    {'stages': [[10, 9, 8], [10, 9, 8]]},
+    {'playoff_after': 2},                           # no playoff_size – no reset, every race counts
+    {'playoff_size': 2},                            # no playoff_after – same
+])
+def test_rescore_matches_delta_for_additive_systems(c, rules):
+    system = points.PointsSystem(**{**{f: getattr(points.DEFAULT, f) for f in points.FIELDS}, **rules})
+    assert system.additive
+    points.save_system(c, 'Truck', 'Season 1', system)
+    expected = delta_totals(system)
+    assert points.score_history(c)[('Truck', 'Season 1')] == expected
+    assert points.season_points(c, 'Truck', 'Season 1') == expected
+
+def test_playoff_reset(c):
+    system = points.PointsSystem(finish=[10, 8, 6], playoff_after=2, playoff_size=2,
+                                 playoff_base=100, playoff_win_bonus=5)
+    assert not system.additive
+    points.save_system(c, 'Truck', 'Season 1', system)
+    # After two races: 10 -> 10 + 0 (P5) = 10, 11 -> 8 + 10 = 18, 12 -> 6 + 8 = 14.
+    # Top two (11, 12) restart on 100 + 5/win; 10 keeps 10. Races 3 and 4 then add on.
+    assert points.score_history(c)[('Truck', 'Season 1')] == {10: 10 + 8 + 10, 11: 105 + 6, 12: 100 + 10 + 0}
+
+def test_drop_worst(c):
+    system = points.PointsSystem(finish=[10, 8, 6], drop_worst=1)
+    points.save_system(c, 'Truck', 'Season 1', system)
+    # Each driver's 0 is dropped: 10's P5, 11's missed race 3, 12's P40
+    assert points.score_history(c)[('Truck', 'Season 1')] == {10: 10 + 8 + 10, 11: 8 + 10 + 6, 12: 6 + 8 + 10}
+
+@pytest.mark.parametrize('words, expected', [
+    (['Season', '1', 'finish=43,35', 'pole=1'], ('Season 1', ['finish=43,35', 'pole=1'])),
+    (['season', '2', 'drop_worst=2'], ('Season 2', ['drop_worst=2'])),
+    (['Season 1', 'pole=1'], ('Season 1', ['pole=1'])),       # quoted – one word
+    (['*', 'finish=10'], ('*', ['finish=10'])),
+    (['Season', '1'], ('Season 1', [])),                       # reset
+    (['finish=10'], ('', ['finish=10'])),                      # season missing
+])
+def test_split_season(words, expected):
+    assert points.split_season(words) == expected
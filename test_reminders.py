@@ -0,0 +1,37 @@
+# ReminderScheduler keeps one heap entry per (race, offset, start) and never
+# sends the same reminder twice.
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from reminders import ReminderScheduler
+
+OFFSETS = [timedelta(hours=24), timedelta(hours=1)]
+START = datetime.now(timezone.utc) + timedelta(days=3)
+
+def scheduler(sent):
+    async def send(*args):
+        sent.append(args)
+    return ReminderScheduler(send, lambda series, date: START, OFFSETS)
+
+def test_add_race_twice_queues_each_reminder_once():
+    s = scheduler([])
+    s.add_race('Truck', 'Daytona', '2025-01-05', wake=False)
+    s.add_race('Truck', 'Daytona', '2025-01-05', wake=False)
+    assert len(s._heap) == len(OFFSETS)
+    assert len(s.upcoming()) == len(OFFSETS)
+
+def test_re_added_race_after_removal_is_not_duplicated():
+    s = scheduler([])
+    s.add_race('Truck', 'Daytona', '2025-01-05', wake=False)
+    s.remove_race('Truck', 'Daytona', '2025-01-05')
+    s.add_race('Truck', 'Daytona', '2025-01-05', wake=False)
+    assert len(s._heap) == len(OFFSETS)
+
+def test_fire_skips_a_reminder_already_sent():
+    sent = []
+    s = scheduler(sent)
+    s.add_race('Truck', 'Daytona', '2025-01-05', wake=False)
+    entry = s._heap[0]
+    s._sent.add(entry[1:5])
+    asyncio.run(s._fire(entry))
+    assert sent == []
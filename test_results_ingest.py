@@ -0,0 +1,77 @@
+# Results admin paths: ingest_results merges a re-post unless it says `replace`,
+# and verify_standings_cmd reports drift whatever it knows the driver by.
+import asyncio
+import sqlite3
+
+import pytest
+from discord.ext import commands
+
+import schema
+
+RACE = 'Daytona@2025-01-05'
+
+@pytest.fixture(scope='module')
+def bot(tmp_path_factory):
+    # The bot module logs in at import; run it in a scratch dir without connecting
+    with pytest.MonkeyPatch.context() as m:
+        m.chdir(tmp_path_factory.mktemp('bot'))
+        m.setenv('BOT_TOKEN', 'test')
+        m.setattr(commands.Bot, 'run', lambda self, *args, **kwargs: None)
+        import nascar_bot
+        yield nascar_bot
+
+@pytest.fixture
+def c():
+    conn = sqlite3.connect(':memory:')
+    cur = conn.cursor()
+    schema.init_database(cur)
+    yield cur
+    conn.close()
+
+def row(driver, finish):
+    return (driver, finish, '', '', None)
+
+def field(c):
+    c.execute("""SELECT d.driver_name, r.finish_position FROM results r JOIN drivers d USING (driver_id)
+                 ORDER BY r.finish_position""")
+    return c.fetchall()
+
+def test_partial_repost_merges(bot, c):
+    bot.ingest_results(c, 'Truck', RACE, [row('#1 Ann', 1), row('#2 Bo', 2)])
+    bot.ingest_results(c, 'Truck', RACE, [row('#3 Cy', 3), row('#2 Bo', 4)])
+    assert field(c) == [('#1 Ann', 1), ('#3 Cy', 3), ('#2 Bo', 4)]
+
+def test_merge_refuses_a_finish_held_by_another_driver(bot, c):
+    bot.ingest_results(c, 'Truck', RACE, [row('#1 Ann', 1), row('#2 Bo', 2)])
+    with pytest.raises(ValueError, match='P1'):
+        bot.ingest_results(c, 'Truck', RACE, [row('#3 Cy', 1)])
+    assert field(c) == [('#1 Ann', 1), ('#2 Bo', 2)]
+
+def test_replace_drops_drivers_left_out(bot, c):
+    bot.ingest_results(c, 'Truck', RACE, [row('#1 Ann', 1), row('#2 Bo', 2)])
+    bot.ingest_results(c, 'Truck', RACE, [row('#3 Cy', 1)], replace=True)
+    assert field(c) == [('#3 Cy', 1)]
+    c.execute("SELECT d.driver_name FROM winners JOIN drivers d USING (driver_id)")
+    assert c.fetchall() == [('#3 Cy',)]
+
+# ── verify_standings_cmd ────────────────────────────────────────────────
+class Ctx:
+    def __init__(self):
+        self.sent = []
+    async def send(self, content=None, **kwargs):
+        self.sent.append(content)
+
+def test_verify_lists_drivers_known_only_by_id(bot):
+    # A standings row whose driver is gone is reported by its id, an int
+    conn = sqlite3.connect(bot.db.DB_PATH)
+    schema.init_database(conn.cursor())
+    conn.execute("INSERT INTO standings (driver_id, series, season, points) VALUES (999, 'Truck', ?, 5)",
+                 (bot.CURRENT_SEASON,))
+    conn.commit()
+    conn.close()
+    ctx = Ctx()
+    try:
+        asyncio.run(bot.verify_standings_cmd.callback(ctx, 'Truck'))
+    finally:
+        bot.db.close()
+    assert 'Truck: 1 drivers drifted (999)' in ctx.sent[0]
@@ -0,0 +1,91 @@
+# Migration runner: every migration commits together with its schema_version
+# row, or not at all.
+import sqlite3
+
+import pytest
+
+import schema
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / 'ascrl.db')
+    yield conn
+    conn.close()
+
+def versions(conn):
+    return [v for v, in conn.execute("SELECT version FROM schema_version ORDER BY version")]
+
+def tables(conn):
+    return {name for name, in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+def test_fresh_database(conn):
+    latest = [v for v, _ in schema.SCHEMA_MIGRATIONS]
+    assert schema.init_database(conn.cursor()) == latest
+    assert versions(conn) == latest
+    assert schema.init_database(conn.cursor()) == []
+
+def test_failed_migration_rolls_back_its_ddl(conn, monkeypatch):
+    def broken(c):
+        c.execute("CREATE TABLE half_done (x INTEGER)")
+        c.execute("ALTER TABLE drivers ADD COLUMN nickname TEXT")
+        raise RuntimeError('disk on fire')
+    latest = schema.SCHEMA_MIGRATIONS[-1][0]
+    monkeypatch.setattr(schema, 'SCHEMA_MIGRATIONS', [*schema.SCHEMA_MIGRATIONS, (latest + 1, broken)])
+    with pytest.raises(RuntimeError):
+        schema.init_database(conn.cursor())
+    # Everything before it stuck, nothing of it did
+    assert versions(conn)[-1] == latest
+    assert 'half_done' not in tables(conn)
+    assert 'nickname' not in [col[1] for col in conn.execute("PRAGMA table_info(drivers)")]
+    assert conn.isolation_level == ''
+
+# ── migration 6 (race ids) on a pre-id database ─────────────────────────
+@pytest.fixture
+def old_conn(conn, monkeypatch):
+    with monkeypatch.context() as m:
+        m.setattr(schema, 'SCHEMA_MIGRATIONS', schema.SCHEMA_MIGRATIONS[:5])
+        schema.init_database(conn.cursor())
+    conn.executemany("INSERT INTO drivers VALUES (?, 'Truck')", [('Ann',), ('Bo',)])
+    conn.execute("INSERT INTO races VALUES ('Daytona', '2025-01-05', 'Truck', 'Season 1')")
+    conn.executemany("INSERT INTO results (driver_name, track, finish_position, series) VALUES (?, 'Daytona', ?, 'Truck')",
+                     [('Ann', 1), ('Bo', 2)])
+    conn.execute("INSERT INTO winners VALUES ('2025-01-05', 'Daytona', 'Ann', 'Truck')")
+    conn.commit()
+    return conn
+
+class CrashOn:
+    # Cursor stand-in that dies on the first statement containing `sql`
+    def __init__(self, cursor, sql):
+        self.cursor, self.sql = cursor, sql
+    def execute(self, sql, *args):
+        if self.sql in sql:
+            raise sqlite3.OperationalError('simulated crash')
+        return self.cursor.execute(sql, *args)
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+def assert_migrated(conn):
+    assert not {t for t in tables(conn) if t.startswith('legacy_')}
+    assert conn.execute("""SELECT d.driver_name, r.finish_position FROM results r
+                           JOIN drivers d USING (driver_id) ORDER BY r.finish_position""").fetchall() == [('Ann', 1), ('Bo', 2)]
+    assert conn.execute("SELECT d.driver_name FROM winners w JOIN drivers d USING (driver_id)").fetchall() == [('Ann',)]
+
+def test_race_ids_crash_then_rerun(old_conn):
+    with pytest.raises(sqlite3.OperationalError):
+        schema.init_database(CrashOn(old_conn.cursor(), 'INSERT OR REPLACE INTO winners'))
+    # Renames and new tables rolled back with it
+    assert versions(old_conn)[-1] == 5
+    assert not schema.has_column(old_conn.cursor(), 'races', 'race_id')
+    assert not {t for t in tables(old_conn) if t.startswith('legacy_')}
+    schema.init_database(old_conn.cursor())
+    assert_migrated(old_conn)
+
+def test_race_ids_resumes_interrupted_legacy_run(old_conn):
+    # What a pre-transactional run left behind when it died after two renames
+    old_conn.execute("ALTER TABLE drivers RENAME TO legacy_drivers")
+    old_conn.execute("ALTER TABLE races RENAME TO legacy_races")
+    old_conn.execute("""CREATE TABLE races (race_id INTEGER PRIMARY KEY, series TEXT NOT NULL, season TEXT NOT NULL,
+                                            track TEXT NOT NULL, date TEXT NOT NULL, UNIQUE (series, season, track, date))""")
+    old_conn.commit()
+    schema.init_database(old_conn.cursor())
+    assert_migrated(old_conn)